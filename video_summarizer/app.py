@@ -1,9 +1,18 @@
 import streamlit as st
 import os
-import glob
 from pathlib import Path
-import subprocess
-import time
+from catalog import Catalog
+from shorts_index import ShortsIndex
+from thumbnails import PosterMaker, filmstrip_info, filmstrip_frame
+from proxy import proxy_for
+from frame_server import FrameServer, probe_duration
+from jobs import JobManager, generate_shorts_job, add_subtitles_job, create_subtitles_job, regenerate_clip_job, prepare_source_job, publish_shorts_job
+from vmaf_search import DEFAULT_TARGET as DEFAULT_VMAF_TARGET
+from batch_manifest import BatchManifest
+from ingest import ingest_upload, fetch_url_info, padded_section, cached_download, UrlDownloader
+
+# Shorts per gallery page (3 columns)
+GALLERY_PAGE_SIZE = 9
 
 # Page config
 st.set_page_config(
@@ -91,6 +100,135 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_catalog():
+    """Shared catalog connection factory (imports pre-catalog shorts once)."""
+    catalog = Catalog()
+    catalog.import_legacy("generated_shorts")
+    return catalog
+
+catalog = get_catalog()
+
+@st.cache_data(show_spinner=False)
+def source_hash(path, mtime):
+    """Content hash of a source (hashed once per file version)."""
+    return catalog.get_source(catalog.register_source(path))["content_hash"]
+
+@st.cache_resource
+def get_shorts_index():
+    """Gallery + statistics snapshot, rebuilt only when the catalog or output dir changes."""
+    return ShortsIndex(catalog)
+
+shorts_index = get_shorts_index()
+
+@st.cache_resource
+def get_url_downloader():
+    """Background URL downloads survive reruns."""
+    return UrlDownloader()
+
+@st.cache_data(show_spinner="🔎 Getting video details...")
+def get_url_info(url):
+    return fetch_url_info(url)
+
+url_downloader = get_url_downloader()
+
+@st.cache_resource
+def get_job_manager():
+    """One bounded worker pool shared by every session/tab; jobs survive reruns."""
+    return JobManager()
+
+job_manager = get_job_manager()
+
+@st.cache_resource
+def get_frame_server():
+    """Open decoders + decoded-frame LRU shared by all previews and sessions."""
+    return FrameServer()
+
+frame_server = get_frame_server()
+
+@st.cache_resource
+def get_poster_maker():
+    """Gallery posters are made in the background, never while the page renders."""
+    return PosterMaker()
+
+poster_maker = get_poster_maker()
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _file_bytes(path, mtime_ns):
+    with open(path, "rb") as f:
+        return f.read()
+
+def download_bytes(path):
+    """File contents for a download button, read once per path + mtime (not on every rerun)."""
+    return _file_bytes(path, os.stat(path).st_mtime_ns)
+
+def reset_download():
+    st.session_state.download_short = None
+
+JOB_STATE_ICONS = {"queued": "🕒", "running": "⚙️", "cancelling": "🛑", "done": "✅", "failed": "❌", "cancelled": "🚫"}
+
+@st.fragment(run_every=2)
+def show_jobs():
+    """Job list; only this fragment re-runs while polling."""
+    jobs = job_manager.list_jobs()
+    if jobs:
+        st.markdown("### ⏳ Jobs")
+    for job in jobs[:5]:
+        st.markdown(f"{JOB_STATE_ICONS.get(job['state'], '')} **{job['label']}** - {job['message'] or job['state']}")
+        if job["state"] in ("queued", "running"):
+            col_prog, col_cancel = st.columns([4, 1])
+            col_prog.progress(job["progress"])
+            if col_cancel.button("✖", key=f"cancel_{job['id']}", help="Cancel job"):
+                job_manager.cancel(job["id"])
+                st.rerun()
+        elif job["state"] == "failed":
+            st.caption(f"❌ {job['error']}")
+    
+    # Refresh the whole page once when a job finishes (new/changed shorts)
+    finished = {job["id"] for job in jobs if job["state"] == "done"}
+    seen = st.session_state.setdefault("seen_finished_jobs", finished)
+    if finished - seen:
+        st.session_state.seen_finished_jobs = finished
+        st.rerun()
+
+@st.fragment(run_every=1)
+def show_url_download(job_key):
+    """Download progress; only this fragment re-runs while the download is running."""
+    job = url_downloader.status(job_key)
+    if job["state"] != "running":
+        st.rerun()      # done or failed: refresh the page once to pick it up
+    st.progress(job["progress"], text=f"📥 Downloading... {job['progress'] * 100:.0f}%")
+
+def prepare_source(path):
+    """Queue the one-time proxy + filmstrip build for a source if either is missing/stale."""
+    if proxy_for(path) and filmstrip_info(path):
+        return
+    builds = st.session_state.setdefault("prepare_jobs", {})
+    job = job_manager.status(builds[path]) if path in builds else None
+    if job is None or job["state"] == "done":
+        builds[path] = job_manager.submit("prepare", f"🗜️ Proxy + filmstrip: {os.path.basename(path)}",
+                                          prepare_source_job, os.path.abspath(path))
+
+def source_filmstrip(path):
+    """Filmstrip metadata for a source (None while it's being built)."""
+    strip = filmstrip_info(path)
+    if strip is None:
+        prepare_source(path)
+    return strip
+
+def preview_frame(path, seconds):
+    """
+    Exact RGB frame at `seconds` from the frame server, decoded from the
+    source's proxy once it exists; the filmstrip tile if decoding fails.
+    """
+    frame = frame_server.frame_at(proxy_for(path) or path, seconds)
+    if frame is None:
+        strip = source_filmstrip(path)
+        frame = filmstrip_frame(strip, seconds) if strip else None
+    else:
+        prepare_source(path)
+    return frame
+
 # Header
 st.markdown('<h1 class="main-header">🎬 AI Viral Shorts Generator</h1>', unsafe_allow_html=True)
 st.markdown("### Transform long videos into engaging vertical shorts with AI-powered subtitles")
@@ -115,7 +253,15 @@ with st.sidebar:
         help="Track faces for dynamic cropping. Disable for fixed center crop (more stable)"
     )
     
-    if use_face_tracking:
+    use_saliency = False
+    if not use_face_tracking:
+        use_saliency = st.checkbox(
+            "🌀 Activity Framing",
+            value=False,
+            help="Follow on-screen motion/detail instead of faces (B-roll, screen recordings, product shots)"
+        )
+    
+    if use_face_tracking or use_saliency:
         smoothing = st.slider(
             "Smoothing (seconds)",
             min_value=2,
@@ -126,6 +272,16 @@ with st.sidebar:
     else:
         smoothing = 4  # Default, won't be used
     
+    framing = "face" if use_face_tracking else ("saliency" if use_saliency else "fixed")
+    
+    clip_selection = st.radio(
+        "Clip Selection",
+        ["🎲 Random", "🔥 Best Moments"],
+        index=0,
+        help="Best Moments scores the selected range by audio energy, loudness changes and scene cuts, then picks the strongest non-overlapping clips"
+    )
+    selection = "highlight" if "Best" in clip_selection else "random"
+    
     st.divider()
     
     st.markdown("### 🎙️ Subtitle Model")
@@ -145,6 +301,29 @@ with st.sidebar:
     
     st.divider()
     
+    st.markdown("### 📐 Extra Formats")
+    aspects = st.multiselect(
+        "Aspect variants",
+        ["1:1", "4:5"],
+        default=[],
+        help="Also encode square / 4:5 versions of every short from the same tracked crop, in the same render pass as the 9:16"
+    )
+    
+    st.divider()
+    
+    st.markdown("### 📦 Publish Encoding")
+    size_optimized = st.checkbox(
+        "Size-optimized (VMAF search)",
+        value=False,
+        help="Full renders and Publish search each short's CRF on a few sampled segments and keep the smallest file that still reaches the target quality (slower encode, smaller uploads)"
+    )
+    vmaf_target = None
+    if size_optimized:
+        vmaf_target = st.slider("Target VMAF", min_value=85, max_value=98, value=int(DEFAULT_VMAF_TARGET),
+                                help="93+ is visually indistinguishable on a phone; lower = smaller files")
+    
+    st.divider()
+    
     st.markdown("### 🎯 Features")
     st.markdown("""
     - ✅ Auto 9:16 Conversion
@@ -160,8 +339,7 @@ with st.sidebar:
         import shutil
         if os.path.exists("generated_shorts"):
             shutil.rmtree("generated_shorts")
-        if os.path.exists("generated_history.txt"):
-            os.remove("generated_history.txt")
+        catalog.clear_shorts()
         st.success("All shorts cleared!")
         st.rerun()
 
@@ -185,10 +363,18 @@ with col1:
         )
         
         if uploaded_file:
-            # Save uploaded file
-            video_path = f"uploaded_{uploaded_file.name}"
-            with open(video_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
+            # Save uploaded file ONCE per upload (reruns reuse the stored path)
+            upload_key = getattr(uploaded_file, "file_id", None) or f"{uploaded_file.name}:{uploaded_file.size}"
+            ingested = st.session_state.setdefault("ingested_uploads", {})
+            
+            if upload_key not in ingested or not os.path.exists(ingested[upload_key]):
+                with st.spinner("💾 Saving upload..."):
+                    stored_path, _, is_new = ingest_upload(uploaded_file, uploaded_file.name, catalog)
+                ingested[upload_key] = stored_path
+                if not is_new:
+                    st.info("♻️ This video was uploaded before - reusing the stored copy.")
+            
+            video_path = ingested[upload_key]
             
             st.success(f"✅ Uploaded: {uploaded_file.name}")
             file_size = os.path.getsize(video_path) / (1024 * 1024)
@@ -202,56 +388,73 @@ with col1:
         )
         
         if video_url:
-            st.info("✅ URL ready! Click 'Generate Shorts' below to process.")
-            # Set video_path to URL (will download automatically during generation)
-            video_path = video_url
+            # Metadata only (cached per URL) - nothing is downloaded yet
+            try:
+                url_info = get_url_info(video_url)
+            except Exception as e:
+                st.error(f"❌ Could not fetch video info: {str(e)}")
+                url_info = None
+            
+            if url_info:
+                st.markdown(f"**🎬 {url_info['title']}**")
+                section = None
+                url_duration = url_info["duration"]
+                
+                if url_duration:
+                    st.caption(f"⏱️ Duration: {int(url_duration // 60)} min {int(url_duration % 60)} sec")
+                    range_only = st.checkbox(
+                        "✂️ Download only part of the video",
+                        value=url_duration > 600,
+                        help="Fetch just the selected range (plus a few seconds of padding) instead of the whole video"
+                    )
+                    if range_only:
+                        download_range = st.slider(
+                            "Range to download",
+                            min_value=0.0,
+                            max_value=float(url_duration),
+                            value=(0.0, float(min(url_duration, 300))),
+                            step=1.0,
+                            format="%d sec",
+                            key="download_range"
+                        )
+                        section = padded_section(download_range[0], download_range[1], url_duration)
+                
+                # Downloads run in the background and are cached by video ID (+ range)
+                job_key = (url_info["extractor"], url_info["id"], section)
+                job = url_downloader.status(job_key)
+                cached = cached_download(url_info, section)
+                
+                if cached:
+                    video_path = cached
+                    st.success("✅ Video ready for processing!")
+                elif job["state"] == "running":
+                    show_url_download(job_key)
+                else:
+                    if job["state"] == "error":
+                        st.error(f"❌ Download failed: {job['error']}")
+                    if st.button("📥 Download Video", key="download_url"):
+                        url_downloader.start(url_info, section)
+                        st.rerun()
     
     # Generate button (only show if video is ready)
     if video_path:
-        # Check if video_path is URL or file
-        is_url = video_path.startswith('http://') or video_path.startswith('https://')
-        
-        if is_url or os.path.exists(video_path):
+        if os.path.exists(video_path):
             st.divider()
             st.markdown("### ✂️ Select Video Portion")
             
-            # If URL, download first to get duration
-            if is_url:
-                st.info("📥 Fetching video information...")
-                try:
-                    import yt_dlp
-                    
-                    with st.spinner("Getting video details..."):
-                        ydl_opts = {
-                            'format': 'best[ext=mp4]/best',
-                            'outtmpl': 'downloaded_video.%(ext)s',
-                            'quiet': True,
-                            'no_warnings': True,
-                        }
-                        
-                        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                            info = ydl.extract_info(video_url, download=True)
-                            actual_video_path = f"downloaded_video.{info['ext']}"
-                        
-                        video_path = actual_video_path
-                        st.success("✅ Video ready for processing!")
-                        
-                except Exception as e:
-                    st.error(f"❌ Could not fetch video: {str(e)}")
-                    video_path = None
-            
-            
             if video_path and os.path.exists(video_path):
                 # Get video duration
                 try:
-                    from moviepy import VideoFileClip
+                    duration = probe_duration(video_path)
+                    if duration is None:
+                        raise ValueError("ffprobe could not read the video duration")
+                    duration_min = duration / 60
                     
-                    with VideoFileClip(video_path) as vid:
-                        duration = vid.duration
-                        duration_min = duration / 60
+                    # Proxy + filmstrip are built once per source in the background
+                    prepare_source(video_path)
                     
-                    # Show video preview
-                    st.video(video_path)
+                    # Show video preview (lightweight proxy once it's ready)
+                    st.video(proxy_for(video_path) or video_path)
                     
                     st.markdown(f"**Total Duration:** {int(duration_min)} min {int(duration % 60)} sec")
                     
@@ -299,71 +502,21 @@ with col1:
                         # Extract and show frame previews (optimized to prevent hang)
                         st.markdown("#### 🎞️ Frame Preview")
                         
-                        # Only update frames when slider changes significantly (every 5 seconds)
-                        import hashlib
-                        frame_cache_key = f"{int(start_time//5)*5}_{int(end_time//5)*5}"
-                        
-                        # Use session state for caching
-                        if 'last_frame_key' not in st.session_state:
-                            st.session_state.last_frame_key = None
-                        
-                        # Only extract frames if slider moved significantly
-                        if st.session_state.last_frame_key != frame_cache_key:
-                            try:
-                                import cv2
-                                import numpy as np
-                                
-                                # Open video
-                                cap = cv2.VideoCapture(video_path)
-                                
-                                if cap.isOpened():
-                                    fps = cap.get(cv2.CAP_PROP_FPS)
-                                    
-                                    col_frame1, col_frame2 = st.columns(2)
-                                    
-                                    with col_frame1:
-                                        st.markdown(f"**Start Frame** ({start_min}:{start_sec:02d})")
-                                        # Seek to start time
-                                        cap.set(cv2.CAP_PROP_POS_FRAMES, int(start_time * fps))
-                                        ret, start_frame = cap.read()
-                                        
-                                        if ret:
-                                            # Resize for faster display (reduce memory)
-                                            start_frame = cv2.resize(start_frame, (320, 180))
-                                            # Convert BGR to RGB
-                                            start_frame = cv2.cvtColor(start_frame, cv2.COLOR_BGR2RGB)
-                                            st.image(start_frame, use_container_width=True)
-                                        else:
-                                            st.info("🎬 Move slider to preview")
-                                    
-                                    with col_frame2:
-                                        st.markdown(f"**End Frame** ({end_min}:{end_sec:02d})")
-                                        # Seek to end time
-                                        cap.set(cv2.CAP_PROP_POS_FRAMES, int(end_time * fps))
-                                        ret, end_frame = cap.read()
-                                        
-                                        if ret:
-                                            # Resize for faster display
-                                            end_frame = cv2.resize(end_frame, (320, 180))
-                                            # Convert BGR to RGB
-                                            end_frame = cv2.cvtColor(end_frame, cv2.COLOR_BGR2RGB)
-                                            st.image(end_frame, use_container_width=True)
-                                        else:
-                                            st.info("🎬 Move slider to preview")
-                                    
-                                    # IMPORTANT: Release video capture to free memory
-                                    cap.release()
-                                    
-                                    # Update cache key
-                                    st.session_state.last_frame_key = frame_cache_key
-                                else:
-                                    st.warning("Could not open video for preview")
-                                
-                            except Exception as e:
-                                st.warning(f"Preview unavailable: {str(e)}")
+                        # Served by the persistent frame server (cached, keyframe-seeked on the proxy)
+                        start_frame = preview_frame(video_path, start_time)
+                        end_frame = preview_frame(video_path, end_time)
+                        if start_frame is not None and end_frame is not None:
+                            col_frame1, col_frame2 = st.columns(2)
+                            
+                            with col_frame1:
+                                st.markdown(f"**Start Frame** ({start_min}:{start_sec:02d})")
+                                st.image(start_frame, use_container_width=True)
+                            
+                            with col_frame2:
+                                st.markdown(f"**End Frame** ({end_min}:{end_sec:02d})")
+                                st.image(end_frame, use_container_width=True)
                         else:
-                            # Show cached message
-                            st.info("💡 Move slider by 5+ seconds to update preview (optimized for performance)")
+                            st.info("🎞️ Preparing previews... (see ⏳ Jobs)")
                         
                         # Visual timeline
                         st.markdown("#### 📊 Timeline Preview")
@@ -396,127 +549,61 @@ with col1:
                             full_btn = st.button("🚀 Generate with Subtitles", key="generate_full", use_container_width=True)
                             st.caption("Generates WITH subtitles (~75 min)")
                         
+                        # An interrupted batch for this video can be finished instead of restarted
+                        # (batches another job is still running are not offered)
+                        last_batch = BatchManifest.find("generated_shorts", source_hash(video_path, os.path.getmtime(video_path)))
+                        if last_batch:
+                            st.warning(f"♻️ A batch for this video stopped with {len(last_batch.pending())} of {len(last_batch.slots)} shorts unfinished")
+                            if st.button("♻️ Resume Last Batch", key="resume_batch", use_container_width=True):
+                                job_manager.submit(
+                                    "generate", "♻️ Resume batch",
+                                    generate_shorts_job, os.path.abspath(video_path), resume=last_batch.batch_id
+                                )
+                                st.success("♻️ Resume queued - finished stages are skipped. Follow it under ⏳ Jobs.")
+                        
                         # Phase 1: Preview Mode (No Subtitles)
-                        # Phase 1: Preview Mode (No Subtitles)
+                        # (new shorts are added next to the existing ones; "Clear All Shorts" removes them)
                         if preview_btn:
-                            with st.spinner("🎬 Generating preview shorts (no subtitles)... Much faster!"):
-                                # Clear previous shorts
-                                import shutil
-                                if os.path.exists("generated_shorts"):
-                                    shutil.rmtree("generated_shorts")
-                                if os.path.exists("generated_history.txt"):
-                                    os.remove("generated_history.txt")
-                                    
-                                progress_bar = st.progress(0)
-                                status_text = st.empty()
-                                
-                                try:
-                                    # Run the shorts generator directly on ORIGINAL video with RANGE args
-                                    status_text.text("⏳ Generating preview shorts (skipping subtitles)...")
-                                    tracking_flag = "--face-tracking" if use_face_tracking else "--no-face-tracking"
-                                    smoothing_flag = f"--smoothing {smoothing}" if use_face_tracking else ""
-                                    
-                                    # Pass range args
-                                    cmd = f"source venv/bin/activate && python auto_shorts.py '{video_path}' --range-start {start_time} --range-end {end_time} --count {num_shorts} {tracking_flag} {smoothing_flag} --preview"
-                                    
-                                    process = subprocess.Popen(
-                                        cmd,
-                                        shell=True,
-                                        stdout=subprocess.PIPE,
-                                        stderr=subprocess.PIPE,
-                                        text=True,
-                                        executable='/bin/bash'
-                                    )
-                                    
-                                    # Monitor progress
-                                    current_progress = 10
-                                    while process.poll() is None:
-                                        time.sleep(1)
-                                        current_progress = min(current_progress + 2, 95)
-                                        progress_bar.progress(current_progress)
-                                    
-                                    stdout, stderr = process.communicate()
-                                    
-                                    if process.returncode == 0:
-                                        progress_bar.progress(100)
-                                        status_text.text("✅ Generation Complete!")
-                                        st.balloons()
-                                        time.sleep(1)
-                                        st.rerun()
-                                    else:
-                                        st.error(f"❌ Error: {stderr}")
-                                        
-                                except Exception as e:
-                                    st.error(f"❌ Error: {str(e)}")
+                            # Runs in the background job pool on the ORIGINAL video with RANGE args
+                            job_manager.submit(
+                                "generate", "🎬 Previews",
+                                generate_shorts_job, os.path.abspath(video_path),
+                                count=num_shorts, use_face_tracking=use_face_tracking, smoothing_seconds=smoothing,
+                                range_start=start_time, range_end=end_time, framing=framing,
+                                selection=selection, preview_mode=True, aspects=aspects
+                            )
+                            st.success("🎬 Preview generation queued (no subtitles)... Much faster! Follow it under ⏳ Jobs.")
                         
                         # Phase 2: Full Mode (With Subtitles)
                         if full_btn:
-                            with st.spinner("🎬 Generating shorts with subtitles... This will take longer"):
-                                # Clear previous shorts
-                                import shutil
-                                if os.path.exists("generated_shorts"):
-                                    shutil.rmtree("generated_shorts")
-                                if os.path.exists("generated_history.txt"):
-                                    os.remove("generated_history.txt")
-                                    
-                                progress_bar = st.progress(0)
-                                status_text = st.empty()
-                                
-                                try:
-                                    # Run the shorts generator directly on ORIGINAL video with RANGE args
-                                    status_text.text("⏳ Generating shorts with subtitles...")
-                                    tracking_flag = "--face-tracking" if use_face_tracking else "--no-face-tracking"
-                                    smoothing_flag = f"--smoothing {smoothing}" if use_face_tracking else ""
-                                    # Note: NO --preview flag = full mode with subtitles
-                                    cmd = f"source venv/bin/activate && python auto_shorts.py '{video_path}' --range-start {start_time} --range-end {end_time} --count {num_shorts} {tracking_flag} {smoothing_flag} --model-size {model_size}"
-                                    
-                                    process = subprocess.Popen(
-                                        cmd,
-                                        shell=True,
-                                        stdout=subprocess.PIPE,
-                                        stderr=subprocess.PIPE,
-                                        text=True,
-                                        executable='/bin/bash'
-                                    )
-                                    
-                                    # Monitor progress
-                                    current_progress = 10
-                                    while process.poll() is None:
-                                        time.sleep(1)
-                                        current_progress = min(current_progress + 2, 95)
-                                        progress_bar.progress(current_progress)
-                                    
-                                    stdout, stderr = process.communicate()
-                                    
-                                    if process.returncode == 0:
-                                        progress_bar.progress(100)
-                                        status_text.text("✅ Generation Complete!")
-                                        st.balloons()
-                                        time.sleep(1)
-                                        st.rerun()
-                                    else:
-                                        st.error(f"❌ Error: {stderr}")
-                                        
-                                except Exception as e:
-                                    st.error(f"❌ Error: {str(e)}")
+                            # Runs in the background job pool on the ORIGINAL video with RANGE args
+                            job_manager.submit(
+                                "generate", "🚀 Shorts + subtitles",
+                                generate_shorts_job, os.path.abspath(video_path),
+                                count=num_shorts, use_face_tracking=use_face_tracking, smoothing_seconds=smoothing,
+                                range_start=start_time, range_end=end_time, framing=framing,
+                                selection=selection, model_size=model_size, vmaf_target=vmaf_target, aspects=aspects
+                            )
+                            st.success("🎬 Generation with subtitles queued... This will take longer. Follow it under ⏳ Jobs.")
                                         
                 except Exception as e:
                     st.error(f"Could not load video: {str(e)}")
 
 with col2:
+    # Background jobs (generation, regeneration, subtitles)
+    show_jobs()
+    
     # Statistics
     st.markdown("### 📊 Statistics")
     
-    shorts_dirs = glob.glob("generated_shorts/short_*")
-    total_shorts = len(shorts_dirs)
-    
-    total_size = 0
-    for short_dir in shorts_dirs:
-        for file in glob.glob(f"{short_dir}/*"):
-            if os.path.isfile(file):
-                total_size += os.path.getsize(file)
+    # Shared snapshot (newest first): no per-rerun directory walks
+    index = shorts_index.snapshot()
+    shorts = index["shorts"]
+    shorts_dirs = [short["folder"] for short in shorts]
     
-    total_size_mb = total_size / (1024 * 1024)
+    stats = index["stats"]
+    total_shorts = stats["total_shorts"]
+    total_size_mb = stats["disk_size"] / (1024 * 1024)
     
     st.markdown(f"""
     <div class="stat-box">
@@ -543,31 +630,30 @@ else:
     if 'selected_shorts' not in st.session_state:
         st.session_state.selected_shorts = set()
     
-    # Add subtitles button (Phase 2)
-    col_btn_subs1, col_btn_subs2, col_btn_subs3 = st.columns([2, 2, 1])
+    # Add subtitles button (Phase 2) + publish (full-quality re-render of kept drafts)
+    col_btn_subs1, col_btn_pub, col_btn_subs2, col_btn_subs3 = st.columns([2, 2, 2, 1])
     
     with col_btn_subs1:
         if st.button("🎙️ Add Subtitles to Selected", key="add_subs", type="primary", use_container_width=True):
             if not st.session_state.selected_shorts:
                 st.warning("⚠️ Please select at least one short!")
             else:
-                with st.spinner(f"Adding subtitles to {len(st.session_state.selected_shorts)} shorts..."):
-                    from auto_shorts import add_subtitles_to_short
-                    
-                    progress = st.progress(0)
-                    success_count = 0
-                    total = len(st.session_state.selected_shorts)
-                    
-                    for idx, short_dir in enumerate(st.session_state.selected_shorts):
-                        result = add_subtitles_to_short(short_dir)
-                        if result:
-                            success_count += 1
-                        progress.progress((idx + 1) / total)
-                    
-                    st.success(f"✅ Added subtitles to {success_count}/{total} shorts!")
-                    st.session_state.selected_shorts = set()
-                    time.sleep(1)
-                    st.rerun()
+                total = len(st.session_state.selected_shorts)
+                job_manager.submit("subtitles", f"🎙️ Subtitles for {total} shorts",
+                                   add_subtitles_job, sorted(st.session_state.selected_shorts))
+                st.success(f"✅ Queued subtitles for {total} shorts - follow progress under ⏳ Jobs")
+                st.session_state.selected_shorts = set()
+    
+    with col_btn_pub:
+        if st.button("🚀 Publish Selected", key="publish", use_container_width=True, help="Re-render selected drafts at full quality from the source"):
+            if not st.session_state.selected_shorts:
+                st.warning("⚠️ Please select at least one short!")
+            else:
+                total = len(st.session_state.selected_shorts)
+                job_manager.submit("publish", f"🚀 Publish {total} shorts",
+                                   publish_shorts_job, sorted(st.session_state.selected_shorts), vmaf_target=vmaf_target)
+                st.success(f"✅ Queued publish renders for {total} shorts - follow progress under ⏳ Jobs")
+                st.session_state.selected_shorts = set()
     
     with col_btn_subs2:
         if st.button("✅ Select All", key="select_all", use_container_width=True):
@@ -581,23 +667,30 @@ else:
     
     st.caption(f"Selected: {len(st.session_state.selected_shorts)} shorts")
     
-    # Sort by creation time (newest first)
-    shorts_dirs = sorted(shorts_dirs, key=os.path.getmtime, reverse=True)
+    # Pagination (only one page of cards is rendered per run)
+    total_pages = (len(shorts) - 1) // GALLERY_PAGE_SIZE + 1
+    page = 1
+    if total_pages > 1:
+        page = st.number_input(f"Page (of {total_pages})", min_value=1, max_value=total_pages, value=1, step=1, key="gallery_page")
+    page_shorts = shorts[(page - 1) * GALLERY_PAGE_SIZE:page * GALLERY_PAGE_SIZE]
     
     cols = st.columns(3)  # Changed to 3 columns for compact view
     
-    for idx, short_dir in enumerate(shorts_dirs):
+    for idx, short in enumerate(page_shorts):
         col = cols[idx % 3]  # Fixed for 3 columns
+        short_dir = short["folder"]
         
         with col:
             short_name = os.path.basename(short_dir)
             timestamp = short_name.replace("short_", "").replace("_", ":")
             
             # Check if has subtitles
-            srt_file = glob.glob(f"{short_dir}/subtitles.srt")
+            srt_file = [short["artifacts"]["subtitles"]] if short["has_subtitles"] and short["artifacts"].get("subtitles") else []
             has_subtitles = len(srt_file) > 0
             subtitle_badge = "🎙️ WITH Subs" if has_subtitles else "📹 Preview"
             badge_color = "#28a745" if has_subtitles else "#ffc107"
+            # Draft renders are low-res previews until published
+            is_draft = short["params"].get("profile") == "draft"
             
             # Checkbox for selection
             is_selected = short_dir in st.session_state.selected_shorts
@@ -614,270 +707,198 @@ else:
                 <span style="background: {badge_color}; color: white; padding: 2px 8px; border-radius: 10px; font-size: 11px; font-weight: bold;">
                     {subtitle_badge}
                 </span>
+                {'<span style="background: #6c757d; color: white; padding: 2px 8px; border-radius: 10px; font-size: 11px; font-weight: bold;">📝 Draft</span>' if is_draft else ''}
             """, unsafe_allow_html=True)
             
             # Find video and subtitle files
-            video_file = glob.glob(f"{short_dir}/final_short.mp4")
+            final_path = short["artifacts"].get("final")
+            video_file = [final_path] if short["final_size"] is not None else []
             
             if video_file:
                 video_path = video_file[0]
-                file_size = os.path.getsize(video_path) / (1024 * 1024)
+                file_size = short["final_size"] / (1024 * 1024)
                 
-                # Video player
-                with open(video_path, 'rb') as video:
-                    st.video(video.read())
+                is_open = st.session_state.get("open_short") == short_dir
                 
-                st.markdown(f"**Size:** {file_size:.2f} MB")
-                
-                # Download buttons
-                col_btn1, col_btn2 = st.columns(2)
-                
-                with col_btn1:
-                    with open(video_path, 'rb') as file:
-                        st.download_button(
-                            label="📥 Download Video",
-                            data=file.read(),
-                            file_name=f"short_{timestamp.replace(':', '_')}.mp4",
-                            mime="video/mp4",
-                            key=f"video_{short_name}"
-                        )
-                
-                    with col_btn2:
-                        # Always show Create/Regenerate button (User Request)
-                        if st.button("✨ Create Vizard Subtitles", key=f"create_subs_{short_name}", help="Generates/Regenerates Vizard-style subtitles for this clip"):
-
-                            status_box = st.empty()
-                            progress = st.progress(0)
-                            
-                            try:
-                                status_box.info(f"🎙️ Transcribing audio ({model_size} model)...")
-                                progress.progress(10)
-                                
-                                # Define paths
-                                current_srt = os.path.join(short_dir, "subtitles.srt")
-                                temp_output = os.path.join(short_dir, "temp_subs_burn.mp4")
-                                
-                                # Import generator
-                                from auto_shorts import generate_subtitles
-                                import subprocess
-                                
-                                # 1. Generate SRT
-                                success = generate_subtitles(video_path, current_srt, model_size=model_size)
-                                progress.progress(50)
-                                
-                                if success and os.path.exists(current_srt):
-                                    # 2. Burn Subtitles
-                                    status_box.info("🔥 Burning Vizard-style captions...")
-                                    
-                                    # Burn command (same as main logic)
-                                    cmd = [
-                                        "ffmpeg",
-                                        "-i", video_path,
-                                        "-vf", f"subtitles='{current_srt}':force_style='FontName=Arial,FontSize=28,PrimaryColour=&HFFFFFF,OutlineColour=&H000000,BorderStyle=3,Outline=2,Shadow=1,Alignment=2,MarginV=60'",
-                                        "-c:a", "copy",
-                                        "-y",
-                                        temp_output
-                                    ]
-                                    
-                                    try:
-                                        subprocess.run(cmd, check=True, capture_output=True)
-                                        progress.progress(90)
-                                        
-                                        # 3. Replace file
-                                        if os.path.exists(temp_output):
-                                            os.replace(temp_output, video_path)
-                                            status_box.success("✅ Subtitles Added!")
-                                            progress.progress(100)
-                                            time.sleep(1)
-                                            st.rerun()
-                                        else:
-                                            status_box.error("❌ Failed to burn subtitles (ffmpeg error)")
-                                    except subprocess.CalledProcessError as e:
-                                        status_box.error(f"❌ Burning Failed: {e}")
-                                else:
-                                    status_box.error("❌ Transcription Failed (Try checking logs)")
-                                    
-                            except Exception as e:
-                                status_box.error(f"❌ Error: {str(e)}")
-                
-                # Edit Clip Feature
-                with st.expander("✂️ Edit Clip Timing"):
-                    st.caption("Adjust start/end times to fine-tune this clip")
+                if not is_open:
+                    # Collapsed card: cached poster only (no video bytes); a
+                    # missing one is queued and shows up on a later rerun
+                    poster = poster_maker.request(video_path)
+                    if poster:
+                        st.image(poster, use_container_width=True)
+                    else:
+                        st.caption("🎬 No preview")
+                    st.markdown(f"**Size:** {file_size:.2f} MB")
+                    if st.button("▶️ Open", key=f"open_{short_name}", use_container_width=True):
+                        st.session_state.open_short = short_dir
+                        reset_download()
+                        st.rerun()
+                else:
+                    # Video player (by path, only for the opened short)
+                    st.video(video_path)
                     
-                    # Parse current timing logic (Prioritize Metadata > Folder Name)
-                    meta_file = os.path.join(short_dir, "metadata.json")
-                    meta_start = None
-                    meta_duration = 60
+                    st.markdown(f"**Size:** {file_size:.2f} MB")
+                    if st.button("⏏️ Close", key=f"close_{short_name}", use_container_width=True):
+                        st.session_state.open_short = None
+                        reset_download()
+                        st.rerun()
                     
-                    if os.path.exists(meta_file):
-                        try:
-                            import json
-                            with open(meta_file, 'r') as f:
-                                m = json.load(f)
-                                meta_start = m.get('start_time')
-                                meta_duration = m.get('duration', 60)
-                        except:
-                            pass
+                    # Download buttons
+                    col_btn1, col_btn2 = st.columns(2)
                     
-                    # Fallback to folder name
-                    time_parts = short_name.replace("short_", "").split("_")
-                    folder_start = 0
-                    try:
-                        if len(time_parts) >= 2:
-                            curr_start_min = int(time_parts[0])
-                            curr_start_sec = int(time_parts[1])
-                            folder_start = curr_start_min * 60 + curr_start_sec
-                    except:
-                        folder_start = 0 # Safe default
-                        
-                    # Decide which to use
-                    if meta_start is not None:
-                        curr_start = meta_start
-                        curr_duration = meta_duration
-                    else:
-                        curr_start = folder_start
-                        curr_duration = 60
-
-                    curr_end = curr_start + curr_duration
+                    with col_btn1:
+                        # File is read only after the user asks for it (then cached);
+                        # saving it puts the "Download" button back
+                        if st.session_state.get("download_short") == short_dir:
+                            st.download_button(
+                                label="💾 Save Video",
+                                data=download_bytes(video_path),
+                                file_name=f"short_{timestamp.replace(':', '_')}.mp4",
+                                mime="video/mp4",
+                                key=f"video_{short_name}",
+                                on_click=reset_download
+                            )
+                            # Aspect variants rendered in the same pass as the short
+                            for variant in short["params"].get("variants") or []:
+                                variant_file = os.path.join(short_dir, variant["file"])
+                                if os.path.exists(variant_file):
+                                    st.download_button(
+                                        label=f"💾 {variant['aspect']}",
+                                        data=download_bytes(variant_file),
+                                        file_name=f"short_{timestamp.replace(':', '_')}_{variant['aspect'].replace(':', 'x')}.mp4",
+                                        mime="video/mp4",
+                                        key=f"video_{variant['aspect']}_{short_name}",
+                                        on_click=reset_download
+                                    )
+                        elif st.button("📥 Download Video", key=f"prep_dl_{short_name}"):
+                            st.session_state.download_short = short_dir
+                            st.rerun()
                     
-                    # Initialize UI display vars
-                    curr_start_min = int(curr_start // 60)
-                    curr_start_sec = int(curr_start % 60)
+                        with col_btn2:
+                            # Always show Create/Regenerate button (User Request)
+                            if st.button("✨ Create Vizard Subtitles", key=f"create_subs_{short_name}", help="Generates/Regenerates Vizard-style subtitles for this clip"):
 
-                    # Initialize session state for this clip
-                    adj_key = f"clip_adj_{short_name}"
-                    if adj_key not in st.session_state:
-                        st.session_state[adj_key] = {'start': curr_start, 'duration': curr_duration}
-                        
-                    st.info(f"Current: {curr_start_min}:{curr_start_sec:02d} to {int(curr_end//60)}:{int(curr_end%60):02d}")
+                                job_manager.submit("subtitles", f"✨ Subtitles: {short_name}",
+                                                   create_subtitles_job, short_dir, video_path, model_size=model_size)
+                                st.success("✅ Queued! Follow progress under ⏳ Jobs")
                     
+                    # Edit Clip Feature
+                    with st.expander("✂️ Edit Clip Timing"):
+                        st.caption("Adjust start/end times to fine-tune this clip")
+                        
+                        # Current timing from the catalog
+                        curr_start = short["start_time"]
+                        curr_duration = short["end_time"] - short["start_time"]
 
+                        curr_end = curr_start + curr_duration
                         
-                    # Quick adjust buttons (FIRST - before inputs)
-                    st.markdown("**Fine-Tune Clip:**")
-                    
-                    # Row 1: Start Time Adjustments (Keep End Time Fixed)
-                    c1, c2, c3, c4 = st.columns(4)
-                    
-                    with c1:
-                        # Start Earlier (-5s) -> Increase Duration
-                        if st.button("⏪ Start -5s", key=f"s_pre_{short_name}", help="Include previous 5s (Keep End fixed)"):
-                            new_s = max(0, st.session_state[adj_key]['start'] - 5)
-                            diff = st.session_state[adj_key]['start'] - new_s
-                            st.session_state[adj_key]['start'] = new_s
-                            st.session_state[adj_key]['duration'] += diff
+                        # Initialize UI display vars
+                        curr_start_min = int(curr_start // 60)
+                        curr_start_sec = int(curr_start % 60)
+
+                        # Initialize session state for this clip
+                        adj_key = f"clip_adj_{short_name}"
+                        if adj_key not in st.session_state:
+                            st.session_state[adj_key] = {'start': curr_start, 'duration': curr_duration}
                             
-                            # Update widgets
-                            st.session_state[f"emin_{short_name}"] = new_s // 60
-                            st.session_state[f"esec_{short_name}"] = new_s % 60
-                            st.session_state[f"edur_{short_name}"] = st.session_state[adj_key]['duration']
-                            st.rerun()
+                        st.info(f"Current: {curr_start_min}:{curr_start_sec:02d} to {int(curr_end//60)}:{int(curr_end%60):02d}")
+                        
 
-                    with c2:
-                        # Start Later (+5s) -> Decrease Duration to keep End fixed
-                        if st.button("⏩ Start +5s", key=f"s_post_{short_name}", help="Cut first 5s (Keep End fixed)"):
-                            st.session_state[adj_key]['start'] += 5
-                            st.session_state[adj_key]['duration'] = max(5, st.session_state[adj_key]['duration'] - 5)
                             
-                            # Update widgets
-                            new_s = st.session_state[adj_key]['start']
-                            st.session_state[f"emin_{short_name}"] = new_s // 60
-                            st.session_state[f"esec_{short_name}"] = new_s % 60
-                            st.session_state[f"edur_{short_name}"] = st.session_state[adj_key]['duration']
-                            st.rerun()
+                        # Quick adjust buttons (FIRST - before inputs)
+                        st.markdown("**Fine-Tune Clip:**")
+                        
+                        # Row 1: Start Time Adjustments (Keep End Time Fixed)
+                        c1, c2, c3, c4 = st.columns(4)
+                        
+                        with c1:
+                            # Start Earlier (-5s) -> Increase Duration
+                            if st.button("⏪ Start -5s", key=f"s_pre_{short_name}", help="Include previous 5s (Keep End fixed)"):
+                                new_s = max(0, st.session_state[adj_key]['start'] - 5)
+                                diff = st.session_state[adj_key]['start'] - new_s
+                                st.session_state[adj_key]['start'] = new_s
+                                st.session_state[adj_key]['duration'] += diff
+                                
+                                # Update widgets
+                                st.session_state[f"emin_{short_name}"] = new_s // 60
+                                st.session_state[f"esec_{short_name}"] = new_s % 60
+                                st.session_state[f"edur_{short_name}"] = st.session_state[adj_key]['duration']
+                                st.rerun()
 
-                    with c3:
-                        # End Earlier (-5s) -> Decrease Duration
-                        if st.button("❌ End -5s", key=f"e_pre_{short_name}", help="Cut last 5s (Keep Start fixed)"):
-                            st.session_state[adj_key]['duration'] = max(5, st.session_state[adj_key]['duration'] - 5)
-                            # Update widgets
-                            st.session_state[f"edur_{short_name}"] = st.session_state[adj_key]['duration']
-                            st.rerun()
+                        with c2:
+                            # Start Later (+5s) -> Decrease Duration to keep End fixed
+                            if st.button("⏩ Start +5s", key=f"s_post_{short_name}", help="Cut first 5s (Keep End fixed)"):
+                                st.session_state[adj_key]['start'] += 5
+                                st.session_state[adj_key]['duration'] = max(5, st.session_state[adj_key]['duration'] - 5)
+                                
+                                # Update widgets
+                                new_s = st.session_state[adj_key]['start']
+                                st.session_state[f"emin_{short_name}"] = new_s // 60
+                                st.session_state[f"esec_{short_name}"] = new_s % 60
+                                st.session_state[f"edur_{short_name}"] = st.session_state[adj_key]['duration']
+                                st.rerun()
 
-                    with c4:
-                        # End Later (+5s) -> Increase Duration
-                        if st.button("➕ End +5s", key=f"e_post_{short_name}", help="Include next 5s (Keep Start fixed)"):
-                            st.session_state[adj_key]['duration'] = min(300, st.session_state[adj_key]['duration'] + 5)
-                            # Update widgets
-                            st.session_state[f"edur_{short_name}"] = st.session_state[adj_key]['duration']
-                            st.session_state[f"ealign_{short_name}"] = st.session_state[adj_key].get('manual_alignment', 0.5)
-                            st.rerun()
-                    
-                    st.divider()
-                    
-                    # Detect Source Video (Moved up for Preview)
-                    preview_source = None
-                    try:
-                        # 1. Check metadata.json
-                        if os.path.exists(meta_file):
-                                import json
-                                try:
-                                    with open(meta_file, 'r') as f:
-                                        m = json.load(f)
-                                        if 'original_video' in m and os.path.exists(m['original_video']):
-                                            preview_source = m['original_video']
-                                except: pass
-                        
-                        # 2. Fallback
-                        if not preview_source:
-                            import glob
-                            videos = glob.glob("*.mp4")
-                            if videos:
-                                # Filter out shorts/trimmed
-                                candidates = [v for v in videos if "short" not in v and "trimmed" not in v]
-                                if candidates:
-                                    preview_source = max(candidates, key=os.path.getsize)
-                                else:
-                                    preview_source = max(videos, key=os.path.getsize)
-                    except: pass
+                        with c3:
+                            # End Earlier (-5s) -> Decrease Duration
+                            if st.button("❌ End -5s", key=f"e_pre_{short_name}", help="Cut last 5s (Keep Start fixed)"):
+                                st.session_state[adj_key]['duration'] = max(5, st.session_state[adj_key]['duration'] - 5)
+                                # Update widgets
+                                st.session_state[f"edur_{short_name}"] = st.session_state[adj_key]['duration']
+                                st.rerun()
 
-                    # New timing controls
-                    col_time1, col_time2 = st.columns(2)
+                        with c4:
+                            # End Later (+5s) -> Increase Duration
+                            if st.button("➕ End +5s", key=f"e_post_{short_name}", help="Include next 5s (Keep Start fixed)"):
+                                st.session_state[adj_key]['duration'] = min(300, st.session_state[adj_key]['duration'] + 5)
+                                # Update widgets
+                                st.session_state[f"edur_{short_name}"] = st.session_state[adj_key]['duration']
+                                st.session_state[f"ealign_{short_name}"] = st.session_state[adj_key].get('manual_alignment', 0.5)
+                                st.rerun()
                         
-                    # Use session state values as defaults
-                    adjusted_start = st.session_state[adj_key]['start']
-                    adjusted_duration = int(st.session_state[adj_key]['duration'])
-                    adjusted_face = st.session_state[adj_key].get('face_tracking', False)
-                    adjusted_align = st.session_state[adj_key].get('manual_alignment', 0.5)
-                    adjusted_start_min = int(adjusted_start // 60)
-                    adjusted_start_sec = int(adjusted_start % 60)
+                        st.divider()
                         
-                    with col_time1:
-                        st.markdown("**Start Time**")
-                        new_start_min = st.number_input("Min", 0, 999, adjusted_start_min, key=f"emin_{short_name}")
-                        new_start_sec = st.number_input("Sec", 0, 59, adjusted_start_sec, key=f"esec_{short_name}")
-                        new_start = new_start_min * 60 + new_start_sec
+                        # Source Video (Moved up for Preview) - recorded in the catalog
+                        preview_source = short["source_path"] if short["source_path"] and os.path.exists(short["source_path"]) else None
+
+                        # New timing controls
+                        col_time1, col_time2 = st.columns(2)
                             
-                        # Update session state when manually changed
-                        if new_start != adjusted_start:
-                            st.session_state[adj_key]['start'] = new_start
-                        
-                    with col_time2:
-                        st.markdown("**Duration & Settings**")
-                        new_duration = st.slider("Seconds", 10, 120, adjusted_duration, 5, key=f"edur_{short_name}")
-                        new_end = new_start + new_duration
-                        st.caption(f"End: {int(new_end//60)}:{int(new_end%60):02d}")
-                        
-                        # Face Tracking Override
-                        new_face = st.checkbox("Enable Face Tracking", value=adjusted_face, key=f"eface_{short_name}", help="Uncheck to fix shaky camera (uses Manual Crop)")
-                        
-                        # Manual Alignment (Only if Face Tracking OFF)
-                        new_align = adjusted_align
-                        if not new_face:
-                            new_align = st.slider("Crop Focus (Left <> Right)", 0.0, 1.0, adjusted_align, 0.1, key=f"ealign_{short_name}", help="0.0=Left, 0.5=Center, 1.0=Right")
+                        # Use session state values as defaults
+                        adjusted_start = st.session_state[adj_key]['start']
+                        adjusted_duration = int(st.session_state[adj_key]['duration'])
+                        adjusted_face = st.session_state[adj_key].get('face_tracking', False)
+                        adjusted_align = st.session_state[adj_key].get('manual_alignment', 0.5)
+                        adjusted_start_min = int(adjusted_start // 60)
+                        adjusted_start_sec = int(adjusted_start % 60)
                             
-                            # --- CROP PREVIEW ---
-                            if preview_source and os.path.exists(preview_source):
-                                try:
-                                    import cv2
-                                    cap = cv2.VideoCapture(preview_source)
-                                    cap.set(cv2.CAP_PROP_POS_MSEC, adjusted_start * 1000)
-                                    ret, frame = cap.read()
-                                    cap.release()
-                                    
-                                    if ret:
-                                        # BGR to RGB
-                                        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                        with col_time1:
+                            st.markdown("**Start Time**")
+                            new_start_min = st.number_input("Min", 0, 999, adjusted_start_min, key=f"emin_{short_name}")
+                            new_start_sec = st.number_input("Sec", 0, 59, adjusted_start_sec, key=f"esec_{short_name}")
+                            new_start = new_start_min * 60 + new_start_sec
+                                
+                            # Update session state when manually changed
+                            if new_start != adjusted_start:
+                                st.session_state[adj_key]['start'] = new_start
+                            
+                        with col_time2:
+                            st.markdown("**Duration & Settings**")
+                            new_duration = st.slider("Seconds", 10, 120, adjusted_duration, 5, key=f"edur_{short_name}")
+                            new_end = new_start + new_duration
+                            st.caption(f"End: {int(new_end//60)}:{int(new_end%60):02d}")
+                            
+                            # Face Tracking Override
+                            new_face = st.checkbox("Enable Face Tracking", value=adjusted_face, key=f"eface_{short_name}", help="Uncheck to fix shaky camera (uses Manual Crop)")
+                            
+                            # Manual Alignment (Only if Face Tracking OFF)
+                            new_align = adjusted_align
+                            if not new_face:
+                                new_align = st.slider("Crop Focus (Left <> Right)", 0.0, 1.0, adjusted_align, 0.1, key=f"ealign_{short_name}", help="0.0=Left, 0.5=Center, 1.0=Right")
+                                
+                                # --- CROP PREVIEW ---
+                                frame = preview_frame(preview_source, new_start) if preview_source and os.path.exists(preview_source) else None
+                                if frame is not None:
+                                    try:
                                         h, w, _ = frame.shape
                                         
                                         # Calculate Crop Rect (Same logic as smart_crop.py)
@@ -903,354 +924,214 @@ else:
                                         # Show Preview
                                         st.caption("🖼️ Live Preview:")
                                         st.image(crop_img, use_container_width=False, width=150)
-                                except Exception as e:
-                                    pass
+                                    except Exception as e:
+                                        pass
 
-                        # Update session state when manually changed
-                        if new_duration != adjusted_duration:
-                            st.session_state[adj_key]['duration'] = new_duration
-                        if new_face != adjusted_face:
-                            st.session_state[adj_key]['face_tracking'] = new_face
-                        if new_align != adjusted_align:
-                            st.session_state[adj_key]['manual_alignment'] = new_align
-                        
+                            # Update session state when manually changed
+                            if new_duration != adjusted_duration:
+                                st.session_state[adj_key]['duration'] = new_duration
+                            if new_face != adjusted_face:
+                                st.session_state[adj_key]['face_tracking'] = new_face
+                            if new_align != adjusted_align:
+                                st.session_state[adj_key]['manual_alignment'] = new_align
+                            
 
-                    st.divider()
-                    
-                    # Preview (Hidden by default, used for verification)
-                    with st.expander("👁️ Verify Timestamp (Preview Source)", expanded=False):
-                        st.caption("Use this to check if the Start Time matches the scene you want.")
-                        
-                        import glob
-                        all_videos = glob.glob("*.mp4")
-                        source_candidates = [v for v in all_videos if "short" not in v and "trimmed" not in v]
-                        if not source_candidates: source_candidates = all_videos
+                        st.divider()
                         
-                        default_idx = 0
-                        # Use preview_source detected above as default
-                        if preview_source and preview_source in source_candidates:
-                            default_idx = source_candidates.index(preview_source)
-                        elif source_candidates:
-                             largest = max(source_candidates, key=os.path.getsize)
-                             if largest in source_candidates:
-                                 default_idx = source_candidates.index(largest)
-                             
-                        selected_source = st.selectbox("🎥 Preview Source", source_candidates, index=default_idx, key=f"src_{short_name}")
-                        
-                        # Verify Source and Show Video
-                        if selected_source and os.path.exists(selected_source):
-                            pv_time = int(st.session_state[adj_key]['start'])
-                            st.caption(f"🎥 Previewing start at {int(pv_time//60)}:{int(pv_time%60):02d} (Click Play using the player controls)")
-                            st.video(selected_source, start_time=pv_time)
-                            st.info("💡 If this video doesn't match your clip, try changing the 'Preview Source' dropdown above.")
-                        else:
-                            st.warning("Source video not found")
-                   
-                    # Apply button
-                    if st.button("✅ Regenerate with New Timing", key=f"regen_{short_name}", type="primary", help="Takes ~30-60 seconds for a 1 min clip"):
-                        # Try to find original path automatically
-                        original_video = None
+                        # Preview (Hidden by default, used for verification)
+                        with st.expander("👁️ Verify Timestamp (Preview Source)", expanded=False):
+                            st.caption("Use this to check if the Start Time matches the scene you want.")
                             
-                        # 1. Check metadata.json
-                        meta_file = os.path.join(short_dir, "metadata.json")
-                        if os.path.exists(meta_file):
-                            import json
-                            try:
-                                with open(meta_file, 'r') as f:
-                                    meta = json.load(f)
-                                    if 'original_video' in meta and os.path.exists(meta['original_video']):
-                                        original_video = meta['original_video']
-                            except:
-                                pass
+                            # Known sources from the catalog
+                            source_candidates = [src["path"] for src in catalog.list_sources() if os.path.exists(src["path"])]
                             
-                        # 2. Check recent uploads (fallback)
-                        if not original_video:
-                            # Look for uploaded file in current dir
-                            videos = glob.glob("*.mp4")
-                            if videos:
-                                # Pick the largest file (likely the source)
-                                original_video = max(videos, key=os.path.getsize)
+                            default_idx = 0
+                            # Use preview_source detected above as default
+                            if preview_source and preview_source in source_candidates:
+                                default_idx = source_candidates.index(preview_source)
+                                 
+                            selected_source = st.selectbox("🎥 Preview Source", source_candidates, index=default_idx, key=f"src_{short_name}")
                             
-                        if not original_video:
-                            st.warning("ℹ️ Could not auto-detect source video. Please specify path:")
-                            original_video = st.text_input("Original video path:", key=f"origpath_{short_name}")
-                        else:
-                            st.success(f"Source: {os.path.basename(original_video)} | Segment: {int(new_start//60)}:{int(new_start%60):02d} - {int(new_end//60)}:{int(new_end%60):02d}")
+                            # Verify Source and Show Video
+                            if selected_source and os.path.exists(selected_source):
+                                pv_time = int(st.session_state[adj_key]['start'])
+                                st.caption(f"🎥 Previewing start at {int(pv_time//60)}:{int(pv_time%60):02d} (Click Play using the player controls)")
+                                st.video(proxy_for(selected_source) or selected_source, start_time=pv_time)
+                                st.info("💡 If this video doesn't match your clip, try changing the 'Preview Source' dropdown above.")
+                            else:
+                                st.warning("Source video not found")
+                       
+                        # Apply button
+                        if st.button("✅ Regenerate with New Timing", key=f"regen_{short_name}", type="primary", help="Takes ~30-60 seconds for a 1 min clip"):
+                            # Source recorded in the catalog for this short
+                            original_video = preview_source
                                 
-                        if original_video and os.path.exists(original_video):
-                            # Progress Bar Implementation
-                            progress_bar = st.progress(0)
-                            status_text = st.empty()
-                            
-                            with st.spinner("Regenerating clip..."):
-                                try:
-                                    # Imports
-                                    # Fix for MoviePy v2.0+
-                                    try:
-                                        from moviepy import VideoFileClip
-                                    except ImportError:
-                                        from moviepy.editor import VideoFileClip
-                                            
-                                    from auto_shorts import smart_reframe, generate_subtitles
-                                    # Local burn function since we need specific ffmpeg args
-                                    import subprocess
-
-                                    # Paths
-                                    temp_cut = os.path.join(short_dir, "temp_cut_regen.mp4")
-                                    cropped_video = os.path.join(short_dir, "cropped_regen.mp4")
-                                    final_srt = os.path.join(short_dir, "subtitles.srt") # Overwrite old SRT
-                                        
-                                    # 1. Cut Video (0-25%)
-                                    status_text.text("✂️ Cutting video to new timestamp...")
-                                    progress_bar.progress(10)
+                            if not original_video:
+                                st.warning("ℹ️ Could not auto-detect source video. Please specify path:")
+                                original_video = st.text_input("Original video path:", key=f"origpath_{short_name}")
+                            else:
+                                st.success(f"Source: {os.path.basename(original_video)} | Segment: {int(new_start//60)}:{int(new_start%60):02d} - {int(new_end//60)}:{int(new_end%60):02d}")
                                     
-                                    # Verify Source Duration (Prevent seeking beyond end)
-                                    try:
-                                        from auto_shorts import get_video_duration
-                                        src_dur = get_video_duration(original_video)
-                                        if new_start > src_dur:
-                                            st.error(f"❌ Error: Start time ({new_start}s) is greater than Source Video duration ({src_dur:.1f}s).")
-                                            st.warning("👉 You might be using a CLIP as the source instead of the FULL video. Check the 'Verify Timestamp' section below to switch source.")
-                                            st.stop()
-                                    except:
-                                        pass # Skip check if duration fails (fallback to ffmpeg error)
+                            if original_video and os.path.exists(original_video):
+                                # Use setting from UI (Session State)
+                                use_face = st.session_state[adj_key].get('face_tracking', False)
+                                manual_align = st.session_state[adj_key].get('manual_alignment', 0.5)
+                                
+                                # Cut + crop run in the background job pool (old clip kept as .bak)
+                                job_manager.submit("regenerate", f"✂️ Regenerate: {short_name}",
+                                                   regenerate_clip_job, short_dir, video_path, os.path.abspath(original_video),
+                                                   new_start, new_end, use_face=use_face, manual_align=manual_align)
+                                st.success("✅ Regeneration queued! Click 'Create Subtitles' above once it's done.")
+                    
+                    # Undo Logic for Safety
+                    if os.path.basename(video_path) + ".bak" in short["files"]:
+                        if st.button("↩️ Undo Last Update (Restore Backup)", key=f"undo_{short_name}"):
+                             backup_vid = video_path + ".bak"
+                             if os.path.exists(video_path):
+                                 os.remove(video_path)
+                             os.rename(backup_vid, video_path)
+                             shorts_index.invalidate()
+                             st.toast("Restored previous version!", icon="↩️")
+                             st.rerun()
 
-                                    # Direct FFmpeg Cut (Accurate Seeking - slower but precise)
-                                    cmd_cut = [
-                                        "ffmpeg", 
-                                        "-i", original_video,
-                                        "-ss", str(new_start),
-                                        "-t", str(new_end - new_start),
-                                        "-c:v", "libx264", "-c:a", "aac",
-                                        "-y", 
-                                        temp_cut
-                                    ]
-                                    status_text.text(f"✂️ Cutting {new_start}s-{new_end}s (Accurate Mode)...")
-                                    subprocess.run(cmd_cut, check=True, capture_output=True)
-                                        
-                                    progress_bar.progress(25)
-                                        
-                                    # 2. Smart Crop (25-50%)
-                                    # Use setting from UI (Session State)
-                                    use_face = st.session_state[adj_key].get('face_tracking', False)
-                                    manual_align = st.session_state[adj_key].get('manual_alignment', 0.5)
+                    # Subtitle Editor (Smart Vizard Support)
+                    if srt_file:
+                        with st.expander("✏️ Edit Subtitles (Fix Transcription)", expanded=False):
+                            st.caption("Edit the plain text below. We will automatically re-apply the Vizard styling (Yellow Highlights)!")
+                            
+                            # Read SRT file
+                            srt_path = srt_file[0]
+                            with open(srt_path, 'r', encoding='utf-8') as f:
+                                srt_content = f.read()
+                            
+                            # Parse SRT into simple list of (start, end, active_word)
+                            # Vizard lines look like: prev <font...><b>CURRENT</b></font> next
+                            import re
+                            
+                            raw_segments = []
+                            current_segment = {}
+                            
+                            for line in srt_content.split('\n'):
+                                line = line.strip()
+                                if line.isdigit() and not current_segment:
+                                    current_segment['index'] = int(line)
+                                elif '-->' in line:
+                                    parts = line.split(' --> ')
+                                    current_segment['start'] = parts[0]
+                                    current_segment['end'] = parts[1]
+                                elif line and 'index' in current_segment and 'start' in current_segment:
+                                    # This is the text line. Extract information.
+                                    text_line = line
                                     
-                                    # Update metadata to remember preference
-                                    if os.path.exists(meta_file):
-                                        try:
-                                            with open(meta_file, 'r') as f:
-                                                m = json.load(f)
-                                            m['face_tracking'] = use_face
-                                            m['manual_alignment'] = manual_align
-                                            with open(meta_file, 'w') as f:
-                                                json.dump(m, f, indent=4)
-                                        except: pass
-                                            
-                                    status_text.text(f"📐 Smart Cropping (Face Tracking: {use_face}, Align: {manual_align})...")
-                                    smart_reframe(temp_cut, cropped_video, use_face_tracking=use_face, smoothing_seconds=4, manual_alignment=manual_align)
-                                    progress_bar.progress(50)
-                                        
-                                    # 3. Transcribe (50-80%)
-                                    # 3. Skip Transcribe/Burn (User Request: Separaate Subtitle Step)
-                                    status_text.text("✅ Video updated! (Click 'Create Subtitles' above to add them)")
-                                    progress_bar.progress(90)
+                                    # Extract correct word using Regex searching for the colored tag
+                                    # Pattern: <font color="#FFEE00"><b>(.*?)</b></font>
+                                    match = re.search(r'<font color="#FFEE00"><b>(.*?)</b></font>', text_line)
+                                    if match:
+                                        clean_word = match.group(1)
+                                    else:
+                                        # Fallback: if no tag (maybe plain srt), use whole line
+                                        clean_word = text_line
                                     
-                                    # Remove old SRT so "Create Subtitles" button appears
-                                    if os.path.exists(final_srt):
-                                        os.remove(final_srt)
-                                        
-                                    # Use cropped video as final output directly
-                                    output_final = cropped_video
-                                        
-                                    # 5. Cleanup & Replace
-                                    # Backup old video just in case (Safety)
-                                    if os.path.exists(video_path):
-                                        backup_path = video_path + ".bak"
-                                        if os.path.exists(backup_path):
-                                            os.remove(backup_path)
-                                        os.rename(video_path, backup_path)
-                                        st.caption(f"💾 Backup saved as {os.path.basename(backup_path)}")
-                                        
-                                    # Rename new to final
-                                    os.rename(output_final, video_path)
-                                        
-                                    # Cleanup temps
-                                    if os.path.exists(temp_cut): os.remove(temp_cut)
-                                    if os.path.exists(cropped_video): os.remove(cropped_video)
-                                        
-                                    # Update metadata
-                                    if os.path.exists(meta_file):
-                                        with open(meta_file, 'r+') as f:
-                                            m = json.load(f)
-                                            m['start_time'] = new_start
-                                            m['end_time'] = new_end
-                                            m['duration'] = new_end - new_start
-                                            f.seek(0)
-                                            json.dump(m, f, indent=4)
-                                            f.truncate()
-                                        
-                                    progress_bar.progress(100)
-                                    status_text.text("✅ Done!")
-                                    st.success("✅ Clip regenerated & Subtitles updated!")
-                                    time.sleep(1)
-                                    st.rerun()
-                                        
-                                except Exception as e:
-                                    st.error(f"Error regeneration: {str(e)}")
-                                    import traceback
-                                    st.code(traceback.format_exc())
-                
-                # Undo Logic for Safety
-                if os.path.exists(video_path + ".bak"):
-                    if st.button("↩️ Undo Last Update (Restore Backup)", key=f"undo_{short_name}"):
-                         backup_vid = video_path + ".bak"
-                         if os.path.exists(video_path):
-                             os.remove(video_path)
-                         os.rename(backup_vid, video_path)
-                         st.success("Restored previous version!")
-                         import time
-                         time.sleep(1)
-                         st.rerun()
-
-                # Subtitle Editor (Smart Vizard Support)
-                if srt_file:
-                    with st.expander("✏️ Edit Subtitles (Fix Transcription)", expanded=False):
-                        st.caption("Edit the plain text below. We will automatically re-apply the Vizard styling (Yellow Highlights)!")
-                        
-                        # Read SRT file
-                        srt_path = srt_file[0]
-                        with open(srt_path, 'r', encoding='utf-8') as f:
-                            srt_content = f.read()
-                        
-                        # Parse SRT into simple list of (start, end, active_word)
-                        # Vizard lines look like: prev <font...><b>CURRENT</b></font> next
-                        import re
-                        
-                        raw_segments = []
-                        current_segment = {}
-                        
-                        for line in srt_content.split('\n'):
-                            line = line.strip()
-                            if line.isdigit() and not current_segment:
-                                current_segment['index'] = int(line)
-                            elif '-->' in line:
-                                parts = line.split(' --> ')
-                                current_segment['start'] = parts[0]
-                                current_segment['end'] = parts[1]
-                            elif line and 'index' in current_segment and 'start' in current_segment:
-                                # This is the text line. Extract information.
-                                text_line = line
-                                
-                                # Extract correct word using Regex searching for the colored tag
-                                # Pattern: <font color="#FFEE00"><b>(.*?)</b></font>
-                                match = re.search(r'<font color="#FFEE00"><b>(.*?)</b></font>', text_line)
-                                if match:
-                                    clean_word = match.group(1)
-                                else:
-                                    # Fallback: if no tag (maybe plain srt), use whole line
-                                    clean_word = text_line
-                                
-                                current_segment['word'] = clean_word
-                                raw_segments.append(current_segment)
-                                current_segment = {}
-                        
-                        # Prepare Paragraph for Editor
-                        all_words = [seg['word'] for seg in raw_segments]
-                        paragraph_text = " ".join(all_words)
-                        
-                        # UI
-                        st.markdown("**Edit Paragraph:**")
-                        edited_paragraph = st.text_area(
-                            "Subtitles",
-                            value=paragraph_text,
-                            height=300,
-                            key=f"sub_vizard_{short_name}",
-                            label_visibility="collapsed"
-                        )
-                        
-                        if st.button("💾 Save Subtitles", key=f"save_wiz_{short_name}"):
-                            # 1. Process New Words
-                            new_words = edited_paragraph.strip().split()
+                                    current_segment['word'] = clean_word
+                                    raw_segments.append(current_segment)
+                                    current_segment = {}
                             
-                            # 2. Timing Strategy
-                            final_segments = []
-                            old_count = len(raw_segments)
-                            new_count = len(new_words)
+                            # Prepare Paragraph for Editor
+                            all_words = [seg['word'] for seg in raw_segments]
+                            paragraph_text = " ".join(all_words)
                             
-                            print(f"Update: {old_count} words -> {new_count} words")
+                            # UI
+                            st.markdown("**Edit Paragraph:**")
+                            edited_paragraph = st.text_area(
+                                "Subtitles",
+                                value=paragraph_text,
+                                height=300,
+                                key=f"sub_vizard_{short_name}",
+                                label_visibility="collapsed"
+                            )
                             
-                            if old_count == new_count:
-                                # Ideal case: 1-to-1 mapping
-                                for i, word in enumerate(new_words):
-                                    final_segments.append({
-                                        'start': raw_segments[i]['start'],
-                                        'end': raw_segments[i]['end'],
-                                        'word': word
-                                    })
-                            else:
-                                # Mismatch: Distribute time linearly (Simplest approach)
-                                # This handles fixes like "Is it" -> "Isit" or "Its" -> "It is"
-                                st.toast(f"Word count changed ({old_count}->{new_count}). Adjusting timings...", icon="⚠️")
+                            if st.button("💾 Save Subtitles", key=f"save_wiz_{short_name}"):
+                                # 1. Process New Words
+                                new_words = edited_paragraph.strip().split()
                                 
-                                # Convert timestamp string to seconds helper
-                                def ts_to_sec(ts):
-                                    h, m, s = ts.replace(',', '.').split(':')
-                                    return int(h)*3600 + int(m)*60 + float(s)
+                                # 2. Timing Strategy
+                                final_segments = []
+                                old_count = len(raw_segments)
+                                new_count = len(new_words)
                                 
-                                def sec_to_ts(s):
-                                    import datetime
-                                    td = datetime.timedelta(seconds=s)
-                                    total_seconds = int(td.total_seconds())
-                                    hours = total_seconds // 3600
-                                    minutes = (total_seconds % 3600) // 60
-                                    seconds_ = total_seconds % 60
-                                    milliseconds = int(td.microseconds / 1000)
-                                    return f"{hours:02d}:{minutes:02d}:{seconds_:02d},{milliseconds:03d}"
-
-                                total_start = ts_to_sec(raw_segments[0]['start'])
-                                total_end = ts_to_sec(raw_segments[-1]['end'])
-                                duration = total_end - total_start
-                                freq = duration / new_count
+                                print(f"Update: {old_count} words -> {new_count} words")
                                 
-                                for i, word in enumerate(new_words):
-                                    s_time = total_start + (i * freq)
-                                    e_time = total_start + ((i + 1) * freq)
-                                    # Add tiny gap
-                                    e_time = max(s_time + 0.1, e_time - 0.05)
+                                if old_count == new_count:
+                                    # Ideal case: 1-to-1 mapping
+                                    for i, word in enumerate(new_words):
+                                        final_segments.append({
+                                            'start': raw_segments[i]['start'],
+                                            'end': raw_segments[i]['end'],
+                                            'word': word
+                                        })
+                                else:
+                                    # Mismatch: Distribute time linearly (Simplest approach)
+                                    # This handles fixes like "Is it" -> "Isit" or "Its" -> "It is"
+                                    st.toast(f"Word count changed ({old_count}->{new_count}). Adjusting timings...", icon="⚠️")
                                     
-                                    final_segments.append({
-                                        'start': sec_to_ts(s_time),
-                                        'end': sec_to_ts(e_time),
-                                        'word': word
-                                    })
-
-                            # 3. Reconstruct HTML (Prev + Highlight + Next)
-                            with open(srt_path, 'w', encoding='utf-8') as f:
-                                for i, seg in enumerate(final_segments):
-                                    # Context
-                                    parts = []
-                                    if i > 0:
-                                        parts.append(final_segments[i-1]['word'])
+                                    # Convert timestamp string to seconds helper
+                                    def ts_to_sec(ts):
+                                        h, m, s = ts.replace(',', '.').split(':')
+                                        return int(h)*3600 + int(m)*60 + float(s)
                                     
-                                    # Highlight Current
-                                    parts.append(f'<font color="#FFEE00"><b>{seg["word"]}</b></font>')
+                                    def sec_to_ts(s):
+                                        import datetime
+                                        td = datetime.timedelta(seconds=s)
+                                        total_seconds = int(td.total_seconds())
+                                        hours = total_seconds // 3600
+                                        minutes = (total_seconds % 3600) // 60
+                                        seconds_ = total_seconds % 60
+                                        milliseconds = int(td.microseconds / 1000)
+                                        return f"{hours:02d}:{minutes:02d}:{seconds_:02d},{milliseconds:03d}"
+
+                                    total_start = ts_to_sec(raw_segments[0]['start'])
+                                    total_end = ts_to_sec(raw_segments[-1]['end'])
+                                    duration = total_end - total_start
+                                    freq = duration / new_count
                                     
-                                    if i < len(final_segments) - 1:
-                                        parts.append(final_segments[i+1]['word'])
+                                    for i, word in enumerate(new_words):
+                                        s_time = total_start + (i * freq)
+                                        e_time = total_start + ((i + 1) * freq)
+                                        # Add tiny gap
+                                        e_time = max(s_time + 0.1, e_time - 0.05)
                                         
-                                    text_line = " ".join(parts)
-                                    
-                                    f.write(f"{i+1}\n")
-                                    f.write(f"{seg['start']} --> {seg['end']}\n")
-                                    f.write(f"{text_line}\n\n")
-                            
-                            st.success("✅ Subtitles Updated! (Vizard Style Re-applied)")
-                            time.sleep(1)
-                            st.rerun()
+                                        final_segments.append({
+                                            'start': sec_to_ts(s_time),
+                                            'end': sec_to_ts(e_time),
+                                            'word': word
+                                        })
+
+                                # 3. Reconstruct HTML (Prev + Highlight + Next)
+                                with open(srt_path, 'w', encoding='utf-8') as f:
+                                    for i, seg in enumerate(final_segments):
+                                        # Context
+                                        parts = []
+                                        if i > 0:
+                                            parts.append(final_segments[i-1]['word'])
+                                        
+                                        # Highlight Current
+                                        parts.append(f'<font color="#FFEE00"><b>{seg["word"]}</b></font>')
+                                        
+                                        if i < len(final_segments) - 1:
+                                            parts.append(final_segments[i+1]['word'])
+                                            
+                                        text_line = " ".join(parts)
+                                        
+                                        f.write(f"{i+1}\n")
+                                        f.write(f"{seg['start']} --> {seg['end']}\n")
+                                        f.write(f"{text_line}\n\n")
                                 
+                                st.toast("Subtitles Updated! (Vizard Style Re-applied)", icon="✅")
+                                st.rerun()
+                                    
 
-                    
-                    # View-only mode
+                        
+                        # View-only mode
 
             
             st.markdown("</div>", unsafe_allow_html=True)
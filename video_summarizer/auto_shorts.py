@@ -2,19 +2,44 @@
 import os
 import sys
 import argparse
-import random
+import json
 import datetime
-import whisper
-from moviepy import VideoFileClip
+import time
+# Heavy libraries load on first use (--preview never touches Whisper)
+from lazy_imports import lazy_import
 # Import our smart cropping logic
-from smart_crop import smart_reframe
+from smart_crop import plan_variants, parse_aspect
+# One-pass ffmpeg renders (seek + crop + subtitles + encode)
+from render_backend import render, render_replacing, make_spec, extract_audio, save_spec, load_spec, variant_path, DEFAULT_PROFILE, RENDER_SPEC_FILE
+# Used-range index for picking non-overlapping slots
+from interval_index import IntervalIndex
+# Content-aware slot selection
+from highlight_scoring import pick_highlights
+# Catalog of sources/shorts (history, metadata, timings)
+from catalog import Catalog
+# Low-res proxy for analysis (falls back to the source)
+from proxy import analysis_path_for
+# JSON-lines progress events (consumed by the app)
+import progress_events
+from progress_events import emit
 # Import viral subtitle generator
 from subtitle_optimizer import generate_viral_subtitles
+# ffprobe duration (no decoder start-up)
+from frame_server import probe_duration
+# Optional VMAF-targeted CRF for publish renders
+from vmaf_search import find_crf
+# moov placement check (renders are written fast-start)
+from faststart import moov_placement
+# Per-batch manifest: slots + finished stages (resume after a crash)
+from batch_manifest import BatchManifest, clean_partial, new_batch_id
+
+moviepy = lazy_import("moviepy")
 
 # --- Configuration ---
 CLIP_DURATION = 60  # seconds
 OUTPUT_DIR = "generated_shorts"
-HISTORY_FILE = "generated_history.txt"
+RESERVE_ATTEMPTS = 3        # Re-picks when a concurrent batch took some of the chosen slots
+CROP_PLAN_FILE = "crop_plan.json"  # analyze stage output (reused on --resume)
 FFMPEG_BINARY = os.path.abspath("../bin/ffmpeg")
 
 # Setup FFmpeg
@@ -31,42 +56,30 @@ def format_timestamp(seconds: float):
     milliseconds = int(td.microseconds / 1000)
     return f"{hours:02d}:{minutes:02d}:{seconds_:02d},{milliseconds:03d}"
 
+def short_folder_for(start_time):
+    """generated_shorts/short_MM_SS for a slot start"""
+    return os.path.join(OUTPUT_DIR, f"short_{int(start_time//60):02d}_{int(start_time%60):02d}")
+
 def get_video_duration(video_path):
-    with VideoFileClip(video_path) as clip:
-        return clip.duration
+    duration = probe_duration(video_path)
+    if duration is None:
+        with moviepy.VideoFileClip(video_path) as clip:
+            duration = clip.duration
+    return duration
 
-def generate_subtitles(video_path, output_srt_path, model_size="small"):
+def generate_subtitles(video_path, output_srt_path, model_size="small", progress=None):
     """Generate ULTRA-CLEAN viral subtitles (1 word per line, no overlap)"""
-    return generate_viral_subtitles(video_path, output_srt_path, words_per_chunk=1, model_size=model_size)
+    return generate_viral_subtitles(video_path, output_srt_path, words_per_chunk=1, model_size=model_size, progress=progress)
 
-def burn_subtitles(video_path, srt_path, output_path):
-    """Burn subtitles into video using ffmpeg"""
+def burn_subtitles(video_path, srt_path, output_path, duration=None, progress=None, style="default", profile=DEFAULT_PROFILE):
+    """Burn subtitles into video (render_backend, one ffmpeg pass)"""
     print("   -> Burning subtitles into video...")
     try:
-        import subprocess
-        
-        # FFmpeg command to burn subtitles
-        # Using ass subtitles filter for better styling
-        cmd = [
-            "ffmpeg",
-            "-i", video_path,
-            "-vf", f"subtitles={srt_path}:force_style='FontName=Arial,FontSize=24,PrimaryColour=&HFFFFFF,OutlineColour=&H000000,BorderStyle=3,Outline=2,Shadow=1,MarginV=20,Alignment=2'",
-            "-c:a", "copy",  # Copy audio without re-encoding
-            "-y",  # Overwrite output file
-            output_path
-        ]
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            print(f"   -> Subtitles burned successfully!")
-            return True
-        else:
-            print(f"   -> Warning: Could not burn subtitles: {result.stderr}")
-            return False
-            
+        render(make_spec(video_path, output_path, end=duration, subtitles=srt_path, subtitle_style=style, profile=profile), progress)
+        print(f"   -> Subtitles burned successfully!")
+        return True
     except Exception as e:
-        print(f"   -> Error burning subtitles: {e}")
+        print(f"   -> Warning: Could not burn subtitles: {e}")
         return False
 
 
@@ -100,14 +113,29 @@ def add_subtitles_to_short(short_folder):
         print("   -> Transcribing...")
         generate_subtitles(temp_no_subs, final_srt)
         
-        # Burn subtitles
+        # Burn subtitles (keeping the short's encoder profile: drafts stay drafts)
         if os.path.exists(final_srt):
             print("   -> Burning subtitles...")
-            burn_success = burn_subtitles(temp_no_subs, final_srt, final_video)
+            spec = load_spec(short_folder)
+            profile = spec["profile"] if spec else DEFAULT_PROFILE
+            if spec and spec.get("variants") and os.path.exists(spec["source"]):
+                # The aspect variants need the captions too: re-render every output from the source
+                try:
+                    render_replacing({**spec, "subtitles": os.path.abspath(final_srt), "subtitle_style": "default"})
+                    burn_success = True
+                except RuntimeError as e:
+                    print(f"   -> Warning: Could not burn subtitles: {e}")
+                    burn_success = False
+            else:
+                burn_success = burn_subtitles(temp_no_subs, final_srt, final_video, profile=profile)
             
             if burn_success:
                 # Cleanup temp
                 os.remove(temp_no_subs)
+                if spec:
+                    save_spec({**spec, "subtitles": os.path.abspath(final_srt), "subtitle_style": "default"}, short_folder)
+                Catalog().update_short(short_folder, has_subtitles=True,
+                                       artifacts={"final": os.path.abspath(final_video), "subtitles": os.path.abspath(final_srt)})
                 print(f"   ✅ Subtitles added successfully!")
                 return True
             else:
@@ -125,160 +153,326 @@ def add_subtitles_to_short(short_folder):
         print(f"   ❌ Error: {e}")
         return False
 
+def promote_short(short_folder, progress=None, vmaf_target=None):
+    """
+    Re-render a kept short with the "publish" profile straight from its
+    source (saved render spec: same range, crop, subtitles and aspect variants).
+    vmaf_target: pick the cheapest CRF reaching this VMAF (vmaf_search)
+    instead of the profile's fixed CRF.
+    Returns True if the short is now a publish render.
+    """
+    try:
+        spec = load_spec(short_folder)
+        if spec is None:
+            print(f"   ❌ No render spec for {os.path.basename(short_folder)} (made before profiles existed)")
+            return False
+        if spec["profile"] == "publish" and (not vmaf_target or spec.get("vmaf_target") == vmaf_target):
+            print(f"   ✅ {os.path.basename(short_folder)} is already a publish render")
+            return True
+        if not os.path.exists(spec["source"]):
+            print(f"   ❌ Source video not found: {spec['source']}")
+            return False
+        
+        print(f"\n🚀 Publishing: {os.path.basename(short_folder)}")
+        final_video = os.path.join(short_folder, "final_short.mp4")
+        subtitles = spec.get("subtitles")
+        published = {**spec, "output": os.path.abspath(final_video), "profile": "publish",
+                     "subtitles": subtitles if subtitles and os.path.exists(subtitles) else None}
+        params = {"profile": "publish"}
+        if vmaf_target:
+            print(f"   -> Searching CRF for VMAF {vmaf_target:g}...")
+            published["crf"], _ = find_crf(published, vmaf_target)
+            published["vmaf_target"] = vmaf_target
+            params.update(crf=published["crf"], vmaf_target=vmaf_target)
+        render_replacing(published, progress)
+        save_spec(published, short_folder)
+        params["moov"] = moov_placement(final_video)
+        Catalog().update_short(short_folder, params=params)
+        print(f"   ✅ Published (moov atom: {params['moov'] or 'unknown'})")
+        return True
+        
+    except Exception as e:
+        print(f"   ❌ Error: {e}")
+        return False
 
 
-def load_history():
-    history = []
-    if os.path.exists(HISTORY_FILE):
-        with open(HISTORY_FILE, "r") as f:
-            for line in f:
-                history.append(float(line.strip()))
-    return history
-
-def save_history(start_time):
-    with open(HISTORY_FILE, "a") as f:
-        f.write(f"{start_time}\n")
-
-def is_overlapping(start_time, history, duration=CLIP_DURATION):
-    for prev_start in history:
-        # Check if the new clip overlaps with any previous clip
-        if abs(start_time - prev_start) < duration:
-            return True
-    return False
 
-def auto_generate_shorts(video_path, count=3, use_face_tracking=True, smoothing_seconds=4, preview_mode=False, model_size="small", range_start=0.0, range_end=None):
+def auto_generate_shorts(video_path, count=3, use_face_tracking=True, smoothing_seconds=4, preview_mode=False, model_size="small", range_start=0.0, range_end=None, detector="haar", framing=None, selection="random", transcript_srt=None, vmaf_target=None, aspects=(), resume=False):
     """
     Auto-generate shorts from video.
     
     Args:
         preview_mode: If True, skip subtitle generation (faster preview)
+        detector: Face detector backend for tracking ("haar", "profile", "dnn")
+        framing: "face", "saliency" (activity-based, no detector) or "fixed";
+                 None = derive from use_face_tracking
+        selection: "random" (uniform over free gaps) or "highlight" (best-scoring
+                   windows by audio energy, scene cuts and speech rate)
+        transcript_srt: Optional source-level SRT used for speech-rate scoring
+        vmaf_target: Full mode only - encode each short at the cheapest CRF
+                     that reaches this VMAF (None = the profile's fixed CRF)
+        aspects: Extra aspect variants per short, e.g. ["1:1", "4:5@1080x1350"]
+                 (same tracked path, encoded in the same ffmpeg pass as the 9:16)
+        resume: Continue an interrupted batch of this video (True = the newest
+                one no other job is running, or a batch id) from its manifest:
+                same slots and settings, finished stages with valid outputs are skipped
     """
-    if preview_mode:
-        print(f"🎬 PREVIEW MODE: Generating {count} shorts WITHOUT subtitles (faster!)")
-    else:
-        print(f"🎬 FULL MODE: Generating {count} shorts WITH subtitles")
-    
-    print(f"Processing: {video_path}")
-    
+    if framing is None:
+        framing = "face" if use_face_tracking else "fixed"
+
+    # Settings recorded in the batch manifest (a resumed batch keeps them)
+    options = dict(count=count, use_face_tracking=use_face_tracking, smoothing_seconds=smoothing_seconds,
+                   preview_mode=preview_mode, model_size=model_size, range_start=range_start, range_end=range_end,
+                   detector=detector, framing=framing, selection=selection, transcript_srt=transcript_srt,
+                   vmaf_target=vmaf_target, aspects=list(aspects))
+
     if not os.path.exists(video_path):
         print(f"Error: File {video_path} not found.")
         return
 
     # 1. Get Duration
     total_duration = get_video_duration(video_path)
-    print(f"Total Video Duration: {total_duration/60:.2f} minutes")
+
+    # Ranges already cut from THIS source (by content hash, not file name)
+    catalog = Catalog()
+    source_id = catalog.register_source(video_path, duration=total_duration)
+    content_hash = catalog.get_source(source_id)["content_hash"]
+
+    manifest = None
+    if resume:
+        manifest = BatchManifest.find(OUTPUT_DIR, content_hash, None if resume is True else resume)
+        if manifest is None:
+            print("⚠️ No interrupted batch for this video - starting a new one")
+        elif manifest.options != options:
+            print("♻️ Resuming with the batch's original settings")
+            return auto_generate_shorts(video_path, **manifest.options, resume=manifest.batch_id)
+        elif not manifest.claim():
+            print(f"⚠️ Batch {manifest.batch_id} was just resumed by another job")
+            return
     
-    # 2. Randomly Select Slots
-    history = load_history()
-    selected_slots = []
-    attempts = 0
-    max_attempts = 100
+    if preview_mode:
+        print(f"🎬 PREVIEW MODE: Generating {count} shorts WITHOUT subtitles (faster!)")
+    else:
+        print(f"🎬 FULL MODE: Generating {count} shorts WITH subtitles")
     
-    while len(selected_slots) < count and attempts < max_attempts:
-        # Random start time within user-specified range (leave buffer at end)
-        start_limit = range_start
-        end_limit = (range_end if range_end else total_duration) - CLIP_DURATION
-        
-        if end_limit <= start_limit:
-            print(f"Error: Selected range ({start_limit}-{end_limit+CLIP_DURATION}) is smaller than clip duration ({CLIP_DURATION}s). using 0-{total_duration} instead.")
-            start_limit = 0
-            end_limit = total_duration - CLIP_DURATION
+    print(f"Processing: {video_path}")
+    print(f"Total Video Duration: {total_duration/60:.2f} minutes")
+    
+    # 2. Randomly Select Slots (uniform over the free gaps of the range)
+    start_limit = range_start
+    end_limit = (range_end if range_end else total_duration) - CLIP_DURATION
 
-        possible_start = random.uniform(start_limit, end_limit)
-        
-        if not is_overlapping(possible_start, history) and not is_overlapping(possible_start, selected_slots):
-            selected_slots.append(possible_start)
-        else:
-            attempts += 1
-            
-    if len(selected_slots) < count:
-        print(f"Warning: Could only find {len(selected_slots)} non-overlapping slots.")
+    if end_limit <= start_limit:
+        print(f"Error: Selected range ({start_limit}-{end_limit+CLIP_DURATION}) is smaller than clip duration ({CLIP_DURATION}s). using 0-{total_duration} instead.")
+        start_limit = 0
+        end_limit = total_duration - CLIP_DURATION
+
+    analysis_video = analysis_path_for(video_path)
+    if analysis_video != video_path:
+        print(f"Using analysis proxy: {analysis_video}")
+    blocked = set()
+    if manifest is not None:
+        # Same slots as the interrupted run (its finished shorts are already in the catalog)
+        selected_slots = [slot["start"] for slot in manifest.slots]
+        print(f"♻️ Resuming batch {manifest.batch_id}: {len(manifest.pending())} of {len(selected_slots)} shorts left")
+        pending = [(manifest.slots[i]["start"], manifest.slots[i]["end"], manifest.slots[i]["folder"]) for i in manifest.pending()]
+        reserved = {folder for _, _, folder in catalog.reserve_slots(source_id, manifest.batch_id, pending)}
+        blocked = {i for i in manifest.pending() if manifest.slots[i]["folder"] not in reserved}
+    else:
+        # Chosen slots are reserved in the catalog before anything is rendered, so a
+        # concurrent batch on this source can't pick overlapping ranges or folders
+        batch_id = new_batch_id()
+        selected_slots = []
+        for _ in range(RESERVE_ATTEMPTS):
+            used = IntervalIndex(catalog.used_intervals(source_id))
+            wanted = count - len(selected_slots)
+            if selection == "highlight":
+                print("🔎 Selecting highlights (content-aware scoring)...")
+                picked = pick_highlights(analysis_video, start_limit, end_limit + CLIP_DURATION, CLIP_DURATION, wanted,
+                                         used_index=used, transcript_srt=transcript_srt)
+            else:
+                picked = used.pick_free_slots(start_limit, end_limit + CLIP_DURATION, CLIP_DURATION, wanted)
+            reserved = catalog.reserve_slots(source_id, batch_id,
+                                             [(start, start + CLIP_DURATION, short_folder_for(start)) for start in picked])
+            selected_slots += [start for start, _, _ in reserved]
+            if len(reserved) == len(picked):
+                break
+            print(f"   -> {len(picked) - len(reserved)} slot(s) were just taken by another batch - picking again")
+        selected_slots.sort()
+
+        if len(selected_slots) < count:
+            print(f"Warning: Could only find {len(selected_slots)} non-overlapping slots.")
+        manifest = BatchManifest.create(OUTPUT_DIR, video_path, content_hash, options,
+                                        [(start, start + CLIP_DURATION) for start in selected_slots],
+                                        [short_folder_for(start) for start in selected_slots], batch_id=batch_id)
     
     # 3. Process Each Slot
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    stages = ["analyze", "render"] if preview_mode else ["analyze", "transcribe", "render"]
+    emit("start", shorts=len(selected_slots), stages=stages)
     
     for i, start_time in enumerate(selected_slots):
         end_time = start_time + CLIP_DURATION
+        folder_name = manifest.slots[i]["folder"]
         
-        timestamp_str = f"{int(start_time//60):02d}_{int(start_time%60):02d}"
-        base_name = f"short_{timestamp_str}"
-        folder_name = os.path.join(OUTPUT_DIR, base_name)
+        if manifest.slots[i]["status"] == "done" and manifest.stage_done(i, "render") is not None:
+            print(f"\n[{i+1}/{len(selected_slots)}] ✅ Already done: {folder_name}")
+            emit("short_done", short=i, folder=os.path.abspath(folder_name))
+            continue
+        if i in blocked:
+            print(f"\n[{i+1}/{len(selected_slots)}] ⚠️ Skipped: another batch has taken {folder_name} or its range")
+            emit("short_failed", short=i, error="slot taken by another batch")
+            continue
         os.makedirs(folder_name, exist_ok=True)
+        clean_partial(folder_name)
         
-        temp_cut = os.path.join(folder_name, "temp_cut.mp4")
-        cropped_video = os.path.join(folder_name, "cropped.mp4")
+        temp_audio = os.path.join(folder_name, "temp_audio.wav")
+        # Previews are drafts; promote_short() re-renders the ones worth keeping
+        profile = "draft" if preview_mode else "publish"
         final_srt = os.path.join(folder_name, "subtitles.srt")
         final_video = os.path.join(folder_name, "final_short.mp4")
         
         print(f"\n[{i+1}/{len(selected_slots)}] Creating Short from {format_timestamp(start_time)} to {format_timestamp(end_time)}...")
         
+        def stage_progress(stage):
+            """Callback(seconds_done, duration) -> stage progress event"""
+            def report(done, total):
+                emit("stage", short=i, stage=stage, seconds=done,
+                     fraction=min(done / total, 1.0) if total else 0.0)
+            return report
+        
+        timings = {}
         try:
-            # A. Cut Video
-            with VideoFileClip(video_path) as video:
-                cut = video.subclipped(start_time, end_time)
-                cut.write_videofile(temp_cut, codec="libx264", audio_codec="aac", preset="ultrafast", logger=None)
-            
-            # B. Smart Crop
-            crop_mode = "Face Tracking" if use_face_tracking else "Fixed Center"
-            print(f"   -> Smart Cropping ({crop_mode})...")
-            smart_reframe(temp_cut, cropped_video, use_face_tracking, smoothing_seconds)
+            # A. Plan the crop (analysis reads the proxy; nothing is cut or encoded yet)
+            emit("stage", short=i, stage="analyze", fraction=0.0)
+            analyzed = manifest.stage_done(i, "analyze")
+            if analyzed is not None:
+                print("   -> Crop plan: reused from the interrupted run")
+                with open(analyzed["plan"], "r") as f:
+                    crops = json.load(f)
+            else:
+                stage_start = time.perf_counter()
+                crop_mode = {"face": "Face Tracking", "saliency": "Saliency Tracking", "fixed": "Fixed Center"}[framing]
+                print(f"   -> Smart Cropping ({crop_mode})...")
+                crops = plan_variants(video_path, ["9:16"] + [parse_aspect(a)[0] for a in aspects], start_time, end_time,
+                                      use_face_tracking, smoothing_seconds, detector=detector, framing=framing,
+                                      analysis_path=analysis_video)
+                if crops is None:
+                    raise RuntimeError(f"Could not open {video_path}")
+                timings["analyze"] = time.perf_counter() - stage_start
+                plan_file = os.path.abspath(os.path.join(folder_name, CROP_PLAN_FILE))
+                with open(plan_file, "w") as f:
+                    json.dump(crops, f)
+                manifest.mark_stage(i, "analyze", {"plan": plan_file}, timings["analyze"])
             
-            # C. Transcribe (SKIP in preview mode)
-            if not preview_mode:
+            # B. Transcribe (SKIP in preview mode) - from the range's audio only
+            if not preview_mode and manifest.stage_done(i, "transcribe") is not None:
+                print("   -> Subtitles: reused from the interrupted run")
+            elif not preview_mode:
                 print(f"   -> Generating Subtitles ({model_size})...")
-                generate_subtitles(cropped_video, final_srt, model_size=model_size)
-                
-                # D. Burn Subtitles into Video
+                emit("stage", short=i, stage="transcribe", fraction=0.0)
+                stage_start = time.perf_counter()
                 if os.path.exists(final_srt):
-                    burn_success = burn_subtitles(cropped_video, final_srt, final_video)
-                    
-                    if not burn_success:
-                        # If burning fails, use cropped video as final
-                        print("   -> Using video without burned subtitles")
-                        import shutil
-                        shutil.copy(cropped_video, final_video)
-                else:
-                    # No subtitles generated, use cropped video
-                    import shutil
-                    shutil.copy(cropped_video, final_video)
+                    os.remove(final_srt)  # possibly half-written by an interrupted run
+                extract_audio(video_path, temp_audio, start_time, end_time)
+                generate_subtitles(temp_audio, final_srt, model_size=model_size, progress=stage_progress("transcribe"))
+                timings["transcribe"] = time.perf_counter() - stage_start
+                manifest.mark_stage(i, "transcribe", {"subtitles": os.path.abspath(final_srt)} if os.path.exists(final_srt) else {},
+                                    timings["transcribe"])
             else:
-                # Preview mode: Skip subtitles, use cropped video directly
                 print("   -> Skipping subtitles (preview mode)")
-                import shutil
-                shutil.copy(cropped_video, final_video)
             
-            # Record History
-            save_history(start_time)
+            # C. Render: one ffmpeg pass from the source (seek, crop, subtitles, encode)
+            emit("stage", short=i, stage="render", fraction=0.0)
+            stage_start = time.perf_counter()
+            variants = [{"aspect": aspect, "output": os.path.abspath(variant_path(final_video, aspect)),
+                         "crop": crops[aspect], "size": size} for aspect, _, size in map(parse_aspect, aspects)]
+            spec = make_spec(os.path.abspath(video_path), os.path.abspath(final_video), start_time, end_time, crop=crops["9:16"],
+                             subtitles=os.path.abspath(final_srt) if os.path.exists(final_srt) else None, profile=profile,
+                             variants=variants)
+            if vmaf_target and not preview_mode:
+                print(f"   -> Searching CRF for VMAF {vmaf_target:g}...")
+                spec["crf"], _ = find_crf(spec, vmaf_target)
+                spec["vmaf_target"] = vmaf_target
+            try:
+                render(spec, stage_progress("render"))
+            except RuntimeError as e:
+                if not spec["subtitles"]:
+                    raise
+                # If burning fails, render without subtitles
+                print(f"   -> Warning: Could not burn subtitles: {e}")
+                print("   -> Using video without burned subtitles")
+                spec["subtitles"] = None
+                render(spec, stage_progress("render"))
+            timings["render"] = time.perf_counter() - stage_start
+            save_spec(spec, folder_name)
+            moov = moov_placement(final_video)
+            print(f"   -> moov atom: {moov or 'unknown'} {'✅ (fast-start)' if moov == 'front' else '⚠️'}")
+            
+            # Record in catalog (history + metadata for the Clip Editor)
+            render_params = {
+                "face_tracking": use_face_tracking,
+                "framing": framing,
+                "smoothing": smoothing_seconds,
+                "detector": detector,
+                "selection": selection,
+                "preview": preview_mode,
+                "profile": profile,
+                "moov": moov
+            }
+            if "crf" in spec:
+                render_params.update(crf=spec["crf"], vmaf_target=vmaf_target)
+            if variants:
+                render_params["variants"] = [{"aspect": v["aspect"], "file": os.path.basename(v["output"]),
+                                              "crop": [v["crop"]["width"], v["crop"]["height"]], "size": v["size"]}
+                                             for v in variants]
+            artifacts = {"final": os.path.abspath(final_video)}
+            for v in variants:
+                artifacts[f"variant_{v['aspect']}"] = v["output"]
+            if os.path.exists(final_srt):
+                artifacts["subtitles"] = os.path.abspath(final_srt)
+            catalog.add_short(source_id, folder_name, start_time, end_time, params=render_params,
+                              artifacts=artifacts, has_subtitles="subtitles" in artifacts)
+            catalog.release_slot(folder_name)       # the short itself now marks the range as used
+            for stage, seconds in timings.items():
+                catalog.record_stage(folder_name, stage, seconds)
             
-            # Save Metadata (for Clip Editor)
+            # Sidecar copy of the metadata (portable; re-imported by Catalog.import_legacy)
             metadata = {
                 "original_video": os.path.abspath(video_path),
                 "start_time": start_time,
                 "end_time": end_time,
                 "duration": end_time - start_time,
-                "face_tracking": use_face_tracking,
-                "smoothing": smoothing_seconds
+                **render_params
             }
-            import json
             with open(os.path.join(folder_name, "metadata.json"), "w") as f:
                 json.dump(metadata, f, indent=4)
             print(f"   -> Metadata saved (allows re-editing!)")
             
             # Cleanup temp files
-            if os.path.exists(temp_cut):
-                os.remove(temp_cut)
-            if os.path.exists(cropped_video):
-                os.remove(cropped_video)
+            if os.path.exists(temp_audio):
+                os.remove(temp_audio)
+            
+            # Checkpoint: the short is complete (rendered, cataloged, metadata written)
+            manifest.mark_stage(i, "render", {**artifacts, "spec": os.path.abspath(os.path.join(folder_name, RENDER_SPEC_FILE))},
+                                timings["render"])
+            manifest.mark_slot(i, "done")
                 
             print(f"   -> Success! Saved in {folder_name}")
+            emit("short_done", short=i, folder=os.path.abspath(folder_name))
             
         except Exception as e:
             print(f"   -> Failed: {e}")
+            manifest.mark_slot(i, "failed", str(e))
+            emit("short_failed", short=i, error=str(e))
 
     print("\n" + "="*50)
     print(f"All done! Generated {len(selected_slots)} shorts in '{OUTPUT_DIR}'")
     print("Run this script again to generate MORE unique shorts.")
+    if manifest.pending():
+        print(f"⚠️ {len(manifest.pending())} shorts did not finish - rerun with --resume {manifest.batch_id} to redo only their missing stages.")
+    manifest.close()
     print("="*50)
+    emit("done", shorts=len(selected_slots))
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Auto Generate Viral Shorts from Long Video")
@@ -286,14 +480,26 @@ if __name__ == "__main__":
     parser.add_argument("--count", type=int, default=3, help="Number of shorts to generate (default: 3)")
     parser.add_argument("--face-tracking", action="store_true", help="Enable face tracking (dynamic crop)")
     parser.add_argument("--no-face-tracking", action="store_true", help="Disable face tracking (fixed center crop)")
+    parser.add_argument("--saliency", action="store_true", help="Track on-screen activity instead of faces (B-roll, screen recordings)")
     parser.add_argument("--smoothing", type=int, default=4, help="Smoothing window in seconds (default: 4)")
     parser.add_argument("--preview", action="store_true", help="Preview mode: Skip subtitles for faster generation")
     parser.add_argument("--model-size", default="small", choices=["small", "large-v2", "medium"], help="Subtitle model size")
     parser.add_argument("--range-start", type=float, default=0.0, help="Start time for random selection (seconds)")
     parser.add_argument("--range-end", type=float, default=0.0, help="End time for random selection (seconds, 0 = end)")
+    parser.add_argument("--selection", default="random", choices=["random", "highlight"], help="How clip slots are chosen (default: random)")
+    parser.add_argument("--transcript", default=None, help="Source SRT for speech-rate scoring (highlight selection)")
+    parser.add_argument("--detector", default="haar", choices=["haar", "profile", "dnn"], help="Face detector backend (default: haar)")
+    parser.add_argument("--vmaf-target", type=float, default=None, help="Full mode: pick the cheapest CRF reaching this VMAF (e.g. 93) instead of a fixed CRF")
+    parser.add_argument("--aspects", default="", help="Extra aspect variants from the same render, e.g. 1:1,4:5@1080x1350")
+    parser.add_argument("--resume", nargs="?", const=True, default=False, metavar="BATCH_ID", help="Continue the newest interrupted batch for this video, or the given one (same slots and settings; finished stages are skipped)")
+    parser.add_argument("--progress-json", action="store_true", help="Emit JSON-lines progress events on stdout (used by the app)")
+    parser.add_argument("--worker", action="store_true", help="Run in the warm worker daemon (started if needed) instead of this process")
     
     args = parser.parse_args()
     
+    if args.progress_json:
+        progress_events.enable()
+    
     # Determine face tracking setting
     use_face_tracking = False  # Default to OFF for speed (CPU optimization)
     if args.face_tracking:
@@ -301,7 +507,37 @@ if __name__ == "__main__":
     elif args.no_face_tracking:
         use_face_tracking = False
     
+    framing = "saliency" if args.saliency else None
+
     # Determine end range
     range_end = args.range_end if args.range_end > 0 else None
     
-    auto_generate_shorts(args.video, args.count, use_face_tracking, args.smoothing, preview_mode=args.preview, model_size=args.model_size, range_start=args.range_start, range_end=range_end)
+    options = dict(count=args.count, use_face_tracking=use_face_tracking, smoothing_seconds=args.smoothing, preview_mode=args.preview, model_size=args.model_size, range_start=args.range_start, range_end=range_end, detector=args.detector, framing=framing, selection=args.selection, transcript_srt=args.transcript, vmaf_target=args.vmaf_target, aspects=[a for a in args.aspects.split(",") if a.strip()], resume=args.resume)
+    
+    if args.worker:
+        # Same job the app submits; the worker already has everything imported
+        import worker
+        from jobs import generate_shorts_job
+        job = worker.start_job(generate_shorts_job, os.path.abspath(args.video), **options)
+        print(f"🔥 Running in warm worker (job pid {job.pid})")
+        try:
+            while True:
+                event = job.poll(1.0)
+                if event is None:
+                    continue
+                if event[0] == "progress":
+                    if event[1] is not None:
+                        print(f"   [{event[1]*100:5.1f}%] {event[2] or ''}")
+                elif event[0] == "error":
+                    print(f"❌ {event[1]}")
+                    sys.exit(1)
+                else:
+                    break
+        except KeyboardInterrupt:
+            job.cancel()
+            print("🛑 Cancelled")
+            sys.exit(130)
+        finally:
+            job.close()
+    else:
+        auto_generate_shorts(args.video, **options)
@@ -0,0 +1,194 @@
+"""
+Batch Manifest
+A generation batch records its source, settings, chosen slots and - per
+slot - the stages that finished and the files they produced, in its own
+generated_shorts/batches/<source hash>_<batch id>.json (rewritten atomically
+after every stage). An interrupted batch is resumed from it: the same slots,
+and only the stages whose artifacts are missing or invalid are redone.
+
+Concurrent batches each have their own manifest. The batch that is running
+holds an flock on the manifest's .lock file (released when its process
+dies), so a resume never picks up a batch another job is still working on.
+"""
+import os
+import glob
+import json
+import time
+import fcntl
+import secrets
+
+from faststart import moov_placement
+
+BATCH_DIR = "batches"
+# Leftovers of an interrupted stage (deleted before a slot is resumed)
+PARTIAL_SUFFIXES = ("_crop.cmd", ".rendering.mp4", ".faststart.mp4", "temp_audio.wav")
+
+def artifact_ok(path):
+    """True if a stage output exists and is complete enough to reuse."""
+    if not path or not os.path.exists(path) or os.path.getsize(path) == 0:
+        return False
+    if path.endswith(".mp4"):
+        # A render killed mid-write has no moov atom
+        return moov_placement(path) is not None
+    if path.endswith(".json"):
+        try:
+            with open(path, "r") as f:
+                json.load(f)
+        except ValueError:
+            return False
+    return True
+
+def clean_partial(folder):
+    """Remove half-written temp files an interrupted stage left in a slot folder."""
+    if not os.path.isdir(folder):
+        return
+    for name in os.listdir(folder):
+        if name.endswith(PARTIAL_SUFFIXES):
+            os.remove(os.path.join(folder, name))
+
+def new_batch_id():
+    return time.strftime("%Y%m%d-%H%M%S") + "-" + secrets.token_hex(3)
+
+def _batch_dir(output_dir):
+    return os.path.join(output_dir, BATCH_DIR)
+
+class BatchManifest:
+    def __init__(self, path, data):
+        self.path = path
+        self.data = data
+        self._lock_file = None
+
+    @classmethod
+    def load(cls, path):
+        """The manifest at path, or None."""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r") as f:
+                return cls(path, json.load(f))
+        except ValueError:
+            return None
+
+    @classmethod
+    def for_source(cls, output_dir, content_hash):
+        """Manifests of this source's batches, newest first."""
+        pattern = os.path.join(glob.escape(_batch_dir(output_dir)), f"{content_hash[:16]}_*.json")
+        manifests = [m for m in map(cls.load, glob.glob(pattern))
+                     if m is not None and m.data.get("content_hash") == content_hash]
+        return sorted(manifests, key=lambda m: m.data["created_at"], reverse=True)
+
+    @classmethod
+    def find(cls, output_dir, content_hash, batch_id=None):
+        """
+        The newest unfinished batch of this source that no job is running
+        (or the batch batch_id, under the same conditions), or None.
+        """
+        for manifest in cls.for_source(output_dir, content_hash):
+            if batch_id is not None and manifest.batch_id != batch_id:
+                continue
+            if manifest.pending() and not manifest.active():
+                return manifest
+        return None
+
+    @classmethod
+    def create(cls, output_dir, source, content_hash, options, slots, folders, batch_id=None):
+        """New manifest for a batch, claimed by the caller; slots: [(start, end)]."""
+        os.makedirs(_batch_dir(output_dir), exist_ok=True)
+        batch_id = batch_id or new_batch_id()
+        data = {
+            "batch_id": batch_id,
+            "source": os.path.abspath(source),
+            "content_hash": content_hash,
+            "options": options,
+            "created_at": time.time(),
+            "slots": [{"start": start, "end": end, "folder": os.path.abspath(folder),
+                       "status": "pending", "stages": {}, "error": None}
+                      for (start, end), folder in zip(slots, folders)],
+        }
+        manifest = cls(os.path.join(_batch_dir(output_dir), f"{content_hash[:16]}_{batch_id}.json"), data)
+        manifest.claim()
+        manifest.save()
+        return manifest
+
+    def claim(self):
+        """Mark the batch as running in this process; False if another job has it."""
+        if self._lock_file is not None:
+            return True
+        lock_file = open(self.path + ".lock", "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def active(self):
+        """True while some job (this one included) is running the batch."""
+        if self._lock_file is not None:
+            return True
+        if not os.path.exists(self.path + ".lock"):
+            return False
+        with open(self.path + ".lock", "r") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return True
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+        return False
+
+    def close(self):
+        """Release the batch; a finished batch's manifest is deleted."""
+        if not self.pending():
+            for path in (self.path, self.path + ".lock"):
+                if os.path.exists(path):
+                    os.remove(path)
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def save(self):
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(temp_path, self.path)
+
+    @property
+    def batch_id(self):
+        return self.data["batch_id"]
+
+    @property
+    def source(self):
+        return self.data["source"]
+
+    @property
+    def options(self):
+        return self.data["options"]
+
+    @property
+    def slots(self):
+        return self.data["slots"]
+
+    def pending(self):
+        """Indices of slots that are not done."""
+        return [i for i, slot in enumerate(self.slots) if slot["status"] != "done"]
+
+    def stage_done(self, index, stage):
+        """Artifacts of a finished stage if they are all still valid, else None."""
+        record = self.slots[index]["stages"].get(stage)
+        if record is None:
+            return None
+        artifacts = record["artifacts"]
+        if not all(artifact_ok(path) for path in artifacts.values()):
+            return None
+        return artifacts
+
+    def mark_stage(self, index, stage, artifacts=None, seconds=None):
+        self.slots[index]["stages"][stage] = {"artifacts": artifacts or {}, "seconds": seconds,
+                                              "finished_at": time.time()}
+        self.save()
+
+    def mark_slot(self, index, status, error=None):
+        self.slots[index]["status"] = status
+        self.slots[index]["error"] = error
+        self.save()
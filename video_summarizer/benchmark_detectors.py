@@ -0,0 +1,212 @@
+"""
+Face Detector Benchmark
+Measures throughput (frames/sec) and detection recall of each smart_crop
+face detector backend on the labeled clip set in benchmarks/face_clips/.
+
+labels.json format:
+{
+    "clips": [
+        {
+            "file": "talking_head.mp4",
+            "frames": {
+                "0":  [[x, y, w, h]],     <- labeled face boxes on frame 0
+                "25": []                  <- frame 25 has no face
+            }
+        }
+    ]
+}
+
+The shipped set is synthetic (drawn faces at known boxes, plus a clip with
+no faces for false positives); regenerate it with --synthesize. Real clips
+can be added next to it - labels.json lists both.
+
+Usage: python benchmark_detectors.py [--detectors haar,profile,dnn] [--batch 8]
+       python benchmark_detectors.py --synthesize
+Exits 1 if there is nothing to benchmark or no detector could run.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import cv2
+import numpy as np
+from smart_crop import FACE_DETECTORS, create_face_detector
+
+CLIPS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "face_clips")
+LABELS_FILE = os.path.join(CLIPS_DIR, "labels.json")
+IOU_MATCH = 0.3
+
+# Synthetic clip set (--synthesize)
+SYNTH_SIZE = (640, 360)
+SYNTH_FPS = 25
+SYNTH_FRAMES = 75
+SYNTH_LABEL_EVERY = 5
+
+def iou(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    ix = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    iy = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = ix * iy
+    union = aw * ah + bw * bh - inter
+    return inter / union if union > 0 else 0.0
+
+def load_labeled_frames(clip):
+    """Decode only the labeled frames of a clip -> list of (image, boxes)."""
+    path = os.path.join(CLIPS_DIR, clip["file"])
+    wanted = {int(idx): boxes for idx, boxes in clip["frames"].items()}
+    frames = []
+
+    cap = cv2.VideoCapture(path)
+    frame_idx = 0
+    last = max(wanted) if wanted else -1
+    while frame_idx <= last:
+        if frame_idx in wanted:
+            success, image = cap.read()
+            if not success:
+                break
+            frames.append((image, wanted[frame_idx]))
+        elif not cap.grab():
+            break
+        frame_idx += 1
+    cap.release()
+    return frames
+
+def draw_face(image, x, y, w):
+    """Draw a frontal cartoon face with its top-left at (x, y); returns its box [x, y, w, h]."""
+    h = int(w * 1.25)
+    cx, cy = x + w // 2, y + h // 2
+    cv2.ellipse(image, (cx, cy), (w // 2, h // 2), 0, 0, 360, (150, 180, 215), -1)
+    cv2.ellipse(image, (cx, y + h // 8), (w // 2, h // 5), 0, 180, 360, (40, 40, 50), -1)     # hair
+    eye_y = y + int(h * 0.40)
+    for eye_x in (x + int(w * 0.30), x + int(w * 0.70)):
+        cv2.ellipse(image, (eye_x, eye_y - int(h * 0.07)), (int(w * 0.13), int(h * 0.025)), 0, 0, 360, (50, 50, 60), -1)
+        cv2.ellipse(image, (eye_x, eye_y), (int(w * 0.10), int(h * 0.04)), 0, 0, 360, (245, 245, 245), -1)
+        cv2.circle(image, (eye_x, eye_y), int(w * 0.045), (40, 30, 30), -1)
+    cv2.line(image, (cx, eye_y), (cx - int(w * 0.04), y + int(h * 0.62)), (120, 150, 185), max(1, w // 30))
+    cv2.ellipse(image, (cx, y + int(h * 0.75)), (int(w * 0.18), int(h * 0.05)), 0, 0, 360, (60, 60, 140), -1)
+    return [x, y, w, h]
+
+def _background(rng):
+    """Cluttered static background (random blocks), so detectors can misfire."""
+    width, height = SYNTH_SIZE
+    image = np.full((height, width, 3), rng.integers(60, 140, 3), np.uint8)
+    for _ in range(25):
+        x, y = int(rng.integers(0, width)), int(rng.integers(0, height))
+        color = tuple(int(c) for c in rng.integers(0, 255, 3))
+        cv2.rectangle(image, (x, y), (x + int(rng.integers(10, 120)), y + int(rng.integers(10, 80))), color, -1)
+    return image
+
+def synthesize_clips():
+    """
+    Write the synthetic labeled set: faces moving/resizing over a cluttered
+    background (one face, two faces, a dim one) and a clip with no face.
+    Deterministic (fixed seed). Returns the labels dict written.
+    """
+    rng = np.random.default_rng(7)
+    scenes = {
+        # name: frame index -> [(x, y, w)], brightness
+        "synthetic_single.mp4": (lambda i: [(120 + 4 * i, 60 + i // 3, 80 + i // 2)], 1.0),
+        "synthetic_pair.mp4": (lambda i: [(60 + i, 80, 90), (420 - i, 70, 70 + i // 3)], 1.0),
+        "synthetic_dim.mp4": (lambda i: [(260, 50 + i, 110)], 0.55),
+        "synthetic_no_face.mp4": (lambda i: [], 1.0),
+    }
+    clips = []
+    for name, (layout, brightness) in scenes.items():
+        background = _background(rng)
+        writer = cv2.VideoWriter(os.path.join(CLIPS_DIR, name), cv2.VideoWriter_fourcc(*"mp4v"), SYNTH_FPS, SYNTH_SIZE)
+        labels = {}
+        for i in range(SYNTH_FRAMES):
+            image = background.copy()
+            boxes = [draw_face(image, x, y, w) for x, y, w in layout(i)]
+            image = cv2.GaussianBlur(image, (3, 3), 0)
+            if brightness != 1.0:
+                image = cv2.convertScaleAbs(image, alpha=brightness)
+            writer.write(image)
+            if i % SYNTH_LABEL_EVERY == 0:
+                labels[str(i)] = boxes
+        writer.release()
+        clips.append({"file": name, "frames": labels})
+
+    data = {"clips": clips}
+    with open(LABELS_FILE, "w") as f:
+        json.dump(data, f, indent=1)
+    return data
+
+def benchmark_detector(name, frames, batch_size=1):
+    detector = create_face_detector(name)
+    images = [image for image, _ in frames]
+
+    start = time.perf_counter()
+    detections = []
+    for i in range(0, len(images), batch_size):
+        detections.extend(detector.detect_batch(images[i:i + batch_size]))
+    elapsed = time.perf_counter() - start
+
+    labeled = matched = false_positives = 0
+    for (_, boxes), found in zip(frames, detections):
+        labeled += len(boxes)
+        matched += sum(1 for box in boxes if any(iou(box, det) >= IOU_MATCH for det in found))
+        false_positives += sum(1 for det in found if not any(iou(box, det) >= IOU_MATCH for box in boxes))
+
+    return {
+        "detector": name,
+        "fps": len(images) / elapsed if elapsed > 0 else 0.0,
+        "recall": matched / labeled if labeled else 0.0,
+        "false_positives": false_positives,
+        "frames": len(images),
+    }
+
+def main(argv=None):
+    """Run the benchmark; returns the exit code."""
+    parser = argparse.ArgumentParser(description="Benchmark face detector backends")
+    parser.add_argument("--detectors", default=",".join(FACE_DETECTORS), help="Comma-separated detector names")
+    parser.add_argument("--batch", type=int, default=1, help="Frames per detect_batch() call")
+    parser.add_argument("--synthesize", action="store_true", help="(Re)generate the synthetic labeled clips and exit")
+    args = parser.parse_args(argv)
+
+    if args.synthesize:
+        data = synthesize_clips()
+        print(f"✅ Wrote {len(data['clips'])} synthetic clips + {LABELS_FILE}")
+        return 0
+
+    if not os.path.exists(LABELS_FILE):
+        print(f"Labels not found: {LABELS_FILE}")
+        return 1
+
+    with open(LABELS_FILE, "r") as f:
+        clips = json.load(f).get("clips", [])
+    if not clips:
+        print(f"No clips listed in {LABELS_FILE}. Run with --synthesize or add labeled clips.")
+        return 1
+
+    frames = []
+    for clip in clips:
+        if os.path.exists(os.path.join(CLIPS_DIR, clip["file"])):
+            frames.extend(load_labeled_frames(clip))
+        else:
+            print(f"⚠️ Missing clip: {clip['file']}")
+
+    if not frames:
+        print("No labeled frames to benchmark. Add clips + labels to benchmarks/face_clips/.")
+        return 1
+
+    print(f"Benchmarking on {len(frames)} labeled frames (batch={args.batch})...\n")
+    print(f"{'Detector':<10} {'FPS':>8} {'Recall':>8} {'False+':>8}")
+    results = []
+    for name in args.detectors.split(","):
+        try:
+            r = benchmark_detector(name.strip(), frames, args.batch)
+        except FileNotFoundError as e:
+            print(f"{name:<10} skipped: {e}")
+            continue
+        results.append(r)
+        print(f"{r['detector']:<10} {r['fps']:>8.1f} {r['recall']:>8.2%} {r['false_positives']:>8}")
+    if not results:
+        print("No detector could run.")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Import-Time Benchmark
+Imports each entry-point module in a fresh interpreter with
+`python -X importtime` and reports its cumulative import time and any heavy
+library (lazy_imports.HEAVY_MODULES) that got pulled in. An entry fails if it
+goes over IMPORT_BUDGET_MS or imports a heavy library eagerly.
+
+Usage: python benchmark_imports.py [module ...] [--runs 5]
+Exit status is 1 when any entry is over budget (usable as a CI check).
+"""
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+from lazy_imports import HEAVY_MODULES
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The CLI, the worker and everything app.py imports at cold start
+ENTRY_MODULES = ["auto_shorts", "jobs", "worker", "catalog", "shorts_index", "thumbnails",
+                 "proxy", "frame_server", "ingest", "create_short", "process_video"]
+IMPORT_BUDGET_MS = 150
+
+def measure(module):
+    """(cumulative import ms of `module`, sorted heavy libraries it imported)."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=MODULE_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed: {result.stderr.strip().splitlines()[-1]}")
+
+    total_us = None
+    heavy = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        if package in HEAVY_MODULES:
+            heavy.add(package)
+        if name.strip() == module and not name[1:].startswith(" "):
+            total_us = int(cumulative)
+    return (total_us or 0) / 1000, sorted(heavy)
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time budget check for the entry points")
+    parser.add_argument("modules", nargs="*", default=ENTRY_MODULES, help="Modules to import (default: all entry points)")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module (median is reported)")
+    parser.add_argument("--budget", type=float, default=IMPORT_BUDGET_MS, help="Per-module budget in ms")
+    args = parser.parse_args()
+
+    print(f"{'module':<16}{'median ms':>10}  heavy imports")
+    failed = False
+    for module in args.modules:
+        times = []
+        for _ in range(args.runs):
+            ms, heavy = measure(module)
+            times.append(ms)
+        median = statistics.median(times)
+        over = median > args.budget or heavy
+        failed = failed or bool(over)
+        print(f"{module:<16}{median:>10.1f}  {', '.join(heavy) or '-'}  {'❌' if over else '✅'}")
+
+    print(f"\nBudget: {args.budget:.0f} ms per module, no eager {', '.join(HEAVY_MODULES)}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""
+Shorts Catalog
+SQLite index of source videos, generated shorts, their time ranges,
+render params, artifact paths and per-stage timings - plus the ranges that
+running batches have reserved but not finished yet.
+
+WAL mode + busy timeout: the app and any number of generator processes
+can read and write the same catalog concurrently.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+
+CATALOG_PATH = "shorts_catalog.db"
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
+RESERVATION_TTL = 24 * 3600     # An abandoned batch's reservations lapse after this
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    id            INTEGER PRIMARY KEY,
+    path          TEXT NOT NULL,
+    content_hash  TEXT UNIQUE,
+    size          INTEGER,
+    mtime         REAL,
+    duration      REAL,
+    added_at      REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sources_path ON sources(path);
+
+CREATE TABLE IF NOT EXISTS shorts (
+    id             INTEGER PRIMARY KEY,
+    source_id      INTEGER REFERENCES sources(id) ON DELETE CASCADE,
+    folder         TEXT NOT NULL UNIQUE,
+    start_time     REAL NOT NULL,
+    end_time       REAL NOT NULL,
+    params         TEXT NOT NULL DEFAULT '{}',
+    artifacts      TEXT NOT NULL DEFAULT '{}',
+    has_subtitles  INTEGER NOT NULL DEFAULT 0,
+    size_bytes     INTEGER NOT NULL DEFAULT 0,
+    created_at     REAL NOT NULL,
+    updated_at     REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_shorts_source_time ON shorts(source_id, start_time);
+CREATE INDEX IF NOT EXISTS idx_shorts_created ON shorts(created_at);
+
+CREATE TABLE IF NOT EXISTS stage_timings (
+    short_id     INTEGER NOT NULL REFERENCES shorts(id) ON DELETE CASCADE,
+    stage        TEXT NOT NULL,
+    seconds      REAL NOT NULL,
+    recorded_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_stage_timings_short ON stage_timings(short_id);
+
+CREATE TABLE IF NOT EXISTS reservations (
+    source_id    INTEGER NOT NULL REFERENCES sources(id) ON DELETE CASCADE,
+    owner        TEXT NOT NULL,
+    folder       TEXT NOT NULL UNIQUE,
+    start_time   REAL NOT NULL,
+    end_time     REAL NOT NULL,
+    reserved_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reservations_source_time ON reservations(source_id, start_time);
+"""
+
+def file_hash(path):
+    """SHA-256 of a file, read in bounded chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _artifacts_size(artifacts):
+    return sum(os.path.getsize(p) for p in artifacts.values() if p and os.path.isfile(p))
+
+class Catalog:
+    """
+    Thin wrapper over the catalog database.
+    Every call opens its own short-lived connection, so one Catalog object
+    can be shared across Streamlit reruns and threads.
+    """
+
+    def __init__(self, path=CATALOG_PATH):
+        self.path = path
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _query(self, sql, args=()):
+        conn = self._connect()
+        try:
+            return [dict(row) for row in conn.execute(sql, args).fetchall()]
+        finally:
+            conn.close()
+
+    def _write(self, sql, args=()):
+        conn = self._connect()
+        try:
+            with conn:
+                return conn.execute(sql, args).lastrowid
+        finally:
+            conn.close()
+
+    def data_version(self):
+        """Changes whenever any catalog row changes (cheap cache key)."""
+        row = self._query("SELECT COUNT(*) AS n, COALESCE(MAX(updated_at), 0) AS t FROM shorts")[0]
+        return (row["n"], row["t"])
+
+    # --- Sources ---
+
+    def register_source(self, path, content_hash=None, duration=None):
+        """
+        Return the source id for a video file, adding it if needed.
+        Files already seen at the same path/size/mtime are not re-hashed;
+        a known hash at a new path (re-upload, moved file) reuses its row.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+
+        known = self._query(
+            "SELECT id FROM sources WHERE path = ? AND size = ? AND mtime = ?",
+            (path, stat.st_size, stat.st_mtime))
+        if known:
+            return known[0]["id"]
+
+        content_hash = content_hash or file_hash(path)
+        existing = self._query("SELECT id FROM sources WHERE content_hash = ?", (content_hash,))
+        if existing:
+            self._write(
+                "UPDATE sources SET path = ?, size = ?, mtime = ?, duration = COALESCE(?, duration) WHERE id = ?",
+                (path, stat.st_size, stat.st_mtime, duration, existing[0]["id"]))
+            return existing[0]["id"]
+
+        return self._write(
+            "INSERT INTO sources (path, content_hash, size, mtime, duration, added_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (path, content_hash, stat.st_size, stat.st_mtime, duration, time.time()))
+
+    def find_source_by_hash(self, content_hash):
+        rows = self._query("SELECT * FROM sources WHERE content_hash = ?", (content_hash,))
+        return rows[0] if rows else None
+
+    def get_source(self, source_id):
+        rows = self._query("SELECT * FROM sources WHERE id = ?", (source_id,))
+        return rows[0] if rows else None
+
+    def list_sources(self):
+        return self._query("SELECT * FROM sources ORDER BY added_at DESC")
+
+    # --- Shorts ---
+
+    def add_short(self, source_id, folder, start_time, end_time, params=None, artifacts=None, has_subtitles=False):
+        """Insert (or replace) the catalog row for a short folder."""
+        artifacts = artifacts or {}
+        now = time.time()
+        return self._write(
+            """INSERT INTO shorts (source_id, folder, start_time, end_time, params, artifacts,
+                                   has_subtitles, size_bytes, created_at, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(folder) DO UPDATE SET
+                   source_id = excluded.source_id, start_time = excluded.start_time,
+                   end_time = excluded.end_time, params = excluded.params,
+                   artifacts = excluded.artifacts, has_subtitles = excluded.has_subtitles,
+                   size_bytes = excluded.size_bytes, updated_at = excluded.updated_at""",
+            (source_id, os.path.abspath(folder), start_time, end_time, json.dumps(params or {}),
+             json.dumps(artifacts), int(has_subtitles), _artifacts_size(artifacts), now, now))
+
+    def update_short(self, folder, start_time=None, end_time=None, params=None, artifacts=None, has_subtitles=None):
+        """Update fields of a short; params/artifacts are merged into the stored dicts."""
+        short = self.get_short(folder)
+        if short is None:
+            return False
+        merged_params = {**short["params"], **(params or {})}
+        merged_artifacts = {**short["artifacts"], **(artifacts or {})}
+        self._write(
+            """UPDATE shorts SET start_time = ?, end_time = ?, params = ?, artifacts = ?,
+                                 has_subtitles = ?, size_bytes = ?, updated_at = ?
+               WHERE id = ?""",
+            (short["start_time"] if start_time is None else start_time,
+             short["end_time"] if end_time is None else end_time,
+             json.dumps(merged_params), json.dumps(merged_artifacts),
+             int(short["has_subtitles"] if has_subtitles is None else has_subtitles),
+             _artifacts_size(merged_artifacts), time.time(), short["id"]))
+        return True
+
+    def _decode(self, row):
+        row["params"] = json.loads(row["params"])
+        row["artifacts"] = json.loads(row["artifacts"])
+        row["has_subtitles"] = bool(row["has_subtitles"])
+        return row
+
+    def get_short(self, folder):
+        rows = self._query(
+            """SELECT shorts.*, sources.path AS source_path FROM shorts
+               LEFT JOIN sources ON sources.id = shorts.source_id
+               WHERE folder = ?""", (os.path.abspath(folder),))
+        return self._decode(rows[0]) if rows else None
+
+    def list_shorts(self, source_id=None):
+        """All shorts, newest first (optionally for one source)."""
+        sql = """SELECT shorts.*, sources.path AS source_path FROM shorts
+                 LEFT JOIN sources ON sources.id = shorts.source_id"""
+        args = ()
+        if source_id is not None:
+            sql += " WHERE source_id = ?"
+            args = (source_id,)
+        return [self._decode(row) for row in self._query(sql + " ORDER BY created_at DESC", args)]
+
+    def used_intervals(self, source_id):
+        """(start, end) of every short already cut from this source or reserved by a running batch."""
+        rows = self._query(
+            """SELECT start_time, end_time FROM shorts WHERE source_id = ?
+               UNION ALL
+               SELECT start_time, end_time FROM reservations WHERE source_id = ? AND reserved_at > ?
+               ORDER BY start_time""", (source_id, source_id, time.time() - RESERVATION_TTL))
+        return [(row["start_time"], row["end_time"]) for row in rows]
+
+    def reserve_slots(self, source_id, owner, slots):
+        """
+        Reserve [(start, end, folder)] for a batch (owner) before it renders,
+        so concurrent batches never cut overlapping ranges or share a folder.
+        Checked and written in one IMMEDIATE transaction; a slot is refused if
+        it overlaps a short of this source or another owner's live
+        reservation, or its folder belongs to another owner or source.
+        The owner's own reservations are refreshed. Returns the reserved slots.
+        """
+        now = time.time()
+        conn = self._connect()
+        conn.isolation_level = None
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM reservations WHERE reserved_at <= ?", (now - RESERVATION_TTL,))
+            reserved = []
+            for start, end, folder in slots:
+                folder = os.path.abspath(folder)
+                taken = conn.execute(
+                    """SELECT 1 FROM shorts WHERE folder != ? AND source_id = ? AND start_time < ? AND end_time > ?
+                       UNION ALL
+                       SELECT 1 FROM shorts WHERE folder = ? AND source_id != ?
+                       UNION ALL
+                       SELECT 1 FROM reservations WHERE owner != ?
+                           AND (folder = ? OR (source_id = ? AND start_time < ? AND end_time > ?))
+                       LIMIT 1""",
+                    (folder, source_id, end, start, folder, source_id, owner, folder, source_id, end, start)).fetchone()
+                if taken:
+                    continue
+                conn.execute(
+                    """INSERT INTO reservations (source_id, owner, folder, start_time, end_time, reserved_at)
+                       VALUES (?, ?, ?, ?, ?, ?)
+                       ON CONFLICT(folder) DO UPDATE SET start_time = excluded.start_time,
+                           end_time = excluded.end_time, reserved_at = excluded.reserved_at""",
+                    (source_id, owner, folder, start, end, now))
+                reserved.append((start, end, folder))
+            conn.execute("COMMIT")
+            return reserved
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def release_slot(self, folder):
+        """Drop a reservation (its short is in the catalog now, or it was abandoned)."""
+        self._write("DELETE FROM reservations WHERE folder = ?", (os.path.abspath(folder),))
+
+    def delete_short(self, folder):
+        self._write("DELETE FROM shorts WHERE folder = ?", (os.path.abspath(folder),))
+
+    def clear_shorts(self):
+        self._write("DELETE FROM shorts")
+
+    # --- Timings / statistics ---
+
+    def record_stage(self, folder, stage, seconds):
+        short = self.get_short(folder)
+        if short is not None:
+            self._write(
+                "INSERT INTO stage_timings (short_id, stage, seconds, recorded_at) VALUES (?, ?, ?, ?)",
+                (short["id"], stage, seconds, time.time()))
+
+    def stats(self):
+        """Totals for the statistics panel plus average seconds per stage."""
+        totals = self._query(
+            """SELECT COUNT(*) AS total_shorts, COALESCE(SUM(size_bytes), 0) AS total_size,
+                      COALESCE(SUM(has_subtitles), 0) AS with_subtitles FROM shorts""")[0]
+        totals["stage_seconds"] = {
+            row["stage"]: row["avg_seconds"]
+            for row in self._query("SELECT stage, AVG(seconds) AS avg_seconds FROM stage_timings GROUP BY stage")
+        }
+        return totals
+
+    # --- Migration ---
+
+    def import_legacy(self, output_dir):
+        """
+        One-time import of short folders created before the catalog existed
+        (metadata.json sidecars). Folders already catalogued are skipped.
+        """
+        if not os.path.isdir(output_dir):
+            return 0
+        known = {row["folder"] for row in self._query("SELECT folder FROM shorts")}
+        imported = 0
+
+        for entry in os.scandir(output_dir):
+            folder = os.path.abspath(entry.path)
+            meta_file = os.path.join(folder, "metadata.json")
+            if not entry.is_dir() or folder in known or not os.path.exists(meta_file):
+                continue
+            try:
+                with open(meta_file, "r") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                continue
+
+            source_id = None
+            original = meta.get("original_video")
+            if original and os.path.exists(original):
+                source_id = self.register_source(original)
+
+            final_video = os.path.join(folder, "final_short.mp4")
+            srt = os.path.join(folder, "subtitles.srt")
+            artifacts = {"final": final_video} if os.path.exists(final_video) else {}
+            if os.path.exists(srt):
+                artifacts["subtitles"] = srt
+            params = {k: v for k, v in meta.items() if k not in ("original_video", "start_time", "end_time", "duration")}
+
+            start = meta.get("start_time", 0)
+            self.add_short(source_id, folder, start, meta.get("end_time", start + meta.get("duration", 60)),
+                           params=params, artifacts=artifacts, has_subtitles="subtitles" in artifacts)
+            imported += 1
+        return imported
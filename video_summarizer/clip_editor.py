@@ -4,32 +4,31 @@ Allows users to fine-tune clip timing after generation
 """
 import streamlit as st
 import os
-from moviepy import VideoFileClip
+from catalog import Catalog
+from frame_server import probe_duration
+from render_backend import render, make_spec
 
-def show_clip_editor(short_dir):
+def show_clip_editor(short_dir, catalog=None):
     """
     Display UI to edit clip start/end times
     
     Args:
         short_dir: Path to short directory (e.g., generated_shorts/short_12_34)
+        catalog: Catalog to read the clip's range from (default: shared catalog file)
     """
     st.markdown("### ✂️ Clip Editor")
     
-    # Extract current timing from folder name
+    # Current timing from the catalog
     folder_name = os.path.basename(short_dir)
-    time_str = folder_name.replace("short_", "")
-    parts = time_str.split("_")
-    
-    if len(parts) >= 2:
-        current_start_min = int(parts[0])
-        current_start_sec = int(parts[1])
-        current_start = current_start_min * 60 + current_start_sec
-    else:
-        st.error("Cannot parse folder name!")
+    short = (catalog or Catalog()).get_short(short_dir)
+    if short is None:
+        st.error("Short not found in catalog!")
         return
     
-    # Assume 60-second clip
-    current_end = current_start + 60
+    current_start = int(short["start_time"])
+    current_end = int(short["end_time"])
+    current_start_min = current_start // 60
+    current_start_sec = current_start % 60
     
     st.info(f"📍 Current Clip: {current_start_min}:{current_start_sec:02d} to {current_end//60}:{current_end%60:02d}")
     
@@ -44,7 +43,7 @@ def show_clip_editor(short_dir):
     
     with col2:
         st.markdown("#### Clip Duration")
-        duration = st.slider("Duration (seconds)", min_value=10, max_value=120, value=60, step=5, key=f"dur_{folder_name}")
+        duration = st.slider("Duration (seconds)", min_value=10, max_value=120, value=min(max(current_end - current_start, 10), 120), step=5, key=f"dur_{folder_name}")
         new_end = new_start + duration
         end_min = new_end // 60
         end_sec = new_end % 60
@@ -93,34 +92,28 @@ def regenerate_clip(original_video, short_dir, new_start, new_end):
         # Create progress bar
         progress = st.progress(0)
         
-        # Load original video
+        # Check bounds
         progress.progress(10)
-        with VideoFileClip(original_video) as video:
-            # Check bounds
-            if new_end > video.duration:
-                st.error(f"❌ End time ({new_end}s) exceeds video duration ({video.duration}s)!")
-                return False
-            
-            progress.progress(30)
-            
-            # Extract new clip
-            new_clip = video.subclipped(new_start, new_end)
-            
-            progress.progress(50)
-            
-            # Save to temporary file
-            temp_path = os.path.join(short_dir, "temp_regen.mp4")
-            new_clip.write_videofile(temp_path, codec="libx264", audio_codec="aac", logger=None)
-            
-            progress.progress(80)
-            
-            # Replace final_short.mp4
-            final_path = os.path.join(short_dir, "final_short.mp4")
-            if os.path.exists(final_path):
-                os.remove(final_path)
-            os.rename(temp_path, final_path)
-            
-            progress.progress(100)
+        duration = probe_duration(original_video)
+        if duration is not None and new_end > duration:
+            st.error(f"❌ End time ({new_end}s) exceeds video duration ({duration}s)!")
+            return False
+        
+        # Extract new clip to a temporary file (one ffmpeg pass, input seeking)
+        temp_path = os.path.join(short_dir, "temp_regen.mp4")
+        render(make_spec(original_video, temp_path, new_start, new_end),
+               progress=lambda done, total: progress.progress(int(10 + 70 * done / total) if total else 10))
+        
+        progress.progress(80)
+        
+        # Replace final_short.mp4
+        final_path = os.path.join(short_dir, "final_short.mp4")
+        if os.path.exists(final_path):
+            os.remove(final_path)
+        os.rename(temp_path, final_path)
+        Catalog().update_short(short_dir, start_time=new_start, end_time=new_end)
+        
+        progress.progress(100)
         
         st.success("✅ Clip regenerated successfully!")
         return True
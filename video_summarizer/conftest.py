@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The pipeline modules are flat scripts in this directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Manual scripts, not tests (they need the full model downloads)
+collect_ignore = ["test_large_model.py"]
@@ -1,7 +1,6 @@
 
 import os
 import sys
-from moviepy import VideoFileClip, vfx
 
 # Paths
 VIDEO_PATH = "videoplayback.mp4"
@@ -13,25 +12,13 @@ if os.path.exists(FFMPEG_BINARY):
     os.environ["IMAGEIO_FFMPEG_EXE"] = FFMPEG_BINARY
     os.environ["PATH"] += os.pathsep + os.path.dirname(FFMPEG_BINARY)
 
+from smart_crop import smart_reframe
+
 print("Creating 30-second preview...")
 
-# Load Video (Only 01:00 to 01:30)
+# Only 01:00 to 01:30, vertical center crop (9:16) in one ffmpeg pass
 try:
-    clip = VideoFileClip(VIDEO_PATH).subclipped(60, 90)
-    
-    # Create Vertical Crop (9:16)
-    w, h = clip.size
-    target_ratio = 9/16
-    new_w = h * target_ratio
-    
-    x_center = w / 2
-    y_center = h / 2
-    
-    # Crop using vfx (Center Crop)
-    cropped_clip = clip.cropped(x1=(w/2)-(new_w/2), y1=0, width=new_w, height=h)
-    
-    # Write video
-    cropped_clip.write_videofile(PROCESSED_SHORT, codec="libx264", audio_codec="aac", preset="ultrafast")
+    smart_reframe(VIDEO_PATH, PROCESSED_SHORT, use_face_tracking=False, start_time=60, end_time=90)
     
     print(f"Preview created: {PROCESSED_SHORT}")
 
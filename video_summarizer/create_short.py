@@ -3,10 +3,11 @@ import os
 import sys
 import argparse
 import datetime
-import whisper
-from moviepy import VideoFileClip
 # Import our smart cropping logic
 from smart_crop import smart_reframe
+from lazy_imports import lazy_import
+
+whisper = lazy_import("whisper")
 
 def parse_time(time_str):
     """Converts MM:SS or HH:MM:SS to seconds"""
@@ -54,31 +55,19 @@ def create_viral_short(video_file, start_str, end_str):
     output_folder = f"short_{timestamp}"
     os.makedirs(output_folder, exist_ok=True)
     
-    temp_cut = os.path.join(output_folder, "temp_cut.mp4")
     final_video = os.path.join(output_folder, f"{base_name}_vertical.mp4")
     final_srt = os.path.join(output_folder, f"{base_name}_subs.srt")
 
-    # 1. Cut the Video
+    # 1+2. Cut + Smart Crop (Face Tracking) in one render from the source
     start_sec = parse_time(start_str)
     end_sec = parse_time(end_str)
-    print(f"Step 1: Cutting video from {start_str} to {end_str}...")
-    
-    with VideoFileClip(video_file) as video:
-        cut = video.subclipped(start_sec, end_sec)
-        cut.write_videofile(temp_cut, codec="libx264", audio_codec="aac", preset="ultrafast", logger=None)
-
-    # 2. Smart Crop (Face Tracking)
-    print("Step 2: Smart Cropping (Face Tracking)...")
-    smart_reframe(temp_cut, final_video)
+    print(f"Step 1: Cutting + Smart Cropping {start_str} to {end_str} (Face Tracking)...")
+    smart_reframe(video_file, final_video, start_time=start_sec, end_time=end_sec)
 
     # 3. Transcribe
     print("Step 3: Generating Hindi Subtitles...")
     generate_subtitles(final_video, final_srt)
 
-    # Cleanup
-    if os.path.exists(temp_cut):
-        os.remove(temp_cut)
-
     print("\n" + "="*50)
     print(f"DONE! Your viral short is ready in folder: {output_folder}")
     print(f"Video: {final_video}")
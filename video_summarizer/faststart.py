@@ -0,0 +1,90 @@
+"""
+Fast-start MP4
+A player can only start an MP4 once it has the moov atom (the index). With
+moov after mdat (ffmpeg's default) the whole file has to arrive first, so
+every render is written with -movflags +faststart and checked afterwards;
+files that still have moov at the end are fixed in place with the bundled
+qt-faststart (ffmpeg remux as fallback).
+
+    python faststart.py generated_shorts     # report / fix existing files
+"""
+import os
+import sys
+import struct
+import subprocess
+
+FFMPEG_CMD = "ffmpeg"
+QT_FASTSTART = os.path.abspath("../bin/qt-faststart")
+
+def top_level_atoms(path):
+    """[(type, offset, size)] of the file's top-level MP4 boxes."""
+    atoms = []
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        offset = 0
+        while offset + 8 <= file_size:
+            f.seek(offset)
+            size, kind = struct.unpack(">I4s", f.read(8))
+            if size == 1:                       # 64-bit size follows the type
+                size = struct.unpack(">Q", f.read(8))[0]
+            elif size == 0:                     # box runs to the end of the file
+                size = file_size - offset
+            if size < 8:
+                break
+            atoms.append((kind.decode("latin-1"), offset, size))
+            offset += size
+    return atoms
+
+def moov_placement(path):
+    """"front" (moov before mdat), "end", or None if not a readable MP4."""
+    if not os.path.exists(path):
+        return None
+    order = [kind for kind, _, _ in top_level_atoms(path) if kind in ("moov", "mdat")]
+    if "moov" not in order or "mdat" not in order:
+        return None
+    return "front" if order.index("moov") < order.index("mdat") else "end"
+
+def make_faststart(path):
+    """Move the moov atom to the front in place. Raises RuntimeError on failure."""
+    temp_path = os.path.splitext(path)[0] + ".faststart.mp4"
+    if os.path.exists(QT_FASTSTART):
+        cmd = [QT_FASTSTART, path, temp_path]
+    else:
+        cmd = [FFMPEG_CMD, "-hide_banner", "-loglevel", "error", "-i", path,
+               "-map", "0", "-c", "copy", "-movflags", "+faststart", "-y", temp_path]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0 or moov_placement(temp_path) != "front":
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise RuntimeError(f"faststart failed: {(result.stderr or result.stdout)[-300:]}")
+    os.replace(temp_path, path)
+
+def ensure_faststart(path):
+    """
+    Check moov placement and fix it if needed.
+    Returns the placement after the check ("front", or None for non-MP4s).
+    """
+    placement = moov_placement(path)
+    if placement == "end":
+        make_faststart(path)
+        placement = moov_placement(path)
+    return placement
+
+if __name__ == "__main__":
+    root = sys.argv[1] if len(sys.argv) > 1 else "generated_shorts"
+    fixed = 0
+    for folder, _, files in os.walk(root):
+        for name in sorted(files):
+            if not name.lower().endswith((".mp4", ".m4v", ".mov")):
+                continue
+            path = os.path.join(folder, name)
+            placement = moov_placement(path)
+            if placement == "end":
+                make_faststart(path)
+                fixed += 1
+                print(f"🔧 {path}: moov moved to front")
+            elif placement == "front":
+                print(f"✅ {path}: fast-start")
+            else:
+                print(f"⚠️ {path}: not a readable MP4")
+    print(f"Done - fixed {fixed} file(s)")
@@ -0,0 +1,173 @@
+"""
+Frame Server
+Serves downscaled preview frames by timestamp for the app's interactive
+previews. Decoders stay open per source (a few, least recently used are
+closed), decoded frames are kept in an LRU cache, and a miss decodes
+forward from the nearest keyframe or from the decoder's current position
+when the target lies just ahead of it. The keyframe index (ffprobe) is
+built in the background; until it is ready every miss is a plain seek.
+"""
+import bisect
+import threading
+import subprocess
+from collections import OrderedDict
+
+from lazy_imports import lazy_import
+
+cv2 = lazy_import("cv2")
+
+FFPROBE_CMD = "ffprobe"
+PREVIEW_WIDTH = 480         # Frames are downscaled to this width (never upscaled)
+FRAME_CACHE_SIZE = 256      # Decoded frames kept in memory (~80 MB at 480x270)
+MAX_OPEN_DECODERS = 4
+
+def keyframe_times(video_path):
+    """Sorted keyframe timestamps (seconds) of the first video stream; [] if unknown."""
+    cmd = [
+        FFPROBE_CMD, "-v", "error", "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0", video_path
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+    except OSError:
+        return []
+    times = []
+    for line in result.stdout.splitlines():
+        pts, _, flags = line.partition(",")
+        if "K" in flags and pts not in ("", "N/A"):
+            times.append(float(pts))
+    return sorted(times)
+
+def probe_duration(video_path):
+    """Container duration in seconds from ffprobe, or None."""
+    cmd = [
+        FFPROBE_CMD, "-v", "error", "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1", video_path
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        return float(result.stdout.strip())
+    except (OSError, ValueError):
+        return None
+
+class _Decoder:
+    """One open VideoCapture plus where it currently is."""
+
+    def __init__(self, video_path):
+        self.cap = cv2.VideoCapture(video_path)
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 25.0
+        self.keyframes = []         # Filled in by the indexing thread
+        self.position = None        # Timestamp of the last decoded frame
+        self.lock = threading.Lock()
+        self.indexer = threading.Thread(target=self._index_keyframes, args=(video_path,), daemon=True)
+        self.indexer.start()
+
+    def _index_keyframes(self, video_path):
+        # ffprobe reads every packet: far too slow for the first preview request
+        self.keyframes = keyframe_times(video_path)
+
+    def read(self, frame_index):
+        """Decode frame `frame_index` (BGR) or None past the end."""
+        target = frame_index / self.fps
+        half_frame = 0.5 / self.fps
+
+        # Keep decoding forward if the target is ahead of us and no keyframe
+        # lies in between (a seek would restart from that keyframe anyway)
+        start = target
+        keyframes = self.keyframes
+        if keyframes:
+            start = keyframes[max(bisect.bisect_right(keyframes, target + half_frame) - 1, 0)]
+        if self.position is None or not (start - half_frame <= self.position < target - half_frame):
+            self.cap.set(cv2.CAP_PROP_POS_MSEC, start * 1000)
+
+        while self.cap.grab():
+            self.position = self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000
+            if self.position >= target - half_frame:
+                ok, frame = self.cap.retrieve()
+                return frame if ok else None
+        self.position = None
+        return None
+
+    def close(self):
+        self.cap.release()
+
+class FrameServer:
+    """
+    frame_at(video_path, seconds) -> downscaled RGB frame (numpy) or None.
+    Thread-safe; meant to live in st.cache_resource and be shared by sessions.
+    """
+
+    def __init__(self, width=PREVIEW_WIDTH, cache_size=FRAME_CACHE_SIZE, max_decoders=MAX_OPEN_DECODERS):
+        self.width = width
+        self.cache_size = cache_size
+        self.max_decoders = max_decoders
+        self._frames = OrderedDict()
+        self._decoders = OrderedDict()
+        self._opening = {}          # video_path -> lock held while its decoder is created
+        self._lock = threading.Lock()
+
+    def _cached_decoder(self, video_path):
+        with self._lock:
+            decoder = self._decoders.get(video_path)
+            if decoder is not None:
+                self._decoders.move_to_end(video_path)
+            return decoder
+
+    def _decoder(self, video_path):
+        decoder = self._cached_decoder(video_path)
+        if decoder is not None:
+            return decoder
+        # One opener per source: concurrent misses wait for it instead of each
+        # opening a decoder; other sources are not blocked meanwhile
+        with self._lock:
+            opening = self._opening.setdefault(video_path, threading.Lock())
+        with opening:
+            decoder = self._cached_decoder(video_path)
+            if decoder is not None:
+                return decoder
+            decoder = _Decoder(video_path)
+            with self._lock:
+                self._decoders[video_path] = decoder
+                self._opening.pop(video_path, None)
+                evicted = []
+                while len(self._decoders) > self.max_decoders:
+                    evicted.append(self._decoders.popitem(last=False)[1])
+        for old in evicted:
+            with old.lock:
+                old.close()
+        return decoder
+
+    def frame_at(self, video_path, seconds):
+        decoder = self._decoder(video_path)
+        key = (video_path, int(round(max(seconds, 0) * decoder.fps)))
+
+        with self._lock:
+            frame = self._frames.get(key)
+            if frame is not None:
+                self._frames.move_to_end(key)
+                return frame
+
+        with decoder.lock:
+            frame = decoder.read(key[1])
+        if frame is None:
+            return None
+
+        h, w = frame.shape[:2]
+        if w > self.width:
+            frame = cv2.resize(frame, (self.width, int(h * self.width / w) // 2 * 2), interpolation=cv2.INTER_AREA)
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+        with self._lock:
+            self._frames[key] = frame
+            while len(self._frames) > self.cache_size:
+                self._frames.popitem(last=False)
+        return frame
+
+    def close(self):
+        with self._lock:
+            decoders = list(self._decoders.values())
+            self._decoders.clear()
+            self._frames.clear()
+        for decoder in decoders:
+            with decoder.lock:
+                decoder.close()
@@ -0,0 +1,183 @@
+"""
+Highlight Scoring
+Scores every second of a source range by audio energy, loudness variation,
+scene-change rate and (optionally) speech rate, then picks the best
+non-overlapping clip windows.
+"""
+import re
+import subprocess
+
+from lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+
+FFMPEG_CMD = "ffmpeg"
+SAMPLE_RATE = 8000          # Mono PCM rate used for the audio features
+SUB_WINDOWS = 10            # 100ms loudness windows per second
+SCENE_THRESHOLD = 0.3       # ffmpeg scene score that counts as a cut
+
+# Relative weight of each per-second feature in the final score
+DEFAULT_WEIGHTS = {
+    "rms": 1.0,
+    "loudness_var": 0.5,
+    "scene_rate": 0.5,
+    "speech_rate": 1.0,
+}
+
+def _run_analysis_pass(video_path, start, duration, with_audio=True):
+    """
+    One ffmpeg process over the range: raw mono PCM on stdout, and the
+    timestamps of scene cuts (select + showinfo) on stderr.
+    """
+    cmd = [FFMPEG_CMD, "-hide_banner", "-nostats", "-ss", str(start), "-t", str(duration), "-i", video_path]
+    if with_audio:
+        cmd += ["-map", "0:a:0", "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "s16le", "pipe:1"]
+    cmd += [
+        "-map", "0:v:0",
+        "-vf", f"scale=160:-2,select='gt(scene,{SCENE_THRESHOLD})',showinfo",
+        "-f", "null", "-"
+    ]
+    # communicate() drains stdout and stderr together, so neither pipe can fill up
+    return subprocess.run(cmd, capture_output=True)
+
+def analyze_range(video_path, start, end):
+    """
+    Decode [start, end) once and return per-second feature arrays:
+    {"rms", "loudness_var", "scene_rate"} (length = whole seconds in range).
+    """
+    duration = end - start
+    seconds = max(int(duration), 1)
+
+    result = _run_analysis_pass(video_path, start, duration, with_audio=True)
+    if result.returncode != 0:
+        # Sources without an audio stream: video-only pass
+        result = _run_analysis_pass(video_path, start, duration, with_audio=False)
+        samples = np.zeros(0, dtype=np.float32)
+    else:
+        samples = np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+
+    # --- Audio: RMS energy + loudness variance per second ---
+    win = SAMPLE_RATE // SUB_WINDOWS
+    needed = seconds * SUB_WINDOWS * win
+    samples = np.pad(samples[:needed], (0, max(0, needed - samples.size)))
+    windows = samples.reshape(seconds, SUB_WINDOWS, win)
+    sub_rms = np.sqrt(np.mean(windows ** 2, axis=2))
+    rms = np.sqrt(np.mean(sub_rms ** 2, axis=1))
+    loudness_var = np.var(20 * np.log10(sub_rms + 1e-4), axis=1)
+
+    # --- Video: scene cuts per second ---
+    cut_times = np.array([float(t) for t in re.findall(rb"pts_time:([0-9.]+)", result.stderr)])
+    cut_seconds = cut_times[cut_times < seconds].astype(int)
+    scene_rate = np.bincount(cut_seconds, minlength=seconds)[:seconds].astype(np.float64)
+
+    return {"rms": rms, "loudness_var": loudness_var, "scene_rate": scene_rate}
+
+def _srt_seconds(ts):
+    h, m, s = ts.strip().replace(',', '.').split(':')
+    return int(h) * 3600 + int(m) * 60 + float(s)
+
+def speech_rate_from_srt(srt_path, start, seconds):
+    """
+    Words spoken per second over [start, start + seconds) from a source-level
+    SRT. Each cue's words are spread evenly across its duration.
+    """
+    rate = np.zeros(seconds)
+    with open(srt_path, 'r', encoding='utf-8') as f:
+        blocks = f.read().strip().split('\n\n')
+
+    for block in blocks:
+        lines = [line for line in block.strip().split('\n') if line.strip()]
+        timing = next((line for line in lines if '-->' in line), None)
+        if not timing:
+            continue
+        cue_start, cue_end = (_srt_seconds(part) - start for part in timing.split('-->'))
+        text = " ".join(lines[lines.index(timing) + 1:])
+        words = len(re.sub(r'<[^>]+>', '', text).split())
+        if words == 0 or cue_end <= 0 or cue_start >= seconds:
+            continue
+        first = max(int(cue_start), 0)
+        last = min(int(np.ceil(cue_end)), seconds)
+        if last > first:
+            rate[first:last] += words / (last - first)
+    return rate
+
+def score_seconds(features, weights=DEFAULT_WEIGHTS):
+    """Weighted sum of z-scored features -> one score per second."""
+    total = None
+    for name, weight in weights.items():
+        if name not in features or weight == 0:
+            continue
+        values = np.asarray(features[name], dtype=np.float64)
+        std = values.std()
+        z = (values - values.mean()) / std if std > 0 else np.zeros_like(values)
+        total = weight * z if total is None else total + weight * z
+    return total
+
+def select_top_windows(scores, window, k, blocked=None):
+    """
+    Pick up to k non-overlapping windows of `window` seconds maximizing the
+    summed score (weighted interval scheduling with a cardinality limit).
+
+    scores: per-second scores; blocked: optional bool mask of seconds that
+    must not be used. Returns window start offsets (seconds), in time order.
+    """
+    n = len(scores)
+    if n < window or k <= 0:
+        return []
+
+    csum = np.concatenate([[0.0], np.cumsum(scores)])
+    window_score = csum[window:] - csum[:-window]       # window_score[s]: start s
+    if blocked is not None:
+        bsum = np.concatenate([[0], np.cumsum(blocked.astype(np.int64))])
+        window_score = np.where(bsum[window:] - bsum[:-window] > 0, -np.inf, window_score)
+
+    # best[j][e]: best total of j windows ending at or before second e
+    best_prev = np.zeros(n + 1)
+    ends = np.arange(n + 1)
+    choices = []
+    for _ in range(k):
+        candidate = np.full(n + 1, -np.inf)
+        candidate[window:] = best_prev[:n + 1 - window] + window_score
+        best = np.maximum.accumulate(candidate)
+        # Latest end position that achieves the running maximum
+        record = np.where(candidate >= best, ends, 0)
+        choices.append(np.maximum.accumulate(record))
+        if not np.isfinite(best[n]):
+            choices.pop()
+            break
+        best_prev = best
+
+    # Backtrack from the largest feasible count
+    starts = []
+    end = n
+    for choice in reversed(choices):
+        chosen_end = int(choice[end])
+        starts.append(chosen_end - window)
+        end = chosen_end - window
+    return sorted(starts)
+
+def pick_highlights(video_path, range_start, range_end, clip_duration, count, used_index=None, transcript_srt=None, weights=DEFAULT_WEIGHTS):
+    """
+    Analyze [range_start, range_end) and return up to `count` absolute start
+    times of the highest-scoring non-overlapping clips. Ranges already in
+    `used_index` (an IntervalIndex) are excluded.
+    """
+    print(f"   -> Scoring {range_end - range_start:.0f}s of source for highlights...")
+    features = analyze_range(video_path, range_start, range_end)
+    seconds = len(features["rms"])
+
+    if transcript_srt:
+        features["speech_rate"] = speech_rate_from_srt(transcript_srt, range_start, seconds)
+
+    scores = score_seconds(features, weights)
+
+    blocked = None
+    if used_index is not None and len(used_index):
+        blocked = np.zeros(seconds, dtype=bool)
+        for used_start, used_end in used_index:
+            lo = max(int(np.floor(used_start - range_start)), 0)
+            hi = min(int(np.ceil(used_end - range_start)), seconds)
+            if hi > lo:
+                blocked[lo:hi] = True
+
+    return [range_start + s for s in select_top_windows(scores, int(clip_duration), count, blocked)]
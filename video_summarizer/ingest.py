@@ -0,0 +1,172 @@
+"""
+Video Ingestion
+Uploads: hashed from memory first; content that is already in the catalog
+is not written at all, new content is streamed to disk in bounded chunks.
+
+URLs: metadata is fetched first (no download); the video itself is
+downloaded in a background thread, optionally only the selected time
+range, and cached on disk by extractor + video ID.
+"""
+import os
+import re
+import glob
+import hashlib
+import tempfile
+import threading
+
+UPLOAD_DIR = "."
+DOWNLOAD_DIR = "downloads"
+CHUNK_SIZE = 8 * 1024 * 1024
+RANGE_PADDING = 5           # Extra seconds kept around a range-limited download
+DOWNLOAD_FORMAT = "best[ext=mp4]/best"
+
+def _safe_name(name):
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", os.path.basename(name)) or "video.mp4"
+
+def hash_upload(fileobj):
+    """SHA-256 of a file-like upload; in-memory buffers (Streamlit's UploadedFile) are hashed in place."""
+    if hasattr(fileobj, "getbuffer"):
+        with fileobj.getbuffer() as view:
+            return hashlib.sha256(view).hexdigest()
+    digest = hashlib.sha256()
+    fileobj.seek(0)
+    for chunk in iter(lambda: fileobj.read(CHUNK_SIZE), b""):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+def ingest_upload(fileobj, name, catalog, dest_dir=UPLOAD_DIR):
+    """
+    Store a file-like upload and register it as a source.
+
+    The upload is hashed (SHA-256) before anything touches the disk. If the
+    catalog already has a source with that hash (and its file still exists),
+    that path is returned and nothing is written; otherwise the data is
+    copied chunk by chunk into a temp file in dest_dir and renamed into place.
+
+    Returns (path, content_hash, is_new).
+    """
+    content_hash = hash_upload(fileobj)
+    known = catalog.find_source_by_hash(content_hash)
+    if known and os.path.exists(known["path"]):
+        return known["path"], content_hash, False
+
+    fd, temp_path = tempfile.mkstemp(prefix=".uploading_", dir=dest_dir)
+    try:
+        fileobj.seek(0)
+        with os.fdopen(fd, "wb") as out:
+            for chunk in iter(lambda: fileobj.read(CHUNK_SIZE), b""):
+                out.write(chunk)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+    final_path = os.path.join(dest_dir, f"uploaded_{content_hash[:12]}_{_safe_name(name)}")
+    os.replace(temp_path, final_path)
+    catalog.register_source(final_path, content_hash=content_hash)
+    return final_path, content_hash, True
+
+# --- URL ingestion ---
+
+def fetch_url_info(url):
+    """Metadata only (no download): id, title, duration, ext, extractor."""
+    import yt_dlp
+
+    with yt_dlp.YoutubeDL({"format": DOWNLOAD_FORMAT, "quiet": True, "no_warnings": True}) as ydl:
+        info = ydl.extract_info(url, download=False)
+    return {
+        "url": url,
+        "id": info.get("id"),
+        "title": info.get("title") or info.get("id"),
+        "duration": info.get("duration"),
+        "ext": info.get("ext", "mp4"),
+        "extractor": info.get("extractor_key") or info.get("extractor") or "generic",
+    }
+
+def padded_section(start, end, duration=None, padding=RANGE_PADDING):
+    """Whole-second (start, end) range around a selection, clamped to the video."""
+    lo = max(int(start) - padding, 0)
+    hi = int(end + 0.999) + padding
+    if duration:
+        hi = min(hi, int(duration + 0.999))
+    return (lo, hi)
+
+def download_base(info, section=None, download_dir=DOWNLOAD_DIR):
+    """Cache path (without extension) for a video, or for one range of it."""
+    key = _safe_name(f"{info['extractor']}_{info['id']}")
+    if section:
+        key += f"_{section[0]}-{section[1]}"
+    return os.path.join(download_dir, key)
+
+def cached_download(info, section=None, download_dir=DOWNLOAD_DIR):
+    """Path of a finished download for this video/range, or None."""
+    base = download_base(info, section, download_dir)
+    done = [p for p in glob.glob(glob.escape(base) + ".*") if not p.endswith((".part", ".ytdl"))]
+    return done[0] if done else None
+
+class UrlDownloader:
+    """
+    Runs yt-dlp downloads in background threads.
+    One job per (video, range); status() is safe to poll from every rerun.
+    """
+
+    def __init__(self, download_dir=DOWNLOAD_DIR):
+        self.download_dir = download_dir
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def start(self, info, section=None):
+        """Start (or reuse) a download; returns the job key."""
+        key = (info["extractor"], info["id"], section)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job and job["state"] in ("running", "done"):
+                return key
+            cached = cached_download(info, section, self.download_dir)
+            if cached:
+                self._jobs[key] = {"state": "done", "progress": 1.0, "path": cached, "error": None}
+                return key
+            self._jobs[key] = {"state": "running", "progress": 0.0, "path": None, "error": None}
+
+        threading.Thread(target=self._run, args=(key, info, section), daemon=True).start()
+        return key
+
+    def status(self, key):
+        with self._lock:
+            return dict(self._jobs.get(key) or {"state": "missing", "progress": 0.0, "path": None, "error": None})
+
+    def _update(self, key, **fields):
+        with self._lock:
+            self._jobs[key].update(fields)
+
+    def _run(self, key, info, section):
+        import yt_dlp
+
+        os.makedirs(self.download_dir, exist_ok=True)
+
+        def on_progress(d):
+            total = d.get("total_bytes") or d.get("total_bytes_estimate")
+            if d.get("status") == "downloading" and total:
+                self._update(key, progress=min(d.get("downloaded_bytes", 0) / total, 0.99))
+
+        ydl_opts = {
+            "format": DOWNLOAD_FORMAT,
+            "outtmpl": download_base(info, section, self.download_dir) + ".%(ext)s",
+            "quiet": True,
+            "no_warnings": True,
+            "noprogress": True,
+            "progress_hooks": [on_progress],
+        }
+        if section:
+            # Only fetch the selected range (cut on keyframes so it stays playable)
+            ydl_opts["download_ranges"] = yt_dlp.utils.download_range_func(None, [section])
+            ydl_opts["force_keyframes_at_cuts"] = True
+
+        try:
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                ydl.download([info["url"]])
+            path = cached_download(info, section, self.download_dir)
+            if not path:
+                raise RuntimeError("download finished but no file was written")
+            self._update(key, state="done", progress=1.0, path=path)
+        except Exception as e:
+            self._update(key, state="error", error=str(e))
@@ -0,0 +1,141 @@
+"""
+Interval Index
+Sorted index of used time ranges (seconds) for picking new, non-overlapping clips.
+"""
+import bisect
+import random
+
+
+class _FenwickTree:
+    """Prefix sums over gap weights: O(log n) update and weighted search."""
+
+    def __init__(self, size):
+        self.size = size
+        self.tree = [0.0] * (size + 1)
+
+    def add(self, index, delta):
+        index += 1
+        while index <= self.size:
+            self.tree[index] += delta
+            index += index & -index
+
+    def find(self, value):
+        """Smallest 0-based index whose prefix sum exceeds `value`."""
+        pos = 0
+        bit = 1 << self.size.bit_length()
+        while bit:
+            nxt = pos + bit
+            if nxt <= self.size and self.tree[nxt] <= value:
+                pos = nxt
+                value -= self.tree[nxt]
+            bit >>= 1
+        return min(pos, self.size - 1)
+
+
+class IntervalIndex:
+    """
+    Disjoint, sorted [start, end) ranges kept in two parallel lists.
+    Overlapping or touching ranges are merged on insert, so lookups are a
+    single bisect.
+    """
+
+    def __init__(self, intervals=()):
+        self._starts = []
+        self._ends = []
+        for start, end in intervals:
+            self.add(start, end)
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __iter__(self):
+        return iter(zip(self._starts, self._ends))
+
+    def add(self, start, end):
+        # Every range with end >= start and start <= end touches the new one
+        i = bisect.bisect_left(self._ends, start)
+        j = bisect.bisect_right(self._starts, end)
+        if i < j:
+            start = min(start, self._starts[i])
+            end = max(end, self._ends[j - 1])
+        self._starts[i:j] = [start]
+        self._ends[i:j] = [end]
+
+    def overlaps(self, start, end):
+        """True if [start, end) shares any time with a used range."""
+        i = bisect.bisect_right(self._ends, start)
+        return i < len(self._starts) and self._starts[i] < end
+
+    def free_gaps(self, lo, hi):
+        """Unused [a, b) ranges inside [lo, hi], in time order."""
+        gaps = []
+        cursor = lo
+        i = bisect.bisect_right(self._ends, lo)
+        while i < len(self._starts) and self._starts[i] < hi:
+            if self._starts[i] > cursor:
+                gaps.append((cursor, self._starts[i]))
+            cursor = max(cursor, self._ends[i])
+            i += 1
+        if cursor < hi:
+            gaps.append((cursor, hi))
+        return gaps
+
+    def pick_free_slots(self, lo, hi, length, count, rng=random):
+        """
+        Pick up to `count` start times for `length`-second clips inside
+        [lo, hi] that overlap neither the index nor each other.
+
+        Every valid start is equally likely: gaps are weighted by how many
+        start positions they offer (gap length - clip length). Picked clips
+        are added to the index. Fewer than `count` starts are returned only
+        when no free gap can fit another clip.
+        """
+        gaps = [(a, b) for a, b in self.free_gaps(lo, hi) if b - a >= length]
+        # A pick splits one gap into at most two, so `count` extra slots suffice
+        slots = gaps + [None] * count
+        weights = _FenwickTree(len(slots))
+        for k, (a, b) in enumerate(gaps):
+            weights.add(k, b - a - length)
+        total = sum(b - a - length for a, b in gaps)
+        next_free = len(gaps)
+
+        picked = []
+        while len(picked) < count:
+            if total > 1e-9:
+                k = weights.find(rng.uniform(0, total))
+                if slots[k] is None or slots[k][1] - slots[k][0] - length <= 0:
+                    # Float round-off landed on an empty slot; take any live one
+                    live = [i for i, gap in enumerate(slots) if gap and gap[1] - gap[0] - length > 0]
+                    if not live:
+                        total = 0.0
+                        continue
+                    k = live[0]
+                a, b = slots[k]
+                start = min(max(a + rng.uniform(0, b - a - length), a), b - length)
+            else:
+                # Only exact fits (zero-width start ranges) left, if any
+                exact = [k for k, gap in enumerate(slots) if gap and gap[1] - gap[0] >= length]
+                if not exact:
+                    break
+                k = exact[0]
+                a, b = slots[k]
+                start = a
+
+            # Split the gap around the new clip
+            weights.add(k, -(b - a - length))
+            total -= b - a - length
+            left, right = (a, start), (start + length, b)
+            slots[k] = left if left[1] - left[0] >= length else None
+            if slots[k]:
+                weights.add(k, left[1] - left[0] - length)
+                total += left[1] - left[0] - length
+            if right[1] - right[0] >= length:
+                slots[next_free] = right
+                weights.add(next_free, right[1] - right[0] - length)
+                total += right[1] - right[0] - length
+                next_free += 1
+
+            self.add(start, start + length)
+            picked.append(start)
+
+        return picked
@@ -0,0 +1,379 @@
+"""
+Background Jobs
+A small job manager for the Streamlit app: generation, clip regeneration and
+subtitling run in worker processes instead of inside the script run.
+
+One JobManager is shared by every session (st.cache_resource), so all tabs
+and users queue onto the same bounded pool. A job is a top-level function
+f(report, *args) run in a child process; report(fraction, message)
+streams progress back. Cancelling kills the child and anything it started.
+Jobs are handed to the warm worker daemon (worker.py) when USE_WORKER is
+set, and fall back to a freshly spawned process if it can't be reached.
+"""
+import os
+import time
+import uuid
+import queue
+import signal
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+import progress_events
+from progress_events import parse_event, ProgressTracker
+
+# Jobs that may run at once (each one is a full ffmpeg/whisper pipeline)
+MAX_JOB_WORKERS = 2
+# Finished jobs kept for the UI
+KEEP_FINISHED_JOBS = 20
+
+ACTIVE_STATES = ("queued", "running")
+
+# Run jobs in the warm worker daemon (auto-started) instead of a new Python each time
+USE_WORKER = True
+# Seconds a cancelled job gets to exit after SIGTERM before it is killed
+CANCEL_GRACE_SECONDS = 5
+
+def _child_main(events, func, args, kwargs):
+    """Entry point of a job process."""
+    if hasattr(os, "setsid"):
+        os.setsid()     # own process group: cancel also stops ffmpeg children
+
+    def report(fraction=None, message=None):
+        events.put(("progress", fraction, message))
+
+    try:
+        events.put(("result", func(report, *args, **kwargs)))
+    except Exception as e:
+        events.put(("error", f"{type(e).__name__}: {e}"))
+
+def kill_job_process(process, grace=CANCEL_GRACE_SECONDS):
+    """
+    Stop a job process and anything it started (its process group), then
+    reap it. Job processes are not daemonic (analysis starts its own worker
+    pool), so they are always joined here rather than at interpreter exit.
+    """
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+    except (AttributeError, ProcessLookupError, PermissionError):
+        # No process groups here, or the child has not called setsid() yet
+        process.terminate()
+    process.join(grace)
+    if process.is_alive():
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (AttributeError, ProcessLookupError, PermissionError):
+            process.kill()
+        process.join()
+
+class LocalJob:
+    """
+    A job in a freshly spawned process.
+    poll(timeout) -> next event or None, cancel(), close().
+    """
+
+    def __init__(self, context, func, args=(), kwargs=None):
+        self.events = context.Queue()
+        # Not daemonic: a daemonic process can't start children (smart_crop's analysis pool)
+        self.process = context.Process(target=_child_main, args=(self.events, func, args, kwargs or {}), daemon=False)
+        self.process.start()
+
+    def poll(self, timeout=0.5):
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            if not self.process.is_alive():
+                return ("error", "Job process exited unexpectedly")
+            return None
+
+    def cancel(self):
+        kill_job_process(self.process)
+
+    def close(self):
+        self.process.join(CANCEL_GRACE_SECONDS)
+        if self.process.is_alive():
+            kill_job_process(self.process)
+
+class JobManager:
+    """
+    submit() queues a job and returns its id; status()/list_jobs() are cheap
+    dict copies for polling; cancel() stops a queued or running job.
+    """
+
+    def __init__(self, max_workers=MAX_JOB_WORKERS, use_worker=USE_WORKER):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._context = multiprocessing.get_context("spawn")
+        self._use_worker = use_worker
+        self._jobs = {}
+        self._futures = {}
+        self._handles = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind, label, func, *args, **kwargs):
+        job_id = uuid.uuid4().hex[:8]
+        with self._lock:
+            self._jobs[job_id] = {
+                "id": job_id, "kind": kind, "label": label,
+                "state": "queued", "progress": 0.0, "message": "Queued",
+                "result": None, "error": None,
+                "created_at": time.time(), "started_at": None, "finished_at": None,
+            }
+            self._prune()
+        self._futures[job_id] = self._pool.submit(self._run, job_id, func, args, kwargs)
+        return job_id
+
+    def status(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def list_jobs(self, active_only=False):
+        """Newest first."""
+        with self._lock:
+            jobs = [dict(job) for job in self._jobs.values()
+                    if not active_only or job["state"] in ACTIVE_STATES]
+        return sorted(jobs, key=lambda job: job["created_at"], reverse=True)
+
+    def cancel(self, job_id):
+        future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            self._update(job_id, state="cancelled", message="Cancelled", finished_at=time.time())
+            return True
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["state"] not in ACTIVE_STATES:
+                return False
+            job["state"] = "cancelling"
+            handle = self._handles.get(job_id)
+        if handle is not None:
+            handle.cancel()
+        return True
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def _prune(self):
+        finished = [job for job in self._jobs.values() if job["state"] not in ACTIVE_STATES + ("cancelling",)]
+        finished.sort(key=lambda job: job["created_at"])
+        for job in finished[:max(len(finished) - KEEP_FINISHED_JOBS, 0)]:
+            del self._jobs[job["id"]]
+            self._futures.pop(job["id"], None)
+
+    def _start(self, func, args, kwargs):
+        """Job handle: in the warm worker if possible, else a spawned process."""
+        if self._use_worker:
+            import worker
+            try:
+                return worker.RemoteJob(func, args, kwargs)
+            except (OSError, EOFError, TimeoutError, RuntimeError) as e:
+                print(f"⚠️ Warm worker unavailable ({e}), spawning a process")
+        return LocalJob(self._context, func, args, kwargs)
+
+    def _run(self, job_id, func, args, kwargs):
+        """Pool thread: start the job and relay its events."""
+        with self._lock:
+            if self._jobs[job_id]["state"] != "queued":
+                return
+            self._jobs[job_id].update(state="running", message="Starting...", started_at=time.time())
+
+        try:
+            handle = self._start(func, args, kwargs)
+        except Exception as e:
+            self._update(job_id, state="failed", error=f"{type(e).__name__}: {e}", message="Failed", finished_at=time.time())
+            return
+        with self._lock:
+            self._handles[job_id] = handle
+            cancelled_early = self._jobs[job_id]["state"] == "cancelling"
+        if cancelled_early:
+            handle.cancel()
+
+        outcome = None
+        while outcome is None:
+            event = handle.poll(0.5)
+            if event is None:
+                continue
+            kind, *payload = event
+            if kind == "progress":
+                fraction, message = payload
+                fields = {"message": message} if message else {}
+                if fraction is not None:
+                    fields["progress"] = fraction
+                self._update(job_id, **fields)
+            elif kind in ("result", "error"):
+                outcome = (kind, payload[0])
+
+        handle.close()
+        with self._lock:
+            self._handles.pop(job_id, None)
+            job = self._jobs[job_id]
+            job["finished_at"] = time.time()
+            if job["state"] == "cancelling":
+                job.update(state="cancelled", message="Cancelled")
+            elif outcome[0] == "result":
+                job.update(state="done", progress=1.0, message="Done", result=outcome[1])
+            else:
+                job.update(state="failed", error=outcome[1], message="Failed")
+
+# --- Job functions (run in the worker process) ---
+
+class _EventSink:
+    """File-like target for progress_events: pipeline events -> job progress."""
+
+    def __init__(self, report):
+        self.report = report
+        self.tracker = ProgressTracker()
+
+    def write(self, line):
+        event = parse_event(line)
+        if event is not None:
+            self.tracker.update(event)
+            self.report(self.tracker.fraction(), self.tracker.describe())
+
+    def flush(self):
+        pass
+
+def generate_shorts_job(report, video_path, **options):
+    """auto_generate_shorts with its progress events folded into the job."""
+    from auto_shorts import auto_generate_shorts
+
+    progress_events.enable(_EventSink(report))
+    auto_generate_shorts(video_path, **options)
+
+def prepare_source_job(report, video_path):
+    """
+    Once per source: 360p analysis proxy (0-80%), then the filmstrip sprite
+    decoded from the proxy (80-100%).
+    """
+    from proxy import proxy_for, build_proxy
+    from thumbnails import filmstrip_info, build_filmstrip
+
+    proxy = proxy_for(video_path)
+    if proxy is None:
+        report(0.0, "🗜️ Building 360p proxy...")
+        proxy = build_proxy(video_path, progress=lambda done, total: report(0.8 * done / total if total else None, None))
+
+    if filmstrip_info(video_path) is None:
+        report(0.8, "🎞️ Building filmstrip...")
+        build_filmstrip(video_path, decode_path=proxy,
+                        progress=lambda done, total: report(0.8 + 0.2 * done / total if total else None, None))
+
+def add_subtitles_job(report, short_dirs):
+    """Phase 2 batch: transcribe + burn subtitles for each selected short."""
+    from auto_shorts import add_subtitles_to_short
+
+    success_count = 0
+    for idx, short_dir in enumerate(short_dirs):
+        report(idx / len(short_dirs), f"Subtitling {os.path.basename(short_dir)} ({idx + 1}/{len(short_dirs)})")
+        if add_subtitles_to_short(short_dir):
+            success_count += 1
+    return {"succeeded": success_count, "total": len(short_dirs)}
+
+def publish_shorts_job(report, short_dirs, vmaf_target=None):
+    """
+    Promote kept draft shorts to publish renders (re-rendered from the source).
+    vmaf_target: size-optimised publish (CRF searched per short, see vmaf_search).
+    """
+    from auto_shorts import promote_short
+
+    success_count = 0
+    for idx, short_dir in enumerate(short_dirs):
+        def render_progress(done, total, idx=idx):
+            report((idx + (done / total if total else 0)) / len(short_dirs), None)
+        report(idx / len(short_dirs), f"Publishing {os.path.basename(short_dir)} ({idx + 1}/{len(short_dirs)})")
+        if promote_short(short_dir, render_progress, vmaf_target=vmaf_target):
+            success_count += 1
+    return {"succeeded": success_count, "total": len(short_dirs)}
+
+def create_subtitles_job(report, short_dir, video_path, model_size="small"):
+    """(Re)create Vizard-style subtitles for one short and burn them in place."""
+    from auto_shorts import generate_subtitles
+    from catalog import Catalog
+    from render_backend import render, render_replacing, make_spec, save_spec, load_spec, DEFAULT_PROFILE
+
+    current_srt = os.path.join(short_dir, "subtitles.srt")
+    temp_output = os.path.join(short_dir, "temp_subs_burn.mp4")
+
+    # 1. Generate SRT (0-80%)
+    report(0.0, f"🎙️ Transcribing audio ({model_size} model)...")
+    success = generate_subtitles(video_path, current_srt, model_size=model_size,
+                                 progress=lambda done, total: report(0.8 * done / total if total else None, None))
+    if not success or not os.path.exists(current_srt):
+        raise RuntimeError("Transcription failed (try checking logs)")
+
+    # 2. Burn Subtitles (80-100%)
+    report(0.8, "🔥 Burning Vizard-style captions...")
+    spec = load_spec(short_dir)
+    if spec and spec.get("variants") and os.path.exists(spec["source"]):
+        # Aspect variants get the same captions: re-render every output from the source in one pass
+        render_replacing({**spec, "subtitles": os.path.abspath(current_srt), "subtitle_style": "vizard"},
+                         progress=lambda done, total: report(0.8 + 0.2 * done / total if total else None, None))
+    else:
+        render(make_spec(video_path, temp_output, subtitles=current_srt, subtitle_style="vizard",
+                         profile=spec["profile"] if spec else DEFAULT_PROFILE))
+        # 3. Replace file
+        os.replace(temp_output, video_path)
+    if spec:
+        # A later publish render re-burns the same captions from the source
+        save_spec({**spec, "subtitles": os.path.abspath(current_srt), "subtitle_style": "vizard"}, short_dir)
+    Catalog().update_short(short_dir, has_subtitles=True, artifacts={"subtitles": os.path.abspath(current_srt)})
+
+def regenerate_clip_job(report, short_dir, video_path, original_video, new_start, new_end, use_face=False, manual_align=0.5):
+    """Re-cut a short from its source with new timing (subtitles are dropped)."""
+    from auto_shorts import get_video_duration
+    from smart_crop import smart_reframe
+    from catalog import Catalog
+    from proxy import proxy_for
+    from render_backend import save_spec, load_spec
+
+    catalog = Catalog()
+    short = catalog.get_short(short_dir)
+    cropped_video = os.path.join(short_dir, "cropped_regen.mp4")
+    final_srt = os.path.join(short_dir, "subtitles.srt")
+
+    # Verify Source Duration (Prevent seeking beyond end)
+    src_dur = get_video_duration(original_video)
+    if new_start > src_dur:
+        raise ValueError(f"Start time ({new_start}s) is greater than Source Video duration ({src_dur:.1f}s). "
+                         "You might be using a CLIP as the source instead of the FULL video.")
+
+    # 1. Smart Crop straight from the source range (0-90%): one ffmpeg pass
+    old_spec = load_spec(short_dir)
+    profile = old_spec["profile"] if old_spec else "draft"
+    old_variants = (old_spec or {}).get("variants") or []
+    aspects = [v["aspect"] + (f"@{v['size'][0]}x{v['size'][1]}" if v.get("size") else "") for v in old_variants]
+    report(0.05, f"📐 Smart Cropping {new_start}s-{new_end}s (Face Tracking: {use_face}, Align: {manual_align})...")
+    spec = smart_reframe(os.path.abspath(original_video), cropped_video, use_face_tracking=use_face, smoothing_seconds=4,
+                         manual_alignment=manual_align, start_time=new_start, end_time=new_end,
+                         analysis_path=proxy_for(original_video), profile=profile, aspects=aspects,
+                         progress=lambda done, total: report(0.25 + 0.65 * done / total if total else None, None))
+    if spec is None:
+        raise RuntimeError(f"Could not open {original_video}")
+
+    # Remove old SRT so "Create Subtitles" button appears
+    if os.path.exists(final_srt):
+        os.remove(final_srt)
+
+    # 2. Replace (backup old video just in case)
+    report(0.9, "💾 Replacing clip...")
+    if os.path.exists(video_path):
+        backup_path = video_path + ".bak"
+        if os.path.exists(backup_path):
+            os.remove(backup_path)
+        os.rename(video_path, backup_path)
+    os.rename(cropped_video, video_path)
+    # Variants were rendered in the same pass next to the temp clip
+    for variant, old in zip(spec["variants"], old_variants):
+        os.replace(variant["output"], old["output"])
+        variant["output"] = old["output"]
+    save_spec({**spec, "output": os.path.abspath(video_path)}, short_dir)
+
+    # Update catalog only now that the render succeeded (new range and params; old subtitles were removed)
+    params = {'face_tracking': use_face, 'manual_alignment': manual_align, 'profile': profile}
+    if short and short["source_path"] != os.path.abspath(original_video):
+        catalog.add_short(catalog.register_source(original_video), short_dir, new_start, new_end,
+                          params={**short["params"], **params},
+                          artifacts={"final": os.path.abspath(video_path)})
+    else:
+        catalog.update_short(short_dir, start_time=new_start, end_time=new_end, params=params,
+                             has_subtitles=False, artifacts={"subtitles": None})
@@ -0,0 +1,57 @@
+"""
+Lazy Imports
+Heavy dependencies (torch/whisper, faster_whisper, cv2, numpy, moviepy,
+yt_dlp) are bound at module level with lazy_import() and only really
+imported on first attribute access. Preview runs, the --worker client and
+app cold starts no longer pay for libraries they never touch.
+
+    cv2 = lazy_import("cv2")
+    ...
+    cap = cv2.VideoCapture(path)    # cv2 is imported here
+
+A missing library raises ImportError at first use instead of at import.
+benchmark_imports.py checks the entry points against an import-time budget.
+"""
+import sys
+import types
+import importlib
+import threading
+
+# Libraries that must not be imported just by importing an entry point
+HEAVY_MODULES = ("torch", "whisper", "faster_whisper", "ctranslate2", "cv2", "numpy", "moviepy", "yt_dlp")
+
+_import_lock = threading.Lock()
+
+class LazyModule(types.ModuleType):
+    """Stand-in module that imports the real one on first attribute access."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            with _import_lock:
+                module = self.__dict__["_module"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+def lazy_import(name):
+    """The module if it's already imported, else a LazyModule for it."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
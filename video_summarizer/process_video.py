@@ -11,8 +11,10 @@ if os.path.exists(FFMPEG_BINARY):
 else:
     print("Warning: Local ffmpeg not found, relying on system path.")
 
-import whisper
-from moviepy import VideoFileClip
+from lazy_imports import lazy_import
+from smart_crop import smart_reframe
+
+whisper = lazy_import("whisper")
 
 def format_timestamp(seconds: float):
     td = datetime.timedelta(seconds=seconds)
@@ -52,29 +54,12 @@ def transcribe_video(video_path, model_size="base"):
 
 def create_short(video_path):
     print(f"Creating 9:16 Short from {video_path}...")
-    clip = VideoFileClip(video_path)
-    
-    # Calculate crop dimensions
-    w, h = clip.size
-    target_ratio = 9/16
-    
-    # Target width based on height
-    new_w = h * target_ratio
-    
-    # Center crop
-    x1 = (w / 2) - (new_w / 2)
-    x2 = (w / 2) + (new_w / 2)
-    
-    cropped_clip = clip.crop(x1=x1, y1=0, x2=x2, y2=h)
-    
+    # Center crop (Fixed mode, alignment 0.5), rendered in one ffmpeg pass
     output_path = os.path.splitext(video_path)[0] + "_short.mp4"
     
     # Write video
     print(f"Rendering short to {output_path}...")
-    
-    # Use slower preset for better compression, ultrafast for testing. 
-    # Also ensuring audio codec is aac for compatibility.
-    cropped_clip.write_videofile(output_path, codec="libx264", audio_codec="aac", preset="ultrafast")
+    smart_reframe(video_path, output_path, use_face_tracking=False)
     
     return output_path
 
@@ -0,0 +1,143 @@
+"""
+Progress Events
+Machine-readable progress from the shorts pipeline: one JSON object per line
+on stdout (enabled with auto_shorts.py --progress-json), plus helpers to run
+ffmpeg with -progress and to turn the event stream into overall progress/ETA.
+"""
+import sys
+import json
+import time
+import threading
+import subprocess
+
+# Relative cost of each stage of one short (used for the overall fraction)
+STAGE_WEIGHTS = {
+    "analyze": 0.4,
+    "transcribe": 0.3,
+    "render": 0.3,
+}
+
+_stream = None
+
+def enable(stream=None):
+    """Turn event output on (events are no-ops until this is called)."""
+    global _stream
+    _stream = stream or sys.stdout
+
+def emit(event, **fields):
+    """Write one event line, e.g. emit("stage", short=0, stage="crop", fraction=0.5)."""
+    if _stream is None:
+        return
+    _stream.write(json.dumps({"event": event, "time": time.time(), **fields}) + "\n")
+    _stream.flush()
+
+def parse_event(line):
+    """Event dict for a progress line, None for ordinary log output."""
+    line = line.strip()
+    if not line.startswith("{"):
+        return None
+    try:
+        event = json.loads(line)
+    except ValueError:
+        return None
+    return event if isinstance(event, dict) and "event" in event else None
+
+def run_ffmpeg(cmd, duration=None, on_progress=None):
+    """
+    Run an ffmpeg command with -progress on stdout, calling
+    on_progress(seconds_done, duration) as output time advances.
+    stderr is drained on a separate thread so a chatty encoder can never
+    block on a full pipe. Returns a CompletedProcess (stderr as text).
+    """
+    cmd = [cmd[0], "-progress", "pipe:1", "-nostats"] + list(cmd[1:])
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+
+    stderr_chunks = []
+    drain = threading.Thread(target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True)
+    drain.start()
+
+    for line in process.stdout:
+        key, _, value = line.strip().partition("=")
+        # out_time_ms is (despite the name) in microseconds, like out_time_us
+        if key == "out_time_us" and on_progress and value.isdigit():
+            seconds = int(value) / 1e6
+            on_progress(min(seconds, duration) if duration else seconds, duration)
+
+    process.wait()
+    drain.join()
+    return subprocess.CompletedProcess(cmd, process.returncode, None, "".join(stderr_chunks))
+
+class ProgressTracker:
+    """
+    Folds pipeline events into overall progress:
+    fraction (0-1), current short/stage and an ETA in seconds.
+    """
+
+    def __init__(self):
+        self.total_shorts = 0
+        self.stages = list(STAGE_WEIGHTS)
+        self.finished_shorts = 0
+        self.failed_shorts = 0
+        self.short = None
+        self.stage = None
+        self.stage_fraction = 0.0
+        self.done_stages = set()
+        self.started_at = None
+        self.finished = False
+
+    def update(self, event):
+        kind = event.get("event")
+        if kind == "start":
+            self.total_shorts = event.get("shorts", 0)
+            self.stages = event.get("stages", self.stages)
+            self.started_at = event.get("time", time.time())
+        elif kind == "stage":
+            if event.get("short") != self.short:
+                self.done_stages = set()
+            self.short = event.get("short")
+            if self.stage and self.stage != event.get("stage"):
+                self.done_stages.add(self.stage)
+            self.stage = event.get("stage")
+            self.stage_fraction = event.get("fraction", 0.0)
+        elif kind in ("short_done", "short_failed"):
+            self.finished_shorts += 1
+            if kind == "short_failed":
+                self.failed_shorts += 1
+            self.stage = None
+            self.stage_fraction = 0.0
+            self.done_stages = set()
+        elif kind == "done":
+            self.finished = True
+
+    def fraction(self):
+        if self.finished:
+            return 1.0
+        if not self.total_shorts:
+            return 0.0
+        weights = {stage: STAGE_WEIGHTS.get(stage, 0.1) for stage in self.stages}
+        total_weight = sum(weights.values()) or 1.0
+        current = sum(weights.get(stage, 0) for stage in self.done_stages)
+        if self.stage:
+            current += weights.get(self.stage, 0) * self.stage_fraction
+        return min((self.finished_shorts + current / total_weight) / self.total_shorts, 1.0)
+
+    def eta(self):
+        """Seconds remaining (None until there is enough progress to tell)."""
+        done = self.fraction()
+        if self.started_at is None or done <= 0.01 or done >= 1.0:
+            return None
+        elapsed = time.time() - self.started_at
+        return elapsed * (1 - done) / done
+
+    def describe(self):
+        if self.finished:
+            return "✅ Generation Complete!"
+        if not self.total_shorts:
+            return "⏳ Starting..."
+        text = f"Short {min(self.finished_shorts + 1, self.total_shorts)}/{self.total_shorts}"
+        if self.stage:
+            text += f" · {self.stage} {self.stage_fraction * 100:.0f}%"
+        eta = self.eta()
+        if eta is not None:
+            text += f" · ETA {int(eta // 60)}m {int(eta % 60):02d}s"
+        return text
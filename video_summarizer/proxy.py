@@ -0,0 +1,58 @@
+"""
+Analysis Proxy
+Each source is transcoded once into a small 360p short-GOP proxy (with
+audio). Face/activity analysis, highlight scoring and previews read the
+proxy; only the final render touches the full-resolution original.
+Proxies are rebuilt when the source is newer than the proxy (mtime).
+"""
+import os
+import hashlib
+
+from progress_events import run_ffmpeg
+
+FFMPEG_CMD = "ffmpeg"
+PROXY_DIR = ".proxy_cache"
+PROXY_HEIGHT = 360
+PROXY_GOP = 15              # Keyframe every 15 frames: any seek decodes < 1s
+
+def proxy_path_for(source_path):
+    key = hashlib.sha1(os.path.abspath(source_path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(PROXY_DIR, key + ".mp4")
+
+def proxy_for(source_path):
+    """Path of an up-to-date proxy for the source, or None."""
+    proxy = proxy_path_for(source_path)
+    if os.path.exists(proxy) and os.path.exists(source_path) and os.path.getmtime(proxy) >= os.path.getmtime(source_path):
+        return proxy
+    return None
+
+def analysis_path_for(source_path):
+    """What analysis should read: the proxy if it's ready, else the source."""
+    return proxy_for(source_path) or source_path
+
+def build_proxy(source_path, duration=None, progress=None):
+    """
+    Transcode the source to the proxy (same frame rate, so frame indices
+    map 1:1 in time). progress: optional callback(seconds_done, duration).
+    """
+    proxy = proxy_path_for(source_path)
+    os.makedirs(PROXY_DIR, exist_ok=True)
+    temp_proxy = proxy + ".tmp.mp4"
+
+    cmd = [
+        FFMPEG_CMD, "-hide_banner", "-loglevel", "error",
+        "-i", source_path,
+        "-vf", f"scale=-2:'min(ih,{PROXY_HEIGHT})'",
+        "-c:v", "libx264", "-preset", "veryfast", "-crf", "26", "-pix_fmt", "yuv420p",
+        "-g", str(PROXY_GOP), "-keyint_min", str(PROXY_GOP), "-sc_threshold", "0",
+        "-c:a", "aac", "-b:a", "96k",
+        "-movflags", "+faststart",
+        "-y", temp_proxy
+    ]
+    result = run_ffmpeg(cmd, duration, progress)
+    if result.returncode != 0:
+        if os.path.exists(temp_proxy):
+            os.remove(temp_proxy)
+        raise RuntimeError(f"ffmpeg proxy failed: {result.stderr[-300:]}")
+    os.replace(temp_proxy, proxy)
+    return proxy
@@ -0,0 +1,230 @@
+"""
+Render Backend
+Every video the project writes goes through render(spec): a declarative
+spec dict becomes ONE ffmpeg invocation that seeks the input, crops (static
+or a per-frame path driven by sendcmd), burns subtitles and encodes. No
+frames pass through Python and every entry point gets the same settings.
+
+Spec keys:
+    source, output      input / output paths (required)
+    start, end          range of the source in seconds (input seeking;
+                        end None = to the end of the source)
+    crop                None, or {"width", "height", "x", "fps"[, "y"]}: "x" is
+                        the left edge per output frame (one value = static crop)
+    subtitles           SRT path burned in after the crop (None = no subtitles)
+    subtitle_style      key of SUBTITLE_STYLES
+    profile             key of PROFILES: "draft" for previews that are likely
+                        discarded, "publish" for shorts that are kept
+    crf, preset, maxrate
+                        optional per-spec overrides of the profile's encoder
+                        settings (e.g. a CRF chosen by vmaf_search.find_crf;
+                        maxrate None = uncapped)
+    variants            optional extra outputs cut from the SAME decode, e.g. a
+                        1:1 and a 4:5 next to the 9:16 short:
+                        [{"aspect", "output", "crop", "size"}]; size [w, h]
+                        scales the variant (None = the profile's max_height).
+                        The frame stream is split once and every branch has
+                        its own named crop (crop@v0 = main output, crop@v1...)
+
+A short's spec is saved next to it (save_spec) so it can be re-rendered
+later, e.g. promoted from draft to publish, without re-analysing.
+"""
+import os
+import json
+
+from lazy_imports import lazy_import
+from progress_events import run_ffmpeg
+from faststart import ensure_faststart
+
+np = lazy_import("numpy")
+
+FFMPEG_CMD = "ffmpeg"
+RENDER_SPEC_FILE = "render_spec.json"
+
+# Named encoder profiles (libx264 + AAC)
+PROFILES = {
+    # Previews: small and fast; most are thrown away
+    "draft": {"max_height": 640, "preset": "ultrafast", "crf": 30, "audio_bitrate": "64k"},
+    # Kept shorts: tuned quality, bitrate capped for upload
+    "publish": {"max_height": None, "preset": "medium", "crf": 20, "maxrate": "8M", "bufsize": "16M",
+                "audio_bitrate": "128k"},
+}
+DEFAULT_PROFILE = "publish"
+ENCODER_OVERRIDES = ("crf", "preset", "maxrate")
+
+SUBTITLE_STYLES = {
+    # Pipeline captions (auto_shorts)
+    "default": "FontName=Arial,FontSize=24,PrimaryColour=&HFFFFFF,OutlineColour=&H000000,BorderStyle=3,Outline=2,Shadow=1,MarginV=20,Alignment=2",
+    # Vizard-style captions (app: Create Subtitles)
+    "vizard": "FontName=Arial,FontSize=28,PrimaryColour=&HFFFFFF,OutlineColour=&H000000,BorderStyle=3,Outline=2,Shadow=1,Alignment=2,MarginV=60",
+}
+
+def make_spec(source, output, start=0.0, end=None, crop=None, subtitles=None, subtitle_style="default", profile=DEFAULT_PROFILE, **extra):
+    """Spec dict with every key present (extra keys are passed through)."""
+    return {"source": source, "output": output, "start": start, "end": end, "crop": crop,
+            "subtitles": subtitles, "subtitle_style": subtitle_style, "profile": profile, **extra}
+
+def save_spec(spec, folder):
+    with open(os.path.join(folder, RENDER_SPEC_FILE), "w") as f:
+        json.dump(spec, f)
+
+def load_spec(folder):
+    """The spec a short was rendered from, or None (older shorts)."""
+    path = os.path.join(folder, RENDER_SPEC_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+def encoder_args(profile, overrides=None):
+    """libx264/AAC args for a profile; overrides: dict (e.g. the spec) whose ENCODER_OVERRIDES keys win."""
+    settings = dict(PROFILES[profile])
+    for key in ENCODER_OVERRIDES:
+        if overrides and key in overrides:
+            settings[key] = overrides[key]
+    args = ["-c:v", "libx264", "-preset", settings["preset"], "-crf", str(settings["crf"]), "-pix_fmt", "yuv420p"]
+    if settings.get("maxrate"):
+        args += ["-maxrate", settings["maxrate"], "-bufsize", settings["bufsize"]]
+    args += ["-c:a", "aac", "-b:a", settings["audio_bitrate"]]
+    # Every profile: moov atom up front so playback starts before the file is fully fetched
+    args += ["-movflags", "+faststart"]
+    return args
+
+def variant_path(output, aspect):
+    """final_short.mp4 + "4:5" -> final_short_4x5.mp4"""
+    base, ext = os.path.splitext(output)
+    return f"{base}_{aspect.replace(':', 'x')}{ext}"
+
+def _outputs(spec):
+    """[(output, crop, size)] for the main output followed by its variants."""
+    return [(spec["output"], spec.get("crop"), None)] + \
+           [(v["output"], v["crop"], v.get("size")) for v in spec.get("variants") or []]
+
+def crop_path_to_sendcmd(crop_path, fps, target="crop@reframe"):
+    """
+    Convert a per-frame crop path into ffmpeg sendcmd lines (piecewise-constant).
+    Only frames where the offset changes produce a command.
+    """
+    changes = np.flatnonzero(np.diff(crop_path)) + 1
+    return "\n".join(f"{idx / fps:.4f} {target} x {int(crop_path[idx])};" for idx in changes)
+
+def _filter_path(path):
+    """Quote a file path for use as a filtergraph option value."""
+    return "'" + os.path.abspath(path).replace("'", "'\\''") + "'"
+
+def _branch_filters(spec, crop, crop_name, size=None):
+    """crop -> scale -> subtitles for one output (crop_name: named crop the sendcmd script drives)."""
+    filters = []
+    if crop is not None:
+        x, y = int(crop["x"][0]), int(crop.get("y") or 0)
+        if crop_name:
+            filters.append(f"{crop_name}=w={crop['width']}:h={crop['height']}:x={x}:y={y}")
+        else:
+            filters.append(f"crop={crop['width']}:{crop['height']}:{x}:{y}")
+    max_height = PROFILES[spec.get("profile") or DEFAULT_PROFILE]["max_height"]
+    if size:
+        filters.append(f"scale={size[0]}:{size[1]}")
+    elif max_height:
+        filters.append(f"scale=-2:'min(ih,{max_height})'")
+    if spec.get("subtitles"):
+        style = SUBTITLE_STYLES[spec.get("subtitle_style") or "default"]
+        filters.append(f"subtitles=filename={_filter_path(spec['subtitles'])}:force_style='{style}'")
+    return filters
+
+def build_command(spec, cmd_file=None):
+    """
+    ffmpeg argv for a spec. cmd_file: where the sendcmd script for moving
+    crops was written (see render()).
+    """
+    start = spec.get("start") or 0.0
+    end = spec.get("end")
+
+    cmd = [FFMPEG_CMD, "-hide_banner", "-loglevel", "error"]
+    if start:
+        cmd += ["-ss", f"{start:.3f}"]          # input seeking: decode from the nearest keyframe
+    if end is not None:
+        cmd += ["-t", f"{end - start:.3f}"]
+    cmd += ["-i", spec["source"]]
+
+    profile = spec.get("profile") or DEFAULT_PROFILE
+    # No setpts here: input seeking already starts the timestamps at 0, and a
+    # setpts in front of sendcmd drops the frame rate (output falls back to 25 fps)
+    head = [f"sendcmd=f={_filter_path(cmd_file)}"] if cmd_file else []
+    outputs = _outputs(spec)
+    if len(outputs) == 1:
+        filters = _branch_filters(spec, spec.get("crop"), "crop@reframe" if cmd_file else None)
+        if filters:
+            cmd += ["-vf", ",".join(head + filters)]
+        cmd += encoder_args(profile, spec)
+        cmd += ["-y", spec["output"]]
+        return cmd
+
+    # Variants: decode once, split, one crop/scale/subtitles branch per output
+    graph = ["[0:v]" + ",".join(head + [f"split={len(outputs)}"]) + "".join(f"[s{i}]" for i in range(len(outputs)))]
+    for i, (_, crop, size) in enumerate(outputs):
+        branch = _branch_filters(spec, crop, f"crop@v{i}" if cmd_file else None, size)
+        graph.append(f"[s{i}]" + (",".join(branch) or "null") + f"[v{i}]")
+    cmd += ["-filter_complex", ";".join(graph)]
+    for i, (output, _, _) in enumerate(outputs):
+        cmd += ["-map", f"[v{i}]", "-map", "0:a?"] + encoder_args(profile, spec) + ["-y", output]
+    return cmd
+
+def render(spec, progress=None):
+    """
+    Run one render. progress: optional callback(seconds_done, duration).
+    The output's moov placement is verified (and fixed) before returning.
+    Raises RuntimeError when ffmpeg fails.
+    """
+    cmd_file = None
+    outputs = _outputs(spec)
+    commands = []
+    for i, (_, crop, _) in enumerate(outputs):
+        if crop is not None and len(crop["x"]) > 1:
+            target = f"crop@v{i}" if len(outputs) > 1 else "crop@reframe"
+            script = crop_path_to_sendcmd(np.asarray(crop["x"], dtype=np.int32), crop["fps"], target)
+            commands += script.splitlines()
+    if commands:
+        commands.sort(key=lambda line: float(line.split(" ", 1)[0]))
+        cmd_file = os.path.splitext(spec["output"])[0] + "_crop.cmd"
+        with open(cmd_file, "w") as f:
+            f.write("\n".join(commands) + "\n")
+
+    duration = spec["end"] - (spec.get("start") or 0.0) if spec.get("end") is not None else None
+    try:
+        result = run_ffmpeg(build_command(spec, cmd_file), duration, progress)
+    finally:
+        if cmd_file and os.path.exists(cmd_file):
+            os.remove(cmd_file)
+
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg render failed: {result.stderr[-500:]}")
+    for output, _, _ in outputs:
+        ensure_faststart(output)
+    return spec["output"]
+
+def render_replacing(spec, progress=None):
+    """
+    render() into temporary files next to every output, then move them into
+    place - the old files stay playable until the new render is complete.
+    """
+    def temp(path):
+        return os.path.splitext(path)[0] + ".rendering.mp4"
+    temp_spec = {**spec, "output": temp(spec["output"]),
+                 "variants": [{**v, "output": temp(v["output"])} for v in spec.get("variants") or []]}
+    render(temp_spec, progress)
+    for output, _, _ in _outputs(spec):
+        os.replace(temp(output), output)
+    return spec["output"]
+
+def extract_audio(source, output, start=0.0, end=None):
+    """16 kHz mono WAV of a source range (what Whisper resamples to anyway)."""
+    cmd = [FFMPEG_CMD, "-hide_banner", "-loglevel", "error"]
+    if start:
+        cmd += ["-ss", f"{start:.3f}"]
+    if end is not None:
+        cmd += ["-t", f"{end - start:.3f}"]
+    cmd += ["-i", source, "-vn", "-ac", "1", "-ar", "16000", "-y", output]
+    result = run_ffmpeg(cmd)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg audio extract failed: {result.stderr[-300:]}")
+    return output
@@ -0,0 +1,86 @@
+"""
+Shorts Index
+One shared snapshot of the shorts gallery + statistics for the app.
+The catalog rows and the files on disk are read once (os.scandir, one
+pass per short folder) and reused until the catalog changes
+(Catalog.data_version) or the mtime of the output directory or of any
+short's folder does.
+"""
+import os
+import threading
+
+OUTPUT_DIR = "generated_shorts"
+
+def _scan_folder(folder):
+    """{file name: size} for one short folder (a single scandir pass)."""
+    files = {}
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    files[entry.name] = entry.stat(follow_symlinks=False).st_size
+    except FileNotFoundError:
+        pass
+    return files
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+class ShortsIndex:
+    """
+    snapshot() -> {"shorts": [...], "stats": {...}}
+    Each short is the catalog row plus "files" ({name: size}), "final_size"
+    (bytes, None when the final video is missing) and "disk_size".
+    """
+
+    def __init__(self, catalog, output_dir=OUTPUT_DIR):
+        self.catalog = catalog
+        self.output_dir = output_dir
+        self._key = None
+        self._snapshot = None
+        self._folders = ()          # Short folders of the last snapshot
+        self._lock = threading.Lock()
+
+    def _cache_key(self):
+        # Files added/replaced inside a short's folder (subtitles, a regenerated
+        # clip, its backup) only touch that folder's mtime. New or deleted
+        # shorts change data_version, so the last snapshot's folders suffice
+        folders = self._folders
+        return (self.catalog.data_version(), _mtime(self.output_dir), tuple(_mtime(f) for f in folders))
+
+    def invalidate(self):
+        with self._lock:
+            self._key = None
+
+    def snapshot(self):
+        key = self._cache_key()
+        with self._lock:
+            if key == self._key:
+                return self._snapshot
+
+        shorts = self.catalog.list_shorts()
+        folders = tuple(short["folder"] for short in shorts)
+        if folders != self._folders:
+            # Key the snapshot on these folders, stat'ed before they are scanned
+            self._folders = folders
+            key = key[:2] + (tuple(_mtime(f) for f in folders),)
+        total_disk = 0
+        for short in shorts:
+            files = _scan_folder(short["folder"])
+            final = short["artifacts"].get("final")
+            short["files"] = files
+            short["disk_size"] = sum(files.values())
+            # Artifacts live inside the short's folder, so the scan has their sizes
+            short["final_size"] = files.get(os.path.basename(final)) if final else None
+            total_disk += short["disk_size"]
+
+        stats = self.catalog.stats()
+        stats["disk_size"] = total_disk
+        snapshot = {"shorts": shorts, "stats": stats}
+
+        with self._lock:
+            self._key, self._snapshot = key, snapshot
+        return snapshot
@@ -1,144 +1,537 @@
 
-import cv2
-import numpy as np
 import os
-from moviepy import VideoFileClip, vfx
-
-def smart_reframe(video_path, output_path, use_face_tracking=True, smoothing_seconds=4, manual_alignment=0.5):
-    # --- 1. FACE DETECTION PHASE ---
-    x_centers = []
-    
-    if use_face_tracking:
-        print(f"Analyzing {video_path} for faces (HAAR Cascade)...")
-        # Load Video for Analysis
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            print("Error: Could not open video.")
-            return
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from lazy_imports import lazy_import
+from render_backend import render, make_spec, variant_path, DEFAULT_PROFILE
+
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+
+# Face detection runs on every Nth frame; the rest repeat the last center
+DETECT_EVERY_N_FRAMES = 5
+# Below this many frames per worker, process start-up costs more than it saves
+MIN_FRAMES_PER_WORKER = 1500
+# Local files for the DNN face detector (deploy.prototxt + res10 caffemodel)
+DNN_MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "face_detector")
+
+def fill_forward(values, default):
+    """
+    Forward-fill NaN gaps in a center track (vectorized).
+    Leading gaps (no detection yet) are seeded with `default`.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.size == 0:
+        return values
+    valid = ~np.isnan(values)
+    last_valid = np.where(valid, np.arange(values.size), 0)
+    np.maximum.accumulate(last_valid, out=last_valid)
+    filled = values[last_valid]
+    filled[np.isnan(filled)] = default
+    return filled
+
+def smooth_track(centers, window_size):
+    """
+    Moving-average smoothing of a center track.
+    The track is edge-padded before convolving, so the first/last frames
+    are averaged with real positions instead of being pulled toward 0
+    (which is what np.convolve(..., mode='same') does at the borders).
+    """
+    centers = np.asarray(centers, dtype=np.float64)
+    window_size = min(int(window_size), centers.size)
+    if window_size <= 1:
+        return centers
+    pad_left = window_size // 2
+    pad_right = window_size - 1 - pad_left
+    padded = np.pad(centers, (pad_left, pad_right), mode="edge")
+    return np.convolve(padded, np.ones(window_size) / window_size, mode="valid")
+
+def compute_crop_path(centers, frame_width, crop_width, window_size):
+    """
+    Turn a raw per-frame center track into the crop path: one integer
+    x offset per frame, smoothed and clamped in a single vectorized pass.
+    """
+    smoothed = smooth_track(centers, window_size)
+    x_offsets = np.rint(smoothed - crop_width / 2)
+    np.clip(x_offsets, 0, frame_width - crop_width, out=x_offsets)
+    return x_offsets.astype(np.int32)
+
+def fixed_crop_offset(frame_width, crop_width, manual_alignment=0.5):
+    """
+    Static crop offset for Fixed mode.
+    alignment 0.0 = Left, 0.5 = Center, 1.0 = Right
+    """
+    min_center = crop_width / 2
+    max_center = frame_width - (crop_width / 2)
+    center_x = min_center + (manual_alignment * (max_center - min_center))
+    return int(min(max(round(center_x - crop_width / 2), 0), frame_width - crop_width))
+
+def rescale_track(centers, from_width, to_width, from_fps, to_fps, frame_count):
+    """
+    Map a center track from analysis space (e.g. a 360p proxy) to render
+    space: x scaled by the width ratio, resampled to frame_count frames.
+    """
+    centers = np.asarray(centers, dtype=np.float64) * (to_width / from_width)
+    if centers.size == 0 or frame_count <= 0:
+        return centers
+    source_index = np.arange(frame_count) / to_fps * from_fps
+    return np.interp(source_index, np.arange(centers.size), centers)
+
+def video_properties(video_path):
+    """(width, height, fps, frame_count) of a video, or None if it can't be opened."""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        return None
+    props = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+             cap.get(cv2.CAP_PROP_FPS), int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+    cap.release()
+    return props
+
+def crop_width_for(width, height, target_ratio=9/16):
+    """Crop width for the target ratio, rounded down to even (required by yuv420p)."""
+    return min(int(height * target_ratio), width) // 2 * 2
+
+def crop_height_for(width, height, target_ratio=9/16):
+    """Crop height: full height unless the ratio is wider than the frame (even)."""
+    if height * target_ratio <= width:
+        return height
+    return min(int(round(width / target_ratio)), height) // 2 * 2
+
+def parse_aspect(text):
+    """
+    "4:5" or "4:5@1080x1350" -> ("4:5", ratio, size); size is [w, h] of the
+    encoded variant, or None to follow the encoder profile.
+    """
+    aspect, _, resolution = text.strip().partition("@")
+    w, h = (float(v) for v in aspect.split(":"))
+    size = [int(v) for v in resolution.lower().split("x")] if resolution else None
+    return aspect, w / h, size
+
+class FaceDetector:
+    """
+    Face detector interface.
+    detect() returns a list of (x, y, w, h) boxes for one BGR frame;
+    detect_batch() does the same for a list of frames.
+    """
+    name = "base"
+
+    def detect(self, image):
+        raise NotImplementedError
+
+    def detect_batch(self, images):
+        return [self.detect(image) for image in images]
+
+class HaarFaceDetector(FaceDetector):
+    """Frontal Haar cascade (the original detector). Cheap, misses profiles."""
+    name = "haar"
+
+    def __init__(self, scale_factor=1.1, min_neighbors=4, cascade_file="haarcascade_frontalface_default.xml"):
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.cascade = cv2.CascadeClassifier(cv2.data.haarcascades + cascade_file)
+
+    def _detect_gray(self, gray):
+        return list(self.cascade.detectMultiScale(gray, self.scale_factor, self.min_neighbors))
+
+    def detect(self, image):
+        return self._detect_gray(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY))
+
+class ProfileFaceDetector(HaarFaceDetector):
+    """
+    Frontal cascade first, then the profile cascade in both directions
+    (the bundled profile cascade only knows one side, so the frame is mirrored).
+    Keeps the crop on speakers who turn sideways.
+    """
+    name = "profile"
+
+    def __init__(self, scale_factor=1.1, min_neighbors=4):
+        super().__init__(scale_factor, min_neighbors)
+        self.profile_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_profileface.xml")
+
+    def detect(self, image):
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        faces = self._detect_gray(gray)
+        if faces:
+            return faces
+
+        faces = list(self.profile_cascade.detectMultiScale(gray, self.scale_factor, self.min_neighbors))
+        width = gray.shape[1]
+        for (x, y, w, h) in self.profile_cascade.detectMultiScale(cv2.flip(gray, 1), self.scale_factor, self.min_neighbors):
+            faces.append((width - x - w, y, w, h))
+        return faces
+
+class DnnFaceDetector(FaceDetector):
+    """
+    OpenCV DNN (ResNet-10 SSD) face detector loaded from local model files.
+    Handles profiles and small faces far better than Haar; detect_batch()
+    pushes several frames through the network in one forward pass.
+    """
+    name = "dnn"
+
+    def __init__(self, model_dir=DNN_MODEL_DIR, confidence=0.5, input_size=300):
+        prototxt = os.path.join(model_dir, "deploy.prototxt")
+        weights = os.path.join(model_dir, "res10_300x300_ssd_iter_140000.caffemodel")
+        for path in (prototxt, weights):
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"DNN face model not found: {path} (download it from the OpenCV face_detector sample)")
+        self.net = cv2.dnn.readNetFromCaffe(prototxt, weights)
+        self.confidence = confidence
+        self.input_size = input_size
+
+    def detect(self, image):
+        return self.detect_batch([image])[0]
+
+    def detect_batch(self, images):
+        if not images:
+            return []
+        size = (self.input_size, self.input_size)
+        blob = cv2.dnn.blobFromImages([cv2.resize(image, size) for image in images], 1.0, size, (104.0, 177.0, 123.0))
+        self.net.setInput(blob)
+        # Rows: [image_id, label, confidence, x1, y1, x2, y2] (relative coords)
+        detections = self.net.forward().reshape(-1, 7)
+
+        results = [[] for _ in images]
+        for image_id, _, conf, x1, y1, x2, y2 in detections[detections[:, 2] >= self.confidence]:
+            height, width = images[int(image_id)].shape[:2]
+            x1, x2 = max(x1, 0.0) * width, min(x2, 1.0) * width
+            y1, y2 = max(y1, 0.0) * height, min(y2, 1.0) * height
+            if x2 > x1 and y2 > y1:
+                results[int(image_id)].append((int(x1), int(y1), int(x2 - x1), int(y2 - y1)))
+        return results
+
+FACE_DETECTORS = {
+    "haar": HaarFaceDetector,
+    "profile": ProfileFaceDetector,
+    "dnn": DnnFaceDetector,
+}
+
+def create_face_detector(name="haar", **options):
+    """Build a detector by name (see FACE_DETECTORS)."""
+    if name not in FACE_DETECTORS:
+        raise ValueError(f"Unknown face detector '{name}'. Choose from: {', '.join(FACE_DETECTORS)}")
+    return FACE_DETECTORS[name](**options)
+
+class SaliencyEstimator:
+    """
+    Cheap activity-based framing for shots without a detectable face
+    (B-roll, screen recordings, product shots).
+
+    Each frame is downscaled to gray; activity = gradient energy plus the
+    absolute difference to the previous observed frame. Window sums come from
+    an integral image, so picking the crop window with the most activity is a
+    single vectorized subtraction.
+    """
+
+    def __init__(self, target_ratio=9/16, analysis_width=160, motion_weight=2.0):
+        self.target_ratio = target_ratio
+        self.analysis_width = analysis_width
+        self.motion_weight = motion_weight
+        self._prev = None
+        self._energy = None
+        self._scale = 1.0
+
+    def update(self, image):
+        """Observe a frame (keeps the motion reference current)."""
+        height, width = image.shape[:2]
+        self._scale = min(1.0, self.analysis_width / width)
+        size = (max(1, int(width * self._scale)), max(1, int(height * self._scale)))
+        small = cv2.resize(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), size, interpolation=cv2.INTER_AREA).astype(np.float32)
+
+        energy = np.abs(np.diff(small, axis=1, append=small[:, -1:]))
+        energy += np.abs(np.diff(small, axis=0, append=small[-1:, :]))
+        if self._prev is not None and self._prev.shape == small.shape:
+            energy += self.motion_weight * np.abs(small - self._prev)
+
+        self._prev = small
+        self._energy = energy
+
+    def best_center(self):
+        """Center x (source pixels) of the most active crop window, or None."""
+        if self._energy is None:
+            return None
+        height, width = self._energy.shape
+        win_w = min(max(1, int(round(height * self.target_ratio))), width)
 
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        # Full-height windows: sum = I[h, x + win_w] - I[h, x] (row 0 of I is zero)
+        integral = cv2.integral(self._energy)
+        sums = integral[-1, win_w:] - integral[-1, :-win_w]
+        if sums.size == 0 or sums.max() <= 0:
+            return None
 
-        # Load Haar Cascade
-        face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+        # Several windows often contain the whole active region; center it
+        # by taking the middle of the plateau that starts at the maximum.
+        best = int(np.argmax(sums))
+        below = np.flatnonzero(sums[best:] < sums[best] * 0.999)
+        plateau_end = best + (below[0] if below.size else sums.size - best) - 1
+        return ((best + plateau_end) / 2 + win_w / 2) / self._scale
 
-        frame_count = 0
-        while cap.isOpened():
+    def center(self, image):
+        """update() + best_center() in one call."""
+        self.update(image)
+        return self.best_center()
+
+def _scan_face_range(args):
+    """
+    Worker: scan frames [start_frame, end_frame) for faces.
+    end_frame=None scans to the end of the file.
+    Returns (start_frame, raw_track) where raw_track is NaN wherever no face
+    was detected. Sampling is aligned to the global frame index, so a split
+    scan detects on exactly the same frames as a sequential one.
+    With batch_size > 1, sampled frames are buffered and detected together.
+    detector_name=None skips face detection (saliency framing only);
+    saliency_fallback fills frames where the detector found nothing.
+    """
+    video_path, start_frame, end_frame, detector_name, batch_size, saliency_fallback = args
+    # Workers run in parallel already; keep OpenCV from oversubscribing cores
+    cv2.setNumThreads(1)
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        return start_frame, np.empty(0)
+    if start_frame > 0:
+        # Seeks to the nearest keyframe and decodes forward to start_frame
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+
+    detector = create_face_detector(detector_name) if detector_name else None
+    saliency = SaliencyEstimator() if (saliency_fallback or detector is None) else None
+
+    expected = (end_frame - start_frame) if end_frame is not None else int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    track = np.full(max(expected, 1), np.nan)
+    pending_offsets, pending_images = [], []
+
+    def flush():
+        nonlocal track
+        if detector is not None:
+            batch_faces = detector.detect_batch(pending_images)
+        else:
+            batch_faces = [[] for _ in pending_images]
+
+        for offset, image, faces in zip(pending_offsets, pending_images, batch_faces):
+            center_x = None
+            if saliency is not None:
+                # Always observe, so the motion term compares neighbouring samples
+                saliency.update(image)
+            if len(faces) > 0:
+                # Pick largest face
+                (x, y, w, h_face) = max(faces, key=lambda rect: rect[2] * rect[3])
+                center_x = x + (w / 2)
+            elif saliency is not None:
+                center_x = saliency.best_center()
+
+            if center_x is not None:
+                # CAP_PROP_FRAME_COUNT is only an estimate; grow if it was short
+                if offset >= track.size:
+                    track = np.pad(track, (0, offset + 1), constant_values=np.nan)
+                track[offset] = center_x
+        pending_offsets.clear()
+        pending_images.clear()
+
+    frame_idx = start_frame
+    while end_frame is None or frame_idx < end_frame:
+        # Optimization: Process every 5th frame (enough for 30fps)
+        if frame_idx % DETECT_EVERY_N_FRAMES == 0:
             success, image = cap.read()
             if not success:
                 break
-            
-            # Optimization: Process every 5th frame (enough for 30fps)
-            if frame_count % 5 == 0:
-                gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-                faces = face_cascade.detectMultiScale(gray, 1.1, 4)
-                
-                if len(faces) > 0:
-                    # Pick largest face
-                    largest_face = max(faces, key=lambda rect: rect[2] * rect[3])
-                    (x, y, w, h_face) = largest_face
-                    center_x = x + (w / 2)
-                    x_centers.append(center_x)
-                else:
-                    # Use previous or center
-                    if x_centers:
-                        x_centers.append(x_centers[-1])
-                    else:
-                        x_centers.append(width / 2)
-            else:
-                # Interpolate for skipped frames
-                if x_centers:
-                    x_centers.append(x_centers[-1])
-                else:
-                    x_centers.append(width / 2)
-
-            frame_count += 1
-            if frame_count % 500 == 0:
-                print(f"   -> Scanned {frame_count}/{total_frames} frames...")
-
-        cap.release()
-        
-        # Smooth Camera Movement
-        window_size = int(fps * smoothing_seconds)
-        if len(x_centers) > window_size:
-            smoothed_centers = np.convolve(x_centers, np.ones(window_size)/window_size, mode='same')
+            pending_offsets.append(frame_idx - start_frame)
+            pending_images.append(image)
+            if len(pending_images) >= batch_size:
+                flush()
+        elif not cap.grab():
+            # Skipped frames are only grabbed, never converted
+            break
+
+        frame_idx += 1
+        if end_frame is None and frame_idx % 500 == 0:
+            print(f"   -> Scanned {frame_idx} frames...")
+
+    flush()
+    cap.release()
+
+    scanned = frame_idx - start_frame
+    if scanned > track.size:
+        track = np.pad(track, (0, scanned - track.size), constant_values=np.nan)
+    return start_frame, track[:scanned]
+
+def analyze_faces(video_path, workers=None, min_frames_per_worker=MIN_FRAMES_PER_WORKER, detector="haar", batch_size=1, saliency_fallback=True, start_time=0.0, end_time=None):
+    """
+    Build the raw per-frame face center track for a video.
+
+    Long videos are split into frame ranges scanned by worker processes,
+    each seeking to its own start. The per-range tracks are merged before
+    gap filling, so a range that opens without a face inherits the last
+    center of the previous range instead of snapping to the frame center.
+    Smoothing runs afterwards over the merged track, so seams are invisible.
+
+    detector: name from FACE_DETECTORS, or None for saliency-only framing.
+    batch_size: frames per detect_batch() call.
+    saliency_fallback: frame by activity (SaliencyEstimator) when no face is found.
+    start_time/end_time: only analyze this part of the video (seconds; e.g. one
+                         clip's range inside a source proxy).
+
+    Returns (x_centers, width, height, fps) or None if the video can't be opened.
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        return None
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+
+    first_frame = min(int(round(start_time * fps)), total_frames) if fps else 0
+    last_frame = total_frames if end_time is None else min(int(round(end_time * fps)), total_frames)
+    # None = read to EOF (the container's frame count can be a little off)
+    final_end = None if end_time is None else last_frame
+    span_frames = max(last_frame - first_frame, 0)
+
+    if workers is None:
+        workers = min(os.cpu_count() or 1, span_frames // min_frames_per_worker)
+    workers = max(1, int(workers))
+    if span_frames < workers * DETECT_EVERY_N_FRAMES:
+        workers = 1
+    if workers > 1 and multiprocessing.current_process().daemon:
+        # Daemonic processes can't have children: scan sequentially
+        workers = 1
+
+    if workers == 1:
+        ranges = [(video_path, first_frame, final_end, detector, batch_size, saliency_fallback)]
+    else:
+        # Range boundaries on sampling multiples; the last range reads to the end
+        step = -(-span_frames // workers)
+        step += -step % DETECT_EVERY_N_FRAMES
+        starts = list(range(first_frame, last_frame, step))
+        ranges = [(video_path, start, start + step, detector, batch_size, saliency_fallback) for start in starts[:-1]]
+        ranges.append((video_path, starts[-1], final_end, detector, batch_size, saliency_fallback))
+        print(f"   -> Scanning {span_frames} frames in {len(ranges)} parallel segments...")
+
+    if len(ranges) == 1:
+        results = [_scan_face_range(ranges[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+            results = list(pool.map(_scan_face_range, ranges))
+
+    # Merge: keep every range at its frame position (pad short reads with NaN)
+    pieces = []
+    for (_, start_frame, end_frame, *_), (_, track) in zip(ranges, results):
+        if end_frame is not None and track.size < end_frame - start_frame:
+            track = np.pad(track, (0, end_frame - start_frame - track.size), constant_values=np.nan)
+        pieces.append(track)
+    raw_track = np.concatenate(pieces) if pieces else np.empty(0)
+    if raw_track.size == 0:
+        raw_track = np.full(1, np.nan)
+
+    # Skipped/missed frames repeat the previous center (or frame center)
+    return fill_forward(raw_track, width / 2), width, height, fps
+
+def plan_reframe(video_path, start_time=0.0, end_time=None, use_face_tracking=True, smoothing_seconds=4, manual_alignment=0.5, **options):
+    """
+    Work out the 9:16 crop for a range of a video (no rendering).
+    options: see plan_variants. Returns the crop dict, or None if the video
+    can't be opened.
+    """
+    crops = plan_variants(video_path, ["9:16"], start_time, end_time, use_face_tracking, smoothing_seconds, manual_alignment, **options)
+    return crops["9:16"] if crops else None
+
+def plan_variants(video_path, aspects, start_time=0.0, end_time=None, use_face_tracking=True, smoothing_seconds=4, manual_alignment=0.5, analysis_workers=None, detector="haar", detector_batch=1, framing=None, saliency_fallback=True, analysis_path=None):
+    """
+    Work out crops for several aspect ratios ("9:16", "1:1", "4:5", ...)
+    of a range of a video from ONE analysis pass: every ratio follows the
+    same tracked centers with its own crop width.
+
+    framing: "face" (track faces), "saliency" (track on-screen activity, no
+             detector) or "fixed" (manual_alignment). None = derive from
+             use_face_tracking.
+    saliency_fallback: in "face" mode, use activity framing on frames where
+                       no face was found instead of holding the last center.
+    detector: face detector backend ("haar", "profile", "dnn"); detector_batch
+              frames are detected per call (useful for "dnn").
+    analysis_workers: processes used for face analysis (None = auto by length/cores).
+    analysis_path: low-res proxy of video_path to analyze instead (same
+                   timeline). Centers are scaled back to video_path's
+                   resolution and frame rate.
+
+    Returns {aspect: render_backend crop dict {"width", "height", "x", "y", "fps"}}
+    (x is a list of per-frame left edges), or None if the video can't be opened.
+    """
+    if framing is None:
+        framing = "face" if use_face_tracking else "fixed"
+
+    props = video_properties(video_path)
+    if props is None:
+        print("Error: Could not open video.")
+        return None
+    width, height, fps, total_frames = props
+
+    # --- FACE DETECTION PHASE ---
+    if framing in ("face", "saliency"):
+        if framing == "face":
+            print(f"Analyzing {video_path} for faces ({detector} detector)...")
         else:
-            smoothed_centers = x_centers if x_centers else [width/2]
-            
-        print(f"✅ Face tracking complete. Rendering...")
+            print(f"Analyzing {video_path} for on-screen activity (saliency)...")
+            detector = None
+        range_end = end_time if end_time is not None else total_frames / fps
+        frame_count = max(int(round((range_end - start_time) * fps)), 1)
+
+        analysis = None
+        if analysis_path and analysis_path != video_path:
+            print(f"   -> Analyzing proxy {os.path.basename(analysis_path)} from {start_time:.1f}s")
+            analysis = analyze_faces(analysis_path, workers=analysis_workers, detector=detector,
+                                     batch_size=detector_batch, saliency_fallback=saliency_fallback,
+                                     start_time=start_time, end_time=range_end)
+        if analysis is None:
+            analysis = analyze_faces(video_path, workers=analysis_workers, detector=detector,
+                                     batch_size=detector_batch, saliency_fallback=saliency_fallback,
+                                     start_time=start_time, end_time=end_time)
+        if analysis is None:
+            print("Error: Could not open video.")
+            return None
+        x_centers, analysis_width, _, analysis_fps = analysis
+        if analysis_width != width or analysis_fps != fps or x_centers.size != frame_count:
+            x_centers = rescale_track(x_centers, analysis_width, width, analysis_fps, fps, frame_count)
 
+        window_size = int(fps * smoothing_seconds)
+        print(f"✅ Tracking complete ({framing}).")
     else:
         print("⚡ Skipping face detection (Fast Mode). Using fixed center crop.")
-        # Load clip metadata just for dimensions
-        with VideoFileClip(video_path) as clip:
-            width, height = clip.size
-            fps = clip.fps 
-        # Initialize smoothed_centers
-        smoothed_centers = [width / 2] * int(fps * clip.duration + 1)
-
-    # --- 2. RENDER PHASE ---
-    clip = VideoFileClip(video_path)
-    
-    # Target 9:16 Ratio
-    target_ratio = 9/16
-    width, height = clip.size
-    new_w = height * target_ratio
-    
-    # Dynamic crop function
-    def get_x1(t):
-        if not use_face_tracking:
-            # Fixed Crop with Manual Alignment
-            # alignment 0.0 = Left, 0.5 = Center, 1.0 = Right
-            min_center = new_w / 2
-            max_center = width - (new_w / 2)
-            center_x = min_center + (manual_alignment * (max_center - min_center))
-            return center_x - (new_w / 2)
-        
-        # Dynamic Crop (Face Tracking)
-        frame_idx = int(t * clip.fps)
-        if frame_idx >= len(smoothed_centers):
-            frame_idx = len(smoothed_centers) - 1
-            
-        center_x = smoothed_centers[frame_idx]
-        x1 = center_x - (new_w / 2)
-        
-        # Clamp
-        if x1 < 0: x1 = 0
-        if x1 + new_w > width: x1 = width - new_w
-        
-        return x1
-
-    # Apply Crop
-    # In MoviePy 2.0+, clip.fx is deprecated or changed. Use vfx.crop(clip, ...)
-    # In MoviePy 2.0+, it is capitalized. vfx.Crop
-    
-    # MoviePy 2.0 has changed .fl to .transform
-    def crop_filter(get_frame, t):
-        frame = get_frame(t)
-        # Determine crop x coordinate
-        try:
-             x1 = int(get_x1(t))
-        except:
-             x1 = 0
-             
-        # Ensure x1 is within bounds
-        if x1 < 0: x1 = 0
-        if x1 + int(new_w) > frame.shape[1]: 
-             x1 = frame.shape[1] - int(new_w)
-             
-        x2 = x1 + int(new_w)
-        # Crop the frame array (numpy slicing: y1:y2, x1:x2)
-        return frame[:, x1:x2]
-
-    # Use .transform in v2
-    # MoviePy will infer the new size from the first frame processed
-    final_clip = clip.transform(crop_filter)
-    
-    # Export
-    final_clip.write_videofile(output_path, codec="libx264", audio_codec="aac", preset="ultrafast", logger=None)
+        x_centers = None
+
+    crops = {}
+    for aspect in aspects:
+        _, target_ratio, _ = parse_aspect(aspect)
+        crop_w = crop_width_for(width, height, target_ratio)
+        crop_h = crop_height_for(width, height, target_ratio)
+        if x_centers is not None:
+            crop_path = compute_crop_path(x_centers, width, crop_w, window_size)
+        else:
+            # Fixed Crop with Manual Alignment: a single offset for every frame
+            crop_path = [fixed_crop_offset(width, crop_w, manual_alignment)]
+        crops[aspect] = {"width": crop_w, "height": crop_h, "x": [int(x) for x in crop_path],
+                         "y": (height - crop_h) // 4 * 2, "fps": fps}
+    return crops
+
+def smart_reframe(video_path, output_path, use_face_tracking=True, smoothing_seconds=4, manual_alignment=0.5, progress=None, start_time=0.0, end_time=None, profile=DEFAULT_PROFILE, aspects=(), **options):
+    """
+    Reframe (a range of) a landscape video to 9:16 in one render.
+    aspects: extra variants ("1:1", "4:5@1080x1350", ...) encoded in the same
+             ffmpeg pass to render_backend.variant_path(output_path, aspect).
+    options: passed to plan_variants (framing, detector, analysis_path, ...).
+    profile: render_backend encoder profile ("draft" / "publish").
+    progress: optional callback(seconds_done, duration) for the render.
+    Returns the render spec (None if the video can't be opened).
+    """
+    crops = plan_variants(video_path, ["9:16"] + [parse_aspect(a)[0] for a in aspects], start_time, end_time,
+                          use_face_tracking, smoothing_seconds, manual_alignment, **options)
+    if crops is None:
+        return None
+    variants = [{"aspect": aspect, "output": variant_path(output_path, aspect), "crop": crops[aspect], "size": size}
+                for aspect, _, size in map(parse_aspect, aspects)]
+    spec = make_spec(video_path, output_path, start=start_time, end=end_time, crop=crops["9:16"], profile=profile,
+                     variants=variants)
+    render(spec, progress)
     print(f"Done! Smart crop saved: {output_path}")
+    return spec
 
 if __name__ == "__main__":
     # Ensure we use the short clip we made earlier
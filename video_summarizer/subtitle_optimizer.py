@@ -1,4 +1,21 @@
 import datetime
+import importlib.util
+
+# Loaded models, kept for the life of the process (a job that subtitles
+# several shorts loads each model once)
+_MODELS = {}
+
+def load_model(backend, model_size):
+    """Cached faster-whisper ("faster") or openai-whisper ("openai") model."""
+    key = (backend, model_size)
+    if key not in _MODELS:
+        if backend == "faster":
+            import faster_whisper
+            _MODELS[key] = faster_whisper.WhisperModel(model_size, device="cpu", compute_type="int8")
+        else:
+            import whisper
+            _MODELS[key] = whisper.load_model(model_size)
+    return _MODELS[key]
 
 def format_timestamp(seconds: float):
     td = datetime.timedelta(seconds=seconds)
@@ -9,12 +26,13 @@ def format_timestamp(seconds: float):
     milliseconds = int(td.microseconds / 1000)
     return f"{hours:02d}:{minutes:02d}:{seconds_:02d},{milliseconds:03d}"
 
-def generate_viral_subtitles(video_path, output_srt_path, words_per_chunk=1, model_size="small"):
+def generate_viral_subtitles(video_path, output_srt_path, words_per_chunk=1, model_size="small", progress=None):
     """
     Generate VIZARD.AI STYLE karaoke subtitles.
     Format: Prev Word + [Highlighted Current Word] + Next Word
     
     model_size: "small" (Fast, uses faster-whisper) or "medium" (Accurate, uses openai-whisper).
+    progress: optional callback(seconds_transcribed, duration).
     """
     print(f"🎙️ Generating VIZARD-STYLE karaoke subtitles ({model_size})...")
     
@@ -26,8 +44,9 @@ def generate_viral_subtitles(video_path, output_srt_path, words_per_chunk=1, mod
         if model_size == "medium":
             raise ImportError("Accurate mode selected -> Use openai-whisper")
 
-        # Check if faster-whisper is installed (Import check strictly)
-        import faster_whisper
+        # Check if faster-whisper is installed (without importing it here)
+        if importlib.util.find_spec("faster_whisper") is None:
+            raise ImportError("faster-whisper not installed")
         print("   🚀 Using FASTER-WHISPER (INT8 Optimized on CPU)...")
         
         # Run on CPU with INT8
@@ -36,11 +55,13 @@ def generate_viral_subtitles(video_path, output_srt_path, words_per_chunk=1, mod
         try:
             # Use selected model size (e.g. 'small', 'large-v2') 
             # Note: 'medium' is handled by fallback block above
-            model = faster_whisper.WhisperModel(model_size, device="cpu", compute_type="int8")
+            model = load_model("faster", model_size)
             segments, info = model.transcribe(video_path, word_timestamps=True, language="hi")
             
-            # Flatten words
+            # Flatten words (segments are decoded lazily, so report as they arrive)
             for segment in segments:
+                if progress:
+                    progress(min(segment.end, info.duration), info.duration)
                 for w in segment.words:
                     all_words.append({
                         "word": w.word.strip(),
@@ -56,10 +77,11 @@ def generate_viral_subtitles(video_path, output_srt_path, words_per_chunk=1, mod
         print("   ⚠️ faster-whisper not found! Falling back to SLOW whisper (openai-whisper)...")
         print("   👉 Run: pip install faster-whisper to speed up by 5x")
         
-        import whisper
         # Use medium model for balance
-        model = whisper.load_model("medium")
+        model = load_model("openai", "medium")
         result = model.transcribe(video_path, language="hi", word_timestamps=True)
+        if progress and result["segments"]:
+            progress(result["segments"][-1]["end"], result["segments"][-1]["end"])
         
         for segment in result["segments"]:
             if "words" in segment and segment["words"]:
@@ -2,7 +2,6 @@
 import os
 import sys
 import datetime
-from moviepy import VideoFileClip
 import whisper
 
 # Paths
@@ -15,6 +14,8 @@ if os.path.exists(FFMPEG_BINARY):
     os.environ["IMAGEIO_FFMPEG_EXE"] = FFMPEG_BINARY
     os.environ["PATH"] += os.pathsep + os.path.dirname(FFMPEG_BINARY)
 
+from render_backend import render, make_spec
+
 def format_timestamp(seconds: float):
     td = datetime.timedelta(seconds=seconds)
     total_seconds = int(td.total_seconds())
@@ -27,8 +28,7 @@ def format_timestamp(seconds: float):
 print("Step 1: Extracting 30-second clip (05:00 - 05:30)...")
 # Extract only the problematic part
 try:
-    clip = VideoFileClip(VIDEO_PATH).subclipped(300, 330) # 5 min to 5:30 min
-    clip.write_videofile(CLIP_PATH, codec="libx264", audio_codec="aac", preset="ultrafast", logger=None)
+    render(make_spec(VIDEO_PATH, CLIP_PATH, 300, 330)) # 5 min to 5:30 min
     print(f"Clip saved: {CLIP_PATH}")
 except Exception as e:
     print(f"Error extracting clip: {e}")
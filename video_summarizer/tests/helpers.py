@@ -0,0 +1,14 @@
+"""Shared fixtures for the tests (synthetic media, no downloads)."""
+import cv2
+import numpy as np
+
+def write_test_video(path, frames=120, width=160, height=90, fps=30):
+    """Small MP4 with a bright square moving left to right."""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    for i in range(frames):
+        frame = np.zeros((height, width, 3), dtype=np.uint8)
+        x = int(i * (width - 20) / max(frames - 1, 1))
+        frame[35:55, x:x + 20] = 255
+        writer.write(frame)
+    writer.release()
+    return path
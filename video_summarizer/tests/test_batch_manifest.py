@@ -0,0 +1,96 @@
+import os
+import shutil
+
+import pytest
+
+import auto_shorts
+from batch_manifest import BatchManifest
+from catalog import Catalog
+from helpers import write_test_video
+
+HASH_A = "a" * 64
+HASH_B = "b" * 64
+
+def new_batch(output_dir, content_hash, folders=("short_00_00", "short_00_10")):
+    slots = [(i * 10.0, i * 10.0 + 5) for i in range(len(folders))]
+    return BatchManifest.create(str(output_dir), "/videos/source.mp4", content_hash, {"count": len(folders)},
+                                slots, [os.path.join(str(output_dir), f) for f in folders])
+
+def crash(manifest):
+    """What the job's process dying does to its claim."""
+    manifest._lock_file.close()
+    manifest._lock_file = None
+
+def test_concurrent_batches_keep_their_own_manifests(tmp_path):
+    first = new_batch(tmp_path, HASH_A)
+    second = new_batch(tmp_path, HASH_A)
+    other_source = new_batch(tmp_path, HASH_B)
+    assert len({first.path, second.path, other_source.path}) == 3
+    assert first.batch_id != second.batch_id
+
+    # Running batches are never offered for resume
+    assert BatchManifest.find(str(tmp_path), HASH_A) is None
+    crash(first)
+    found = BatchManifest.find(str(tmp_path), HASH_A)
+    assert found.batch_id == first.batch_id and found.source == "/videos/source.mp4"
+    assert BatchManifest.find(str(tmp_path), HASH_A, second.batch_id) is None
+
+    # Only one job can claim it
+    assert found.claim()
+    assert not BatchManifest.load(first.path).claim()
+    assert BatchManifest.find(str(tmp_path), HASH_A) is None
+
+def test_finished_batch_manifest_is_removed(tmp_path):
+    manifest = new_batch(tmp_path, HASH_A, folders=("short_00_00",))
+    manifest.mark_slot(0, "done")
+    manifest.close()
+    assert not os.path.exists(manifest.path)
+    assert BatchManifest.for_source(str(tmp_path), HASH_A) == []
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="needs ffmpeg")
+def test_resume_skips_finished_work_and_cleans_partial_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(auto_shorts, "CLIP_DURATION", 3)
+    source = write_test_video(str(tmp_path / "source.mp4"), frames=300)
+
+    planned, rendered = [], []
+    real_plan, real_render = auto_shorts.plan_variants, auto_shorts.render
+
+    def plan_variants(video_path, aspects, start, end, *args, **kwargs):
+        planned.append(start)
+        return real_plan(video_path, aspects, start, end, *args, **kwargs)
+
+    def crashing_render(spec, progress=None):
+        rendered.append(spec["start"])
+        if len(rendered) == 2:
+            # Killed mid-render: a half-written temp file stays behind
+            open(os.path.splitext(spec["output"])[0] + ".rendering.mp4", "w").close()
+            raise RuntimeError("ffmpeg render failed: killed")
+        return real_render(spec, progress)
+
+    monkeypatch.setattr(auto_shorts, "plan_variants", plan_variants)
+    monkeypatch.setattr(auto_shorts, "render", crashing_render)
+    auto_shorts.auto_generate_shorts(source, count=2, use_face_tracking=False, preview_mode=True)
+
+    content_hash = Catalog().get_source(Catalog().register_source(source))["content_hash"]
+    manifest = BatchManifest.find(auto_shorts.OUTPUT_DIR, content_hash)
+    assert manifest is not None and manifest.pending() == [1]
+    assert manifest.stage_done(1, "analyze") is not None and manifest.stage_done(1, "render") is None
+    done_folder, failed_folder = manifest.slots[0]["folder"], manifest.slots[1]["folder"]
+    assert os.path.exists(os.path.join(failed_folder, "final_short.rendering.mp4"))
+    first_planned = list(planned)
+
+    # Resume: slot 0 is skipped, slot 1 reuses its crop plan and only re-renders
+    planned.clear()
+    rendered.clear()
+    monkeypatch.setattr(auto_shorts, "render", lambda spec, progress=None: rendered.append(spec["start"]) or real_render(spec, progress))
+    auto_shorts.auto_generate_shorts(source, count=2, use_face_tracking=False, preview_mode=True, resume=True)
+
+    assert planned == []
+    assert rendered == [manifest.slots[1]["start"]] and len(first_planned) == 2
+    assert not os.path.exists(os.path.join(failed_folder, "final_short.rendering.mp4"))
+    for folder in (done_folder, failed_folder):
+        assert os.path.getsize(os.path.join(folder, "final_short.mp4")) > 0
+    # Finished: nothing left to resume and the manifest is gone
+    assert BatchManifest.for_source(auto_shorts.OUTPUT_DIR, content_hash) == []
+    assert len(Catalog().list_shorts()) == 2
@@ -0,0 +1,23 @@
+import json
+
+import benchmark_detectors
+
+def test_shipped_clips_are_labeled_and_detectable():
+    with open(benchmark_detectors.LABELS_FILE, "r") as f:
+        clips = json.load(f)["clips"]
+    frames = [frame for clip in clips for frame in benchmark_detectors.load_labeled_frames(clip)]
+    assert frames and any(boxes for _, boxes in frames) and any(not boxes for _, boxes in frames)
+    result = benchmark_detectors.benchmark_detector("haar", frames)
+    assert result["recall"] >= 0.9
+
+def test_exits_nonzero_without_clips(tmp_path, monkeypatch):
+    labels = tmp_path / "labels.json"
+    labels.write_text('{"clips": []}')
+    monkeypatch.setattr(benchmark_detectors, "LABELS_FILE", str(labels))
+    assert benchmark_detectors.main(["--detectors", "haar"]) == 1
+
+def test_exits_nonzero_when_no_detector_runs(monkeypatch):
+    def missing_model(name, frames, batch_size=1):
+        raise FileNotFoundError("model not found")
+    monkeypatch.setattr(benchmark_detectors, "benchmark_detector", missing_model)
+    assert benchmark_detectors.main(["--detectors", "dnn"]) == 1
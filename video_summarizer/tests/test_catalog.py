@@ -0,0 +1,97 @@
+import os
+import random
+import shutil
+import threading
+
+import sqlite3
+
+import pytest
+
+import auto_shorts
+import catalog as catalog_module
+from catalog import Catalog
+from helpers import write_test_video
+
+@pytest.fixture
+def catalog(tmp_path):
+    return Catalog(str(tmp_path / "catalog.db"))
+
+@pytest.fixture
+def source_id(catalog, tmp_path):
+    path = tmp_path / "source.mp4"
+    path.write_bytes(b"source video")
+    return catalog.register_source(str(path))
+
+def test_every_connection_is_closed(tmp_path, monkeypatch):
+    opened = []
+    connect = sqlite3.connect
+
+    def tracking_connect(*args, **kwargs):
+        opened.append(connect(*args, **kwargs))
+        return opened[-1]
+    monkeypatch.setattr(catalog_module.sqlite3, "connect", tracking_connect)
+
+    Catalog(str(tmp_path / "catalog.db")).list_shorts()
+    assert len(opened) == 2
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+def test_reservations_block_other_batches(catalog, source_id, tmp_path):
+    a, b, c = (str(tmp_path / name) for name in ("short_a", "short_b", "short_c"))
+    assert catalog.reserve_slots(source_id, "batch-1", [(0, 10, a), (20, 30, b)]) == [(0, 10, a), (20, 30, b)]
+    assert catalog.used_intervals(source_id) == [(0, 10), (20, 30)]
+
+    # Overlapping range or same folder: refused; touching ranges are fine
+    assert catalog.reserve_slots(source_id, "batch-2", [(5, 15, c), (40, 50, a), (10, 20, c)]) == [(10, 20, c)]
+    # The owner itself can re-reserve (resume)
+    assert catalog.reserve_slots(source_id, "batch-1", [(0, 10, a)]) == [(0, 10, a)]
+
+    # A finished short replaces its reservation
+    catalog.add_short(source_id, a, 0, 10)
+    catalog.release_slot(a)
+    assert catalog.used_intervals(source_id) == [(0, 10), (10, 20), (20, 30)]
+    assert catalog.reserve_slots(source_id, "batch-3", [(8, 9, str(tmp_path / "short_d"))]) == []
+
+def test_abandoned_reservations_lapse(catalog, source_id, tmp_path, monkeypatch):
+    catalog.reserve_slots(source_id, "crashed", [(0, 10, str(tmp_path / "short_a"))])
+    monkeypatch.setattr(catalog_module, "RESERVATION_TTL", -1)
+    assert catalog.used_intervals(source_id) == []
+    assert len(catalog.reserve_slots(source_id, "new", [(0, 10, str(tmp_path / "short_a"))])) == 1
+
+def test_concurrent_reservations_never_overlap(catalog, source_id, tmp_path):
+    won = []
+
+    def batch(owner):
+        # Disjoint within a batch (as selected), shifted against the other batches
+        rng = random.Random(owner)
+        offset = rng.choice([0, 3, 5, 7])
+        slots = [(start, start + 10, str(tmp_path / f"short_{start}"))
+                 for start in (s + offset for s in rng.sample(range(0, 200, 10), 6))]
+        won.extend(Catalog(catalog.path).reserve_slots(source_id, owner, slots))
+
+    threads = [threading.Thread(target=batch, args=(f"batch-{n}",)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    won.sort()
+    assert won
+    assert all(prev[1] <= cur[0] for prev, cur in zip(won, won[1:]))
+    assert len({folder for _, _, folder in won}) == len(won)
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="needs ffmpeg")
+def test_batch_avoids_ranges_reserved_by_a_running_batch(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(auto_shorts, "CLIP_DURATION", 2)
+    source = write_test_video(str(tmp_path / "source.mp4"), frames=900)
+    catalog = Catalog()
+    other = catalog.register_source(source)
+    catalog.reserve_slots(other, "running-batch", [(0.0, 6.0, os.path.join(auto_shorts.OUTPUT_DIR, "busy"))])
+
+    auto_shorts.auto_generate_shorts(source, count=2, use_face_tracking=False, preview_mode=True)
+    shorts = catalog.list_shorts()
+    assert len(shorts) == 2
+    assert all(short["start_time"] >= 6.0 for short in shorts)
+    # Finished slots hand their range over to the short; the other batch keeps its own
+    assert catalog.used_intervals(other) == sorted([(0.0, 6.0)] + [(s["start_time"], s["end_time"]) for s in shorts])
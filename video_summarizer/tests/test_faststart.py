@@ -0,0 +1,64 @@
+import os
+import shutil
+import subprocess
+
+import cv2
+import pytest
+
+import faststart
+from faststart import ensure_faststart, moov_placement, top_level_atoms
+from helpers import write_test_video
+
+BUNDLED_QT_FASTSTART = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    "..", "bin", "qt-faststart")
+
+def frame_count(path):
+    cap = cv2.VideoCapture(path)
+    count = 0
+    while cap.grab():
+        count += 1
+    cap.release()
+    return count
+
+@pytest.fixture
+def moov_at_end(tmp_path):
+    """An MP4 written without +faststart (moov after mdat)."""
+    path = str(tmp_path / "late_moov.mp4")
+    if shutil.which("ffmpeg"):
+        source = write_test_video(str(tmp_path / "source.mp4"))
+        subprocess.run(["ffmpeg", "-hide_banner", "-loglevel", "error", "-i", source,
+                        "-c:v", "libx264", "-preset", "ultrafast", "-y", path], check=True)
+    else:
+        write_test_video(path)      # OpenCV's muxer also writes moov last
+    return path
+
+def test_moov_at_end_is_detected(moov_at_end, tmp_path):
+    kinds = [kind for kind, _, _ in top_level_atoms(moov_at_end)]
+    assert kinds.index("mdat") < kinds.index("moov")
+    assert moov_placement(moov_at_end) == "end"
+    assert moov_placement(str(tmp_path / "missing.mp4")) is None
+    (tmp_path / "notes.txt").write_text("not an mp4 at all")
+    assert moov_placement(str(tmp_path / "notes.txt")) is None
+
+@pytest.mark.parametrize("tool", ["qt-faststart", "ffmpeg"])
+def test_ensure_faststart_moves_moov_in_front(moov_at_end, monkeypatch, tool):
+    if tool == "qt-faststart":
+        if not os.path.exists(BUNDLED_QT_FASTSTART):
+            pytest.skip("bundled qt-faststart not found")
+        monkeypatch.setattr(faststart, "QT_FASTSTART", BUNDLED_QT_FASTSTART)
+    else:
+        if shutil.which("ffmpeg") is None:
+            pytest.skip("needs ffmpeg")
+        monkeypatch.setattr(faststart, "QT_FASTSTART", "/nonexistent/qt-faststart")
+    frames = frame_count(moov_at_end)
+
+    assert ensure_faststart(moov_at_end) == "front"
+    kinds = [kind for kind, _, _ in top_level_atoms(moov_at_end)]
+    assert kinds.index("moov") < kinds.index("mdat")
+    assert frame_count(moov_at_end) == frames
+    assert not os.path.exists(os.path.splitext(moov_at_end)[0] + ".faststart.mp4")
+
+    # Already fast-start: left alone
+    mtime = os.stat(moov_at_end).st_mtime_ns
+    assert ensure_faststart(moov_at_end) == "front"
+    assert os.stat(moov_at_end).st_mtime_ns == mtime
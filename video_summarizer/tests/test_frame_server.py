@@ -0,0 +1,51 @@
+import time
+import threading
+
+import frame_server
+from frame_server import FrameServer
+from helpers import write_test_video
+
+def test_concurrent_misses_open_one_decoder(tmp_path, monkeypatch):
+    video = write_test_video(str(tmp_path / "clip.mp4"))
+    opened = []
+
+    class SlowDecoder(frame_server._Decoder):
+        def __init__(self, video_path):
+            opened.append(video_path)
+            time.sleep(0.2)         # widen the race window
+            super().__init__(video_path)
+
+    monkeypatch.setattr(frame_server, "_Decoder", SlowDecoder)
+    server = FrameServer()
+    frames = []
+    threads = [threading.Thread(target=lambda k=k: frames.append(server.frame_at(video, k * 0.1))) for k in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    server.close()
+    assert opened == [video]
+    assert len(frames) == 8 and all(frame is not None for frame in frames)
+
+def test_keyframe_index_is_built_off_the_request_path(tmp_path, monkeypatch):
+    video = write_test_video(str(tmp_path / "clip.mp4"))
+    release = threading.Event()
+
+    def slow_keyframe_times(video_path):
+        release.wait(10)
+        return [0.0, 2.0]
+
+    monkeypatch.setattr(frame_server, "keyframe_times", slow_keyframe_times)
+    server = FrameServer()
+    try:
+        frame = server.frame_at(video, 1.0)     # served while ffprobe is still "running"
+        assert frame is not None and frame.shape[1] == 160
+        decoder = server._decoder(video)
+        assert decoder.keyframes == []
+        release.set()
+        decoder.indexer.join(5)
+        assert decoder.keyframes == [0.0, 2.0]
+        assert server.frame_at(video, 3.0) is not None
+    finally:
+        release.set()
+        server.close()
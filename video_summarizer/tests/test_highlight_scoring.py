@@ -0,0 +1,59 @@
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from highlight_scoring import select_top_windows
+
+def brute_force(scores, window, k, blocked=None):
+    """Best total over every set of non-overlapping windows of the largest feasible count <= k."""
+    n = len(scores)
+    starts = [s for s in range(n - window + 1) if blocked is None or not blocked[s:s + window].any()]
+    for count in range(min(k, n // window), 0, -1):
+        totals = [sum(scores[s:s + window].sum() for s in combo)
+                  for combo in itertools.combinations(starts, count)
+                  if all(b - a >= window for a, b in zip(combo, combo[1:]))]
+        if totals:
+            return count, max(totals)
+    return 0, 0.0
+
+def check(scores, window, k, blocked=None):
+    starts = select_top_windows(scores, window, k, blocked)
+    assert starts == sorted(starts)
+    assert all(b - a >= window for a, b in zip(starts, starts[1:]))          # touching is fine
+    assert all(0 <= s <= len(scores) - window for s in starts)
+    if blocked is not None:
+        assert not any(blocked[s:s + window].any() for s in starts)
+    count, total = brute_force(scores, window, k, blocked)
+    assert len(starts) == count
+    assert sum(scores[s:s + window].sum() for s in starts) == pytest.approx(total)
+    return starts
+
+@pytest.mark.parametrize("seed", range(40))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    n, window, k = rng.randint(4, 14), rng.randint(1, 4), rng.randint(1, 4)
+    scores = np.array([rng.uniform(-1, 3) for _ in range(n)])
+    blocked = None
+    if seed % 2:
+        blocked = np.array([rng.random() < 0.2 for _ in range(n)])
+    check(scores, window, k, blocked)
+
+def test_adjacent_peaks_are_both_taken():
+    scores = np.array([0, 0, 5, 5, 5, 5, 0, 0], dtype=float)
+    assert check(scores, 2, 2) == [2, 4]
+
+def test_fewer_windows_fit_than_requested():
+    scores = np.arange(7, dtype=float)
+    assert check(scores, 3, 5) == [1, 4]        # only two 3 s windows fit in 7 s
+    assert select_top_windows(scores, 8, 1) == []
+    assert select_top_windows(scores, 3, 0) == []
+
+def test_blocked_seconds_limit_the_count():
+    scores = np.ones(10)
+    blocked = np.zeros(10, dtype=bool)
+    blocked[3] = blocked[7] = True
+    # Free runs: 0-2, 4-6, 8-9 -> only two 3 s windows fit
+    assert check(scores, 3, 3, blocked) == [0, 4]
+    assert select_top_windows(scores, 3, 3, np.ones(10, dtype=bool)) == []
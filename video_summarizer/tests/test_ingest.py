@@ -0,0 +1,87 @@
+import io
+import os
+import time
+import threading
+import functools
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+
+import pytest
+
+import ingest
+from catalog import Catalog
+from helpers import write_test_video
+from ingest import fetch_url_info, cached_download, UrlDownloader
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def http_video(tmp_path):
+    """A small mp4 served over HTTP from a local thread -> (url, local path)."""
+    served = tmp_path / "served"
+    served.mkdir()
+    video = write_test_video(str(served / "clip.mp4"))
+    server = HTTPServer(("127.0.0.1", 0), functools.partial(QuietHandler, directory=str(served)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/clip.mp4", video
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def wait_for(downloader, key, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = downloader.status(key)
+        if job["state"] != "running":
+            return job
+        time.sleep(0.1)
+    raise TimeoutError("download did not finish")
+
+def test_url_download_runs_in_background_and_is_cached(http_video, tmp_path):
+    url, video = http_video
+    info = fetch_url_info(url)
+    assert info["id"] and info["extractor"]
+
+    downloader = UrlDownloader(download_dir=str(tmp_path / "downloads"))
+    key = downloader.start(info)
+    job = wait_for(downloader, key)
+    assert job["state"] == "done", job["error"]
+    assert job["progress"] == 1.0
+    with open(job["path"], "rb") as got, open(video, "rb") as want:
+        assert got.read() == want.read()
+    assert cached_download(info, download_dir=downloader.download_dir) == job["path"]
+
+    # A new downloader (e.g. after a restart) reuses the cached file
+    again = UrlDownloader(download_dir=downloader.download_dir)
+    assert again.status(again.start(info))["state"] == "done"
+
+def test_url_download_error_is_reported(http_video, tmp_path):
+    url, _ = http_video
+    info = {**fetch_url_info(url), "url": url.replace("clip.mp4", "missing.mp4")}
+    downloader = UrlDownloader(download_dir=str(tmp_path / "downloads"))
+    job = wait_for(downloader, downloader.start(info))
+    assert job["state"] == "error" and job["error"]
+    assert cached_download(info, download_dir=downloader.download_dir) is None
+
+def test_upload_is_hashed_before_anything_is_written(tmp_path, monkeypatch):
+    catalog = Catalog(str(tmp_path / "catalog.db"))
+    store = tmp_path / "uploads"
+    store.mkdir()
+    data = os.urandom(3 * 1024 + 1)
+    monkeypatch.setattr(ingest, "CHUNK_SIZE", 1024)
+
+    path, content_hash, is_new = ingest.ingest_upload(io.BytesIO(data), "my clip.mp4", catalog, str(store))
+    assert is_new and os.path.basename(path) == f"uploaded_{content_hash[:12]}_my_clip.mp4"
+    with open(path, "rb") as f:
+        assert f.read() == data
+
+    # Same content again: the stored copy is reused and no temp file is created
+    def no_temp_files(*args, **kwargs):
+        raise AssertionError("duplicate upload was written to disk")
+    monkeypatch.setattr(ingest.tempfile, "mkstemp", no_temp_files)
+    upload = io.BytesIO(data)
+    assert ingest.ingest_upload(upload, "copy.mp4", catalog, str(store)) == (path, content_hash, False)
+    assert os.listdir(store) == [os.path.basename(path)]
+    upload.write(b"x")      # the hash didn't leave the buffer locked
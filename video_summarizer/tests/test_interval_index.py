@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from interval_index import IntervalIndex
+
+def brute_overlaps(intervals, start, end):
+    return any(s < end and start < e for s, e in intervals)
+
+def brute_union(intervals):
+    merged = []
+    for s, e in sorted(intervals):
+        if merged and s <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], e)
+        else:
+            merged.append([s, e])
+    return [tuple(m) for m in merged]
+
+def brute_gaps(intervals, lo, hi):
+    gaps, cursor = [], lo
+    for s, e in brute_union(intervals):
+        if e <= lo or s >= hi:
+            continue
+        if s > cursor:
+            gaps.append((cursor, s))
+        cursor = max(cursor, e)
+    if cursor < hi:
+        gaps.append((cursor, hi))
+    return gaps
+
+def test_touching_and_overlapping_ranges_merge():
+    index = IntervalIndex([(20, 30), (0, 10)])
+    index.add(10, 20)           # touches both neighbours
+    assert list(index) == [(0, 30)]
+    index.add(40, 50)
+    index.add(45, 60)
+    index.add(35, 36)
+    assert list(index) == [(0, 30), (35, 36), (40, 60)]
+
+def test_adjacent_ranges_do_not_overlap():
+    index = IntervalIndex([(10, 20)])
+    assert not index.overlaps(0, 10)
+    assert not index.overlaps(20, 30)
+    assert index.overlaps(19.99, 30)
+    assert index.overlaps(0, 10.01)
+    assert index.overlaps(12, 13)
+    assert index.overlaps(0, 100)
+
+def test_free_gaps_clip_to_bounds():
+    index = IntervalIndex([(10, 20), (30, 40)])
+    assert index.free_gaps(0, 50) == [(0, 10), (20, 30), (40, 50)]
+    assert index.free_gaps(15, 35) == [(20, 30)]
+    assert index.free_gaps(10, 20) == []
+    assert index.free_gaps(20, 30) == [(20, 30)]
+
+def test_range_that_exactly_fills_a_gap():
+    index = IntervalIndex([(0, 10), (20, 30)])
+    assert index.pick_free_slots(0, 30, 10, 3, rng=random.Random(1)) == [10]
+    assert list(index) == [(0, 30)]
+    assert index.pick_free_slots(0, 30, 1, 1) == []
+
+def test_gaps_that_exactly_fit_are_all_picked():
+    # Two gaps of exactly one clip length each (zero start-position weight)
+    index = IntervalIndex([(10, 20)])
+    assert sorted(index.pick_free_slots(0, 30, 10, 3, rng=random.Random(3))) == [0, 20]
+    assert list(index) == [(0, 30)]
+
+@pytest.mark.parametrize("seed", range(25))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    intervals = []
+    for _ in range(rng.randint(0, 30)):
+        start = rng.uniform(0, 1000)
+        intervals.append((start, start + rng.choice([0.5, 5, 20, 60])))
+    index = IntervalIndex(intervals)
+    assert list(index) == brute_union(intervals)
+
+    for _ in range(200):
+        start = rng.uniform(-10, 1010)
+        end = start + rng.uniform(0.01, 80)
+        assert index.overlaps(start, end) == brute_overlaps(intervals, start, end)
+
+    lo, hi = sorted(rng.uniform(0, 1000) for _ in range(2))
+    assert index.free_gaps(lo, hi) == pytest.approx(brute_gaps(intervals, lo, hi))
+
+    length, count = rng.choice([10, 30, 60]), rng.randint(1, 20)
+    picked = index.pick_free_slots(lo, hi, length, count, rng=rng)
+    clips = sorted((s, s + length) for s in picked)
+    assert len(picked) <= count
+    assert all(lo <= s and e <= hi + 1e-9 for s, e in clips)
+    assert not any(brute_overlaps(intervals, s, e) for s, e in clips)
+    assert all(prev[1] <= cur[0] + 1e-9 for prev, cur in zip(clips, clips[1:]))
+    if len(picked) < count:
+        # Stopped early only because nothing else fits
+        assert all(b - a < length for a, b in brute_gaps(intervals + clips, lo, hi))
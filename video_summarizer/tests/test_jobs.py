@@ -0,0 +1,71 @@
+import multiprocessing
+import os
+
+import pytest
+
+from helpers import write_test_video
+from jobs import LocalJob
+
+def parallel_analysis_job(report, video_path):
+    """Job body: face/saliency analysis split over 2 worker processes."""
+    from smart_crop import analyze_faces
+    x_centers, width, _, _ = analyze_faces(video_path, workers=2, min_frames_per_worker=10, detector=None)
+    return multiprocessing.current_process().daemon, len(x_centers), width
+
+def run_job(job):
+    try:
+        while True:
+            event = job.poll(5.0)
+            if event is not None and event[0] != "progress":
+                return event
+    finally:
+        job.close()
+
+def test_local_job_can_run_parallel_analysis(tmp_path):
+    video = write_test_video(str(tmp_path / "clip.mp4"))
+    job = LocalJob(multiprocessing.get_context("spawn"), parallel_analysis_job, (video,))
+    kind, payload = run_job(job)
+    assert kind == "result", payload
+    daemon, frames, width = payload
+    assert daemon is False
+    assert frames == 120 and width == 160
+    assert not job.process.is_alive()
+
+def _daemonic_analysis(video_path, results):
+    from smart_crop import analyze_faces
+    results.put(len(analyze_faces(video_path, workers=2, min_frames_per_worker=10, detector=None)[0]))
+
+def test_analyze_faces_falls_back_to_sequential_in_daemonic_process(tmp_path):
+    video = write_test_video(str(tmp_path / "clip.mp4"))
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_daemonic_analysis, args=(video, results), daemon=True)
+    process.start()
+    assert results.get(timeout=60) == 120
+    process.join()
+
+def test_failed_regenerate_leaves_catalog_untouched(tmp_path, monkeypatch):
+    import auto_shorts
+    import smart_crop
+    from catalog import Catalog
+    from jobs import regenerate_clip_job
+
+    monkeypatch.chdir(tmp_path)
+    source = write_test_video(str(tmp_path / "source.mp4"))
+    short_dir = str(tmp_path / "short_1")
+    os.makedirs(short_dir)
+    video_path = write_test_video(os.path.join(short_dir, "final_short.mp4"))
+    catalog = Catalog()
+    catalog.add_short(catalog.register_source(source), short_dir, 0, 2,
+                      params={'face_tracking': False, 'manual_alignment': 0.5, 'profile': "draft"})
+    before = catalog.get_short(short_dir)
+
+    def broken_render(*args, **kwargs):
+        raise RuntimeError("ffmpeg render failed: boom")
+    monkeypatch.setattr(auto_shorts, "get_video_duration", lambda path: 4.0)
+    monkeypatch.setattr(smart_crop, "smart_reframe", broken_render)
+
+    with pytest.raises(RuntimeError):
+        regenerate_clip_job(lambda *args: None, short_dir, video_path, source, 1, 3, use_face=True, manual_align=0.2)
+    after = catalog.get_short(short_dir)
+    assert (after["params"], after["start_time"], after["end_time"]) == (before["params"], 0, 2)
@@ -0,0 +1,67 @@
+import json
+import shutil
+import subprocess
+
+import cv2
+import numpy as np
+import pytest
+
+from render_backend import make_spec, render, variant_path
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+                                reason="needs ffmpeg and ffprobe")
+
+def write_gradient_video(path, frames, fps, width=320, height=96):
+    """Horizontal gray ramp: a pixel's value tells which source column it came from."""
+    row = np.repeat((np.arange(width) * 255 // (width - 1)).astype(np.uint8)[None, :], height, 0)
+    image = cv2.merge([row, row, row])
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    for _ in range(frames):
+        writer.write(image)
+    writer.release()
+    return path
+
+def probe_stream(path):
+    cmd = ["ffprobe", "-v", "error", "-select_streams", "v:0",
+           "-show_entries", "stream=r_frame_rate,nb_frames", "-of", "json", path]
+    return json.loads(subprocess.run(cmd, capture_output=True, text=True).stdout)["streams"][0]
+
+def center_values(path):
+    cap = cv2.VideoCapture(path)
+    values = []
+    while True:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        values.append(int(frame[frame.shape[0] // 2, frame.shape[1] // 2, 0]))
+    cap.release()
+    return values
+
+@pytest.mark.parametrize("fps", [30, 60])
+def test_moving_crop_keeps_source_rate_and_frames(tmp_path, fps):
+    frames = 4 * fps
+    source = write_gradient_video(str(tmp_path / "source.mp4"), frames, fps)
+    path = [0] * fps + [100] * fps + [200] * (frames - 2 * fps)
+    output = str(tmp_path / "short.mp4")
+    variant = variant_path(output, "1:1")
+    render(make_spec(source, output, crop={"width": 64, "height": 96, "x": path, "fps": fps}, profile="draft",
+                     variants=[{"aspect": "1:1", "output": variant, "size": None,
+                                "crop": {"width": 96, "height": 96, "x": path, "fps": fps}}]))
+
+    expected = probe_stream(source)
+    assert expected == {"r_frame_rate": f"{fps}/1", "nb_frames": str(frames)}
+    assert probe_stream(output) == expected
+    assert probe_stream(variant) == expected
+
+    # The crop moves on the frame the path says it does
+    values = center_values(output)
+    assert len(values) == frames
+    assert values[fps - 1] < values[fps] < values[2 * fps]
+    assert values[fps] == values[2 * fps - 1]
+
+def test_moving_crop_range_keeps_source_rate(tmp_path):
+    source = write_gradient_video(str(tmp_path / "source.mp4"), 120, 30)
+    output = str(tmp_path / "short.mp4")
+    render(make_spec(source, output, start=0.5, end=3.5, profile="draft",
+                     crop={"width": 64, "height": 96, "x": [i % 200 for i in range(90)], "fps": 30}))
+    assert probe_stream(output) == {"r_frame_rate": "30/1", "nb_frames": "90"}
@@ -0,0 +1,29 @@
+import os
+
+from catalog import Catalog
+from helpers import write_test_video
+from shorts_index import ShortsIndex
+
+def test_snapshot_sees_files_added_inside_a_short_folder(tmp_path):
+    catalog = Catalog(str(tmp_path / "catalog.db"))
+    output_dir = tmp_path / "generated_shorts"
+    folder = output_dir / "short_1"
+    folder.mkdir(parents=True)
+    source_id = catalog.register_source(write_test_video(str(tmp_path / "source.mp4")))
+    final = folder / "short.mp4"
+    final.write_bytes(b"x" * 100)
+    catalog.add_short(source_id, str(folder), 0.0, 10.0, artifacts={"final": str(final)})
+
+    index = ShortsIndex(catalog, str(output_dir))
+    short = index.snapshot()["shorts"][0]
+    assert set(short["files"]) == {"short.mp4"}
+    assert index.snapshot() is index.snapshot()      # cached while nothing changes
+
+    # Subtitles written into the folder: neither the catalog nor the output dir changes
+    output_mtime = os.stat(output_dir).st_mtime_ns
+    (folder / "short.srt").write_text("1\n00:00:00,000 --> 00:00:01,000\nhi\n")
+    os.utime(folder, ns=(output_mtime + 10**9, output_mtime + 10**9))    # coarse-mtime filesystems
+    assert os.stat(output_dir).st_mtime_ns == output_mtime
+    short = index.snapshot()["shorts"][0]
+    assert set(short["files"]) == {"short.mp4", "short.srt"}
+    assert short["disk_size"] > 100
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from smart_crop import fill_forward, smooth_track, compute_crop_path
+
+def loop_fill(detections, default):
+    """The original per-frame loop: previous center, or `default` before the first detection."""
+    centers = []
+    for value in detections:
+        if not np.isnan(value):
+            centers.append(value)
+        else:
+            centers.append(centers[-1] if centers else default)
+    return np.array(centers)
+
+def loop_crop_path(centers, frame_width, crop_width, window_size):
+    """The original smoothing (mode='same') + per-frame clamp."""
+    smoothed = np.convolve(centers, np.ones(window_size) / window_size, mode="same")
+    path = []
+    for center_x in smoothed:
+        x1 = center_x - crop_width / 2
+        x1 = min(max(x1, 0), frame_width - crop_width)
+        path.append(x1)
+    return np.array(path)
+
+def random_detections(rng, n, width, missing=0.3):
+    values = rng.uniform(0, width, n)
+    values[rng.random(n) < missing] = np.nan
+    return values
+
+def test_fill_forward_leading_and_trailing_gaps():
+    nan = np.nan
+    assert fill_forward([nan, nan, 10, nan, 30, nan, nan], 99).tolist() == [99, 99, 10, 10, 30, 30, 30]
+    assert fill_forward([nan, nan], 5).tolist() == [5, 5]
+    assert fill_forward([], 5).size == 0
+
+@pytest.mark.parametrize("seed", range(10))
+def test_fill_forward_matches_the_loop(seed):
+    rng = np.random.default_rng(seed)
+    detections = random_detections(rng, 500, 1920, missing=rng.uniform(0, 0.9))
+    detections[:rng.integers(0, 30)] = np.nan          # leading frames without a face
+    np.testing.assert_array_equal(fill_forward(detections, 960.0), loop_fill(detections, 960.0))
+
+def test_smooth_track_pads_with_edge_values():
+    track = np.full(50, 700.0)
+    np.testing.assert_allclose(smooth_track(track, 10), track)      # mode='same' would sag toward 0 at both ends
+
+    ramp = np.arange(20, dtype=float)
+    smoothed = smooth_track(ramp, 5)
+    assert smoothed[0] == pytest.approx((0 + 0 + 0 + 1 + 2) / 5)
+    assert smoothed[-1] == pytest.approx((17 + 18 + 19 + 19 + 19) / 5)
+
+def test_smooth_track_window_limits():
+    track = np.array([0.0, 10.0, 20.0])
+    np.testing.assert_array_equal(smooth_track(track, 1), track)
+    np.testing.assert_allclose(smooth_track(track, 50), smooth_track(track, 3))   # window capped at the track length
+    assert smooth_track([], 5).size == 0
+
+@pytest.mark.parametrize("window", [4, 7, 30])
+def test_interior_matches_the_old_convolution(window):
+    rng = np.random.default_rng(window)
+    centers = loop_fill(random_detections(rng, 400, 1920), 960.0)
+    new = smooth_track(centers, window)
+    old = np.convolve(centers, np.ones(window) / window, mode="same")
+    interior = slice(window, centers.size - window)
+    np.testing.assert_allclose(new[interior], old[interior])
+
+@pytest.mark.parametrize("seed", range(5))
+def test_crop_path_is_clamped_and_matches_the_loop(seed):
+    rng = np.random.default_rng(seed)
+    width, crop_width, window = 1920, 608, 24
+    # Faces hugging both frame edges push the crop against its limits
+    detections = random_detections(rng, 600, width)
+    detections[100:200] = 5.0
+    detections[300:400] = width - 5.0
+    centers = fill_forward(detections, width / 2)
+
+    path = compute_crop_path(centers, width, crop_width, window)
+    assert path.dtype == np.int32 and path.size == centers.size
+    assert path.min() >= 0 and path.max() <= width - crop_width
+    assert (path[120:180] == 0).all() and (path[320:380] == width - crop_width).all()
+
+    old = loop_crop_path(centers, width, crop_width, window)
+    interior = slice(window, centers.size - window)
+    # The loop truncated with int(); the vectorized path rounds
+    assert np.abs(path[interior] - old[interior]).max() <= 1
@@ -0,0 +1,57 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+
+import thumbnails
+from helpers import write_test_video
+from thumbnails import PosterMaker, cached_poster, poster_for, poster_path_for
+
+@pytest.fixture(autouse=True)
+def poster_dir(tmp_path, monkeypatch):
+    path = tmp_path / "poster_cache"
+    monkeypatch.setattr(thumbnails, "POSTER_DIR", str(path))
+    return path
+
+def test_failed_poster_is_remembered_until_the_video_changes(tmp_path, monkeypatch):
+    video = tmp_path / "short.mp4"
+    video.write_bytes(b"not a video")
+    runs = []
+    real_run = subprocess.run
+
+    def counting_run(cmd, **kwargs):
+        runs.append(cmd)
+        return real_run(["false"], **kwargs)
+
+    monkeypatch.setattr(thumbnails.subprocess, "run", counting_run)
+    assert poster_for(str(video)) is None
+    assert cached_poster(str(video)) is False
+    tried = len(runs)
+    assert poster_for(str(video)) is None and len(runs) == tried      # not retried
+
+    # A newer video clears the failure
+    marker = poster_path_for(str(video)) + ".failed"
+    os.utime(video, (os.path.getmtime(marker) + 5,) * 2)
+    assert cached_poster(str(video)) is None
+    assert sorted(os.listdir(tmp_path)) == ["poster_cache", "short.mp4"]
+
+def test_missing_ffmpeg_counts_as_a_failure(tmp_path, monkeypatch):
+    video = tmp_path / "short.mp4"
+    video.write_bytes(b"")
+    monkeypatch.setattr(thumbnails, "FFMPEG_CMD", str(tmp_path / "no-ffmpeg"))
+    assert poster_for(str(video)) is None
+    assert cached_poster(str(video)) is False
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="needs ffmpeg")
+def test_poster_maker_makes_posters_in_the_background(tmp_path, poster_dir):
+    short_dir = tmp_path / "short_1"
+    short_dir.mkdir()
+    video = write_test_video(str(short_dir / "short.mp4"), frames=60)
+    maker = PosterMaker()
+    assert maker.request(video) is None                 # queued, render isn't blocked
+    maker.wait()
+    poster = maker.request(video)
+    assert poster == poster_path_for(video) and os.path.getsize(poster) > 0
+    assert os.path.dirname(poster) == str(poster_dir)
+    assert os.listdir(short_dir) == ["short.mp4"]       # nothing added to the short's size
@@ -0,0 +1,73 @@
+import os
+import threading
+import multiprocessing
+
+from helpers import write_test_video
+from test_jobs import parallel_analysis_job
+import worker
+
+def test_worker_job_can_run_parallel_analysis(tmp_path):
+    video = write_test_video(str(tmp_path / "clip.mp4"))
+    server_end, client_end = multiprocessing.Pipe()
+    context = multiprocessing.get_context("forkserver")
+    thread = threading.Thread(target=worker._serve_job,
+                              args=(context, server_end, os.getcwd(), parallel_analysis_job, (video,), {}))
+    thread.start()
+    try:
+        assert client_end.recv()[0] == "started"
+        while True:
+            assert client_end.poll(60), "worker job timed out"
+            event = client_end.recv()
+            if event[0] != "progress":
+                break
+    finally:
+        thread.join(60)
+    kind, payload = event
+    assert kind == "result", payload
+    daemon, frames, width = payload
+    assert daemon is False
+    assert frames == 120 and width == 160
+
+def _use_runtime_dir(monkeypatch, path):
+    monkeypatch.setattr(worker, "RUNTIME_DIR", path)
+    monkeypatch.setattr(worker, "SOCKET_PATH", os.path.join(path, "worker.sock"))
+    monkeypatch.setattr(worker, "LOCK_PATH", os.path.join(path, "worker.lock"))
+    monkeypatch.setattr(worker, "AUTHKEY_PATH", os.path.join(path, "authkey"))
+
+def test_authkey_is_random_private_and_stable(tmp_path, monkeypatch):
+    _use_runtime_dir(monkeypatch, str(tmp_path / "rt"))
+    key = worker.authkey()
+    assert len(key) == worker.AUTHKEY_BYTES
+    assert worker.authkey() == key
+    assert os.stat(worker.RUNTIME_DIR).st_mode & 0o777 == 0o700
+    assert os.stat(worker.AUTHKEY_PATH).st_mode & 0o777 == 0o600
+
+def test_daemon_socket_is_private_and_needs_the_key(tmp_path, monkeypatch):
+    import sys
+    import time
+    import subprocess
+    from multiprocessing.connection import Client
+    from multiprocessing import AuthenticationError
+
+    runtime = str(tmp_path / "rt")
+    _use_runtime_dir(monkeypatch, runtime)
+    code = ("import worker, os; r = %r; worker.RUNTIME_DIR = r; "
+            "worker.SOCKET_PATH = os.path.join(r, 'worker.sock'); worker.LOCK_PATH = os.path.join(r, 'worker.lock'); "
+            "worker.AUTHKEY_PATH = os.path.join(r, 'authkey'); worker.serve()") % runtime
+    daemon = subprocess.Popen([sys.executable, "-c", code], cwd=os.path.dirname(worker.__file__))
+    try:
+        deadline = time.time() + 30
+        while worker.ping() is None:
+            assert time.time() < deadline, "daemon did not start"
+            time.sleep(0.2)
+        assert worker.ping() == daemon.pid
+        assert os.stat(worker.SOCKET_PATH).st_mode & 0o777 == 0o600
+        try:
+            Client(worker.SOCKET_PATH, family="AF_UNIX", authkey=b"video_summarizer-worker")
+        except AuthenticationError:
+            pass
+        else:
+            raise AssertionError("connected with the old hard-coded key")
+    finally:
+        worker.stop()
+        daemon.wait(30)
@@ -0,0 +1,215 @@
+"""
+Thumbnails
+Poster frames for the shorts gallery, cached under POSTER_DIR (outside the
+shorts' folders, so they never count toward a short's disk size), and
+filmstrip sprite sheets for source videos (one low-res tile every
+SPRITE_INTERVAL seconds, made in a single ffmpeg pass) so timeline
+scrubbing and crop previews never have to seek the source.
+Everything is rebuilt only when its video is newer than the cache (mtime).
+Posters are made by PosterMaker's background thread, never while the gallery
+renders; a failed poster leaves a ".failed" marker so it isn't retried until
+the video changes.
+"""
+import os
+import json
+import glob
+import queue
+import shutil
+import hashlib
+import threading
+import subprocess
+from functools import lru_cache
+
+from progress_events import run_ffmpeg
+
+FFMPEG_CMD = "ffmpeg"
+POSTER_WIDTH = 360          # Gallery cards are ~1/3 of the page wide
+POSTER_AT_SECONDS = 1.0     # Skip the (often black) very first frame
+
+SPRITE_DIR = ".thumb_cache"
+SPRITE_INTERVAL = 2.0       # Seconds between filmstrip tiles
+SPRITE_TILE_WIDTH = 240
+SPRITE_COLS = 10
+SPRITE_ROWS = 10            # 100 tiles per sheet
+
+POSTER_DIR = os.path.join(SPRITE_DIR, "posters")
+
+def _is_fresh(cached_path, source_path):
+    return os.path.exists(cached_path) and os.path.getmtime(cached_path) >= os.path.getmtime(source_path)
+
+def poster_path_for(video_path):
+    key = hashlib.sha1(os.path.abspath(video_path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(POSTER_DIR, key + ".jpg")
+
+def cached_poster(video_path):
+    """
+    Disk cache only (never runs ffmpeg): the up-to-date poster path, False if
+    making one failed for this version of the video, None if not made yet.
+    """
+    poster = poster_path_for(video_path)
+    if _is_fresh(poster, video_path):
+        return poster
+    if _is_fresh(poster + ".failed", video_path):
+        return False
+    return None
+
+def poster_for(video_path, at=POSTER_AT_SECONDS, width=POSTER_WIDTH):
+    """Path of a cached JPEG poster for a video (created on first use), or None."""
+    poster = cached_poster(video_path)
+    if poster is not None:
+        return poster or None
+    poster = poster_path_for(video_path)
+    os.makedirs(os.path.dirname(poster), exist_ok=True)
+
+    temp_poster = poster + ".tmp.jpg"
+    cmd = [
+        FFMPEG_CMD, "-hide_banner", "-loglevel", "error",
+        "-ss", str(at), "-i", video_path,
+        "-frames:v", "1", "-vf", f"scale={width}:-2", "-q:v", "4",
+        "-y", temp_poster
+    ]
+    try:
+        ok = subprocess.run(cmd, capture_output=True).returncode == 0 and os.path.exists(temp_poster)
+    except OSError:
+        ok = False
+    if not ok:
+        # Clip shorter than `at`: fall back to the first frame
+        if at > 0:
+            return poster_for(video_path, at=0, width=width)
+        # Remembered until the video is replaced (its mtime moves past the marker)
+        open(poster + ".failed", "w").close()
+        return None
+    os.replace(temp_poster, poster)
+    if os.path.exists(poster + ".failed"):
+        os.remove(poster + ".failed")
+    return poster
+
+class PosterMaker:
+    """
+    Makes missing posters in one background thread so the gallery never waits
+    on ffmpeg. request() is safe to call on every rerun.
+    """
+
+    def __init__(self):
+        self._pending = set()
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def request(self, video_path):
+        """The cached poster path, or None (queued for the background thread, or failed)."""
+        poster = cached_poster(video_path)
+        if poster is not None:
+            return poster or None
+        with self._lock:
+            if video_path in self._pending:
+                return None
+            self._pending.add(video_path)
+        self._queue.put(video_path)
+        return None
+
+    def wait(self):
+        """Block until every requested poster is done (tests/CLI)."""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            video_path = self._queue.get()
+            try:
+                poster_for(video_path)
+            except OSError:
+                pass        # video deleted meanwhile
+            finally:
+                with self._lock:
+                    self._pending.discard(video_path)
+                self._queue.task_done()
+
+# --- Filmstrip sprites (source videos) ---
+
+def filmstrip_dir_for(video_path):
+    key = hashlib.sha1(os.path.abspath(video_path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(SPRITE_DIR, key)
+
+def filmstrip_info(video_path):
+    """Metadata of an up-to-date filmstrip for this video, or None."""
+    meta_file = os.path.join(filmstrip_dir_for(video_path), "filmstrip.json")
+    if not os.path.exists(video_path) or not _is_fresh(meta_file, video_path):
+        return None
+    with open(meta_file, "r") as f:
+        return json.load(f)
+
+def build_filmstrip(video_path, interval=SPRITE_INTERVAL, duration=None, progress=None, decode_path=None):
+    """
+    Decode the video once and write sprite sheets of SPRITE_COLS x SPRITE_ROWS
+    tiles (one tile every `interval` seconds). Returns the metadata dict.
+    decode_path: read frames from here instead (e.g. the source's proxy);
+                 the cache still belongs to video_path.
+    progress: optional callback(seconds_done, duration).
+    """
+    import cv2
+
+    decode_path = decode_path or video_path
+
+    if duration is None:
+        cap = cv2.VideoCapture(decode_path)
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        duration = cap.get(cv2.CAP_PROP_FRAME_COUNT) / fps if fps else None
+        cap.release()
+
+    out_dir = filmstrip_dir_for(video_path)
+    temp_dir = out_dir + ".building"
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    os.makedirs(temp_dir)
+
+    cmd = [
+        FFMPEG_CMD, "-hide_banner", "-loglevel", "error",
+        "-i", decode_path, "-an",
+        "-vf", f"fps=1/{interval},scale={SPRITE_TILE_WIDTH}:-2,tile={SPRITE_COLS}x{SPRITE_ROWS}",
+        "-q:v", "5", "-y", os.path.join(temp_dir, "sheet_%04d.jpg")
+    ]
+    result = run_ffmpeg(cmd, duration, progress)
+    sheets = sorted(os.path.basename(p) for p in glob.glob(os.path.join(temp_dir, "sheet_*.jpg")))
+    if result.returncode != 0 or not sheets:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise RuntimeError(f"ffmpeg filmstrip failed: {result.stderr[-300:]}")
+
+    first = cv2.imread(os.path.join(temp_dir, sheets[0]))
+    per_sheet = SPRITE_COLS * SPRITE_ROWS
+    # fps=1/interval emits one tile per started interval; the last sheet is padded
+    count = len(sheets) * per_sheet
+    if duration:
+        count = min(max(int(round(duration / interval)), 1), count)
+    meta = {
+        "source": os.path.abspath(video_path),
+        "interval": interval,
+        "cols": SPRITE_COLS,
+        "rows": SPRITE_ROWS,
+        "tile_width": first.shape[1] // SPRITE_COLS,
+        "tile_height": first.shape[0] // SPRITE_ROWS,
+        "count": count,
+        "sheets": sheets,
+    }
+    # meta file written last: its mtime marks the cache as complete
+    with open(os.path.join(temp_dir, "filmstrip.json"), "w") as f:
+        json.dump(meta, f)
+
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(temp_dir, out_dir)
+    return meta
+
+@lru_cache(maxsize=8)
+def _load_sheet(path, mtime):
+    import cv2
+    return cv2.cvtColor(cv2.imread(path), cv2.COLOR_BGR2RGB)
+
+def filmstrip_frame(meta, seconds):
+    """RGB tile (numpy array) nearest to `seconds`, straight from the sprite."""
+    per_sheet = meta["cols"] * meta["rows"]
+    index = min(max(int(round(seconds / meta["interval"])), 0), meta["count"] - 1)
+    sheet_no, slot = divmod(index, per_sheet)
+
+    sheet_path = os.path.join(filmstrip_dir_for(meta["source"]), meta["sheets"][sheet_no])
+    sheet = _load_sheet(sheet_path, os.path.getmtime(sheet_path))
+    row, col = divmod(slot, meta["cols"])
+    h, w = meta["tile_height"], meta["tile_width"]
+    return sheet[row * h:(row + 1) * h, col * w:(col + 1) * w]
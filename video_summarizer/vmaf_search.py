@@ -0,0 +1,108 @@
+"""
+VMAF-targeted CRF search
+Instead of a fixed CRF, find the highest (cheapest) CRF whose encode still
+scores >= a target VMAF against the uncompressed crop. Only a few short
+segments of the short are encoded and scored, so the search costs a
+fraction of one full render.
+
+    crf, scores = find_crf(spec, target=93)
+    render({**spec, "crf": crf})
+"""
+import os
+import re
+import tempfile
+
+from progress_events import run_ffmpeg
+from render_backend import render, FFMPEG_CMD
+
+# Bundled libvmaf model (libvmaf's built-in copy is used if it is missing)
+VMAF_MODEL = os.path.abspath("../bin/model/vmaf_v0.6.1.json")
+DEFAULT_TARGET = 93.0          # ~ "indistinguishable" on a phone screen
+CRF_RANGE = (18, 34)           # search bounds (libx264)
+SAMPLE_COUNT = 3               # segments spread over the short
+SAMPLE_SECONDS = 3.0
+VMAF_SUBSAMPLE = 2             # score every 2nd frame
+
+_SCORE_RE = re.compile(r"VMAF score[:=]\s*([\d.]+)")
+
+def _model_option():
+    if os.path.exists(VMAF_MODEL):
+        return "path=" + VMAF_MODEL.replace("\\", "/").replace(":", "\\\\:")
+    return "version=vmaf_v0.6.1"
+
+def vmaf_score(distorted, reference):
+    """Mean VMAF of distorted vs reference (same size and frame count)."""
+    graph = (f"[0:v]setpts=PTS-STARTPTS[d];[1:v]setpts=PTS-STARTPTS[r];"
+             f"[d][r]libvmaf=model={_model_option()}:n_subsample={VMAF_SUBSAMPLE}:n_threads={os.cpu_count() or 1}")
+    cmd = [FFMPEG_CMD, "-hide_banner", "-loglevel", "info", "-i", distorted, "-i", reference,
+           "-lavfi", graph, "-f", "null", "-"]
+    result = run_ffmpeg(cmd)
+    match = _SCORE_RE.search(result.stderr or "")
+    if result.returncode != 0 or not match:
+        raise RuntimeError(f"ffmpeg vmaf failed: {(result.stderr or '')[-300:]}")
+    return float(match.group(1))
+
+def sample_specs(spec, count=SAMPLE_COUNT, seconds=SAMPLE_SECONDS):
+    """
+    Sub-specs covering `count` segments spread evenly over the spec's range.
+    A moving crop path is sliced to each segment; subtitles and aspect
+    variants are left out (the CRF found for the main output is used for all).
+    """
+    start = spec.get("start") or 0.0
+    end = spec["end"]
+    length = end - start
+    seconds = min(seconds, length / count)
+    samples = []
+    for k in range(count):
+        seg_start = start + (k + 0.5) * length / count - seconds / 2
+        sample = {**spec, "start": seg_start, "end": seg_start + seconds, "subtitles": None, "variants": None}
+        crop = spec.get("crop")
+        if crop is not None and len(crop["x"]) > 1:
+            first = int(round((seg_start - start) * crop["fps"]))
+            last = int(round((seg_start + seconds - start) * crop["fps"]))
+            sample["crop"] = {**crop, "x": list(crop["x"][first:last + 1]) or [crop["x"][-1]]}
+        samples.append(sample)
+    return samples
+
+def find_crf(spec, target=DEFAULT_TARGET, crf_range=CRF_RANGE, progress=None):
+    """
+    Binary search over CRF for the spec's profile. Every candidate CRF is
+    scored on all samples and must reach `target` on the worst one.
+    Returns (crf, {crf: worst_vmaf}); the low end of the range is returned
+    if nothing meets the target. progress: optional callback(done, total).
+    """
+    if spec.get("end") is None:
+        raise ValueError("find_crf needs a spec with an end time")
+    profile = spec.get("profile") or "publish"
+    low, high = crf_range
+    scores = {}
+    probes = max(1, (high - low).bit_length()) + 1
+    with tempfile.TemporaryDirectory(prefix="vmaf_") as tmp:
+        # Reference: the cropped/scaled samples, losslessly encoded
+        references = []
+        for idx, sample in enumerate(sample_specs(spec)):
+            ref = os.path.join(tmp, f"ref_{idx}.mp4")
+            render({**sample, "output": ref, "crf": 0, "preset": "ultrafast", "maxrate": None})
+            references.append((sample, ref))
+
+        def worst_score(crf):
+            worst = 100.0
+            for idx, (sample, ref) in enumerate(references):
+                encoded = os.path.join(tmp, f"crf{crf}_{idx}.mp4")
+                # Same filters as the real render; only the rate control differs
+                render({**sample, "output": encoded, "crf": crf})
+                worst = min(worst, vmaf_score(encoded, ref))
+            scores[crf] = worst
+            print(f"   -> CRF {crf}: VMAF {worst:.1f} ({profile})")
+            if progress:
+                progress(len(scores), probes)
+            return worst
+
+        best = low
+        while low <= high:
+            crf = (low + high) // 2
+            if worst_score(crf) >= target:
+                best, low = crf, crf + 1
+            else:
+                high = crf - 1
+    return best, scores
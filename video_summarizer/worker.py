@@ -0,0 +1,262 @@
+"""
+Warm Worker
+A long-lived local daemon that runs pipeline jobs for the app and the CLI
+without paying interpreter start-up and the heavy imports (OpenCV, MoviePy,
+Whisper/torch, the pipeline modules) on every generation.
+
+The daemon listens on a Unix socket (multiprocessing.connection). Jobs are
+forked from a forkserver that has already imported PRELOAD_MODULES, so each
+job starts warm yet stays isolated: cancelling kills its process group and
+a crash never takes the daemon down.
+
+    python worker.py            # run in the foreground
+    python worker.py --stop     # stop a running daemon
+
+Clients call start_job() (or connect()), which starts the daemon in the
+background when it isn't running.
+
+Jobs arrive as pickles, so the socket is private to the installing user:
+it lives in a 0700 runtime directory next to a random per-install auth
+key (0600) that the daemon and its clients both read.
+"""
+import os
+import sys
+import time
+import fcntl
+import queue
+import signal
+import secrets
+import threading
+import subprocess
+import multiprocessing
+from multiprocessing.connection import Listener, Client
+
+from jobs import _child_main, kill_job_process
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+RUNTIME_DIR = os.path.join(MODULE_DIR, ".worker")      # 0700: socket, lock and key
+SOCKET_PATH = os.path.join(RUNTIME_DIR, "worker.sock")
+LOCK_PATH = os.path.join(RUNTIME_DIR, "worker.lock")
+AUTHKEY_PATH = os.path.join(RUNTIME_DIR, "authkey")
+AUTHKEY_BYTES = 32
+LOG_FILE = os.path.join(MODULE_DIR, "worker.log")
+START_TIMEOUT = 30          # Seconds to wait for an auto-started daemon
+
+# Imported once in the forkserver; every job inherits them. The heavy
+# libraries come first so the pipeline modules bind them directly instead
+# of through lazy_imports (missing ones are skipped)
+PRELOAD_MODULES = ["numpy", "cv2", "moviepy", "faster_whisper", "whisper", "progress_events",
+                   "smart_crop", "subtitle_optimizer", "auto_shorts", "jobs"]
+
+def _runtime_dir():
+    """Create the private runtime directory (or refuse one we don't own)."""
+    os.makedirs(RUNTIME_DIR, mode=0o700, exist_ok=True)
+    info = os.stat(RUNTIME_DIR)
+    if info.st_uid != os.getuid():
+        raise RuntimeError(f"{RUNTIME_DIR} is owned by another user")
+    if info.st_mode & 0o077:
+        os.chmod(RUNTIME_DIR, 0o700)
+    return RUNTIME_DIR
+
+def authkey():
+    """This install's worker auth key (random, created 0600 on first use)."""
+    _runtime_dir()
+    try:
+        fd = os.open(AUTHKEY_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        info = os.stat(AUTHKEY_PATH)
+        if info.st_uid != os.getuid() or info.st_mode & 0o077:
+            raise RuntimeError(f"{AUTHKEY_PATH} must be owned by you and mode 0600")
+        with open(AUTHKEY_PATH, "rb") as f:
+            key = f.read()
+        if len(key) == AUTHKEY_BYTES:
+            return key
+        raise RuntimeError(f"{AUTHKEY_PATH} is corrupt (delete it and restart the worker)")
+    key = secrets.token_bytes(AUTHKEY_BYTES)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+# --- Daemon side ---
+
+def _job_main(cwd, events, func, args, kwargs):
+    """Job process (forked from the warm forkserver)."""
+    os.chdir(cwd)
+    _child_main(events, func, args, kwargs)
+
+def _serve_job(context, conn, cwd, func, args, kwargs):
+    events = context.Queue()
+    # Not daemonic: jobs start their own worker pools (smart_crop analysis)
+    process = context.Process(target=_job_main, args=(cwd, events, func, args, kwargs), daemon=False)
+    process.start()
+    conn.send(("started", process.pid))
+
+    outcome = None
+    while outcome is None:
+        try:
+            if conn.poll() and conn.recv() == ("cancel",):
+                kill_job_process(process)
+        except (EOFError, OSError):
+            # Client went away: nobody is waiting for this job any more
+            kill_job_process(process)
+            outcome = ("error", "Client disconnected")
+            break
+        try:
+            kind, *payload = events.get(timeout=0.2)
+        except queue.Empty:
+            if not process.is_alive():
+                outcome = ("error", "Job process exited unexpectedly")
+            continue
+        if kind == "progress":
+            conn.send(("progress", *payload))
+        else:
+            outcome = (kind, payload[0])
+
+    process.join()
+    try:
+        conn.send(outcome)
+    except OSError:
+        pass
+
+def _handle(context, conn):
+    try:
+        request = conn.recv()
+        if request[0] == "ping":
+            conn.send(("pong", os.getpid()))
+        elif request[0] == "stop":
+            conn.send(("stopping",))
+            os.kill(os.getpid(), signal.SIGTERM)
+        elif request[0] == "run":
+            _serve_job(context, conn, *request[1:])
+    except (EOFError, OSError):
+        pass
+    finally:
+        conn.close()
+
+def serve():
+    """Run the daemon in the foreground until stopped."""
+    key = authkey()
+    # Held for the daemon's lifetime: a second daemon (e.g. two clients
+    # auto-starting at once) gives up here instead of stealing the socket
+    lock_file = open(LOCK_PATH, "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        print("⚠️ Worker already running")
+        return
+    if os.path.exists(SOCKET_PATH):
+        os.remove(SOCKET_PATH)      # stale socket from a killed daemon
+
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(PRELOAD_MODULES)
+
+    # "stop" requests (and kill) end the accept loop via SystemExit
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    # Socket created 0600 (inside the 0700 runtime dir): never connectable by others
+    old_umask = os.umask(0o177)
+    try:
+        listener = Listener(SOCKET_PATH, family="AF_UNIX", authkey=key)
+    finally:
+        os.umask(old_umask)
+    print(f"🔥 Worker listening on {SOCKET_PATH} (pid {os.getpid()})", flush=True)
+    try:
+        while True:
+            try:
+                conn = listener.accept()
+            except (OSError, EOFError) as e:
+                print(f"⚠️ Rejected connection: {e}", flush=True)
+                continue
+            threading.Thread(target=_handle, args=(context, conn), daemon=True).start()
+    finally:
+        listener.close()
+        if os.path.exists(SOCKET_PATH):
+            os.remove(SOCKET_PATH)
+        print("👋 Worker stopped", flush=True)
+
+# --- Client side ---
+
+def _request(message, timeout=5):
+    conn = Client(SOCKET_PATH, family="AF_UNIX", authkey=authkey())
+    try:
+        conn.send(message)
+        return conn.recv() if conn.poll(timeout) else None
+    finally:
+        conn.close()
+
+def ping():
+    """pid of the running daemon, or None."""
+    try:
+        reply = _request(("ping",))
+    except (OSError, EOFError):
+        return None
+    return reply[1] if reply else None
+
+def stop():
+    try:
+        _request(("stop",))
+    except (OSError, EOFError):
+        return False
+    return True
+
+_start_lock = threading.Lock()
+
+def ensure_running(timeout=START_TIMEOUT):
+    """Start the daemon in the background unless it's already up."""
+    with _start_lock:
+        if ping():
+            return
+        print("🔥 Starting warm worker...")
+        with open(LOG_FILE, "a") as log:
+            subprocess.Popen([sys.executable, os.path.join(MODULE_DIR, "worker.py")],
+                             cwd=MODULE_DIR, stdout=log, stderr=subprocess.STDOUT,
+                             stdin=subprocess.DEVNULL, start_new_session=True)
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if ping():
+                return
+            time.sleep(0.2)
+        raise TimeoutError(f"Worker did not start (see {LOG_FILE})")
+
+def connect():
+    ensure_running()
+    return Client(SOCKET_PATH, family="AF_UNIX", authkey=authkey())
+
+class RemoteJob:
+    """
+    A job running in the worker. Same interface as jobs.LocalJob:
+    poll(timeout) -> next event or None, cancel(), close().
+    """
+
+    def __init__(self, func, args=(), kwargs=None):
+        self.conn = connect()
+        self.conn.send(("run", os.getcwd(), func, tuple(args), dict(kwargs or {})))
+        reply = self.conn.recv()
+        if reply[0] != "started":
+            raise RuntimeError(f"Worker refused job: {reply}")
+        self.pid = reply[1]
+
+    def poll(self, timeout=0.5):
+        try:
+            if not self.conn.poll(timeout):
+                return None
+            return self.conn.recv()
+        except (EOFError, OSError):
+            return ("error", "Lost connection to worker")
+
+    def cancel(self):
+        try:
+            self.conn.send(("cancel",))
+        except OSError:
+            pass
+
+    def close(self):
+        self.conn.close()
+
+def start_job(func, *args, **kwargs):
+    return RemoteJob(func, args, kwargs)
+
+if __name__ == "__main__":
+    if "--stop" in sys.argv[1:]:
+        print("👋 Stopping worker..." if stop() else "⚠️ Worker is not running")
+    else:
+        serve()